@@ -43,6 +43,10 @@ class InputTab(VoicelabTab):
         self.version = "2.0.0"
         self.signals = signals
         self.signals["on_files_changed"].connect(self.on_files_changed)
+        self.signals["on_processing_started"].connect(self.on_processing_started)
+        self.signals["on_processing_completed"].connect(self.on_processing_completed)
+        self.signals["on_progress_update"].connect(self.on_progress_updated)
+        self.signals["on_progress_estimate"].connect(self.on_progress_estimated)  # connect signal to update progress bar
         self.initUI()
     
         
@@ -60,18 +64,23 @@ class InputTab(VoicelabTab):
         self.list_loaded_voices.itemSelectionChanged.connect(self.onselection_change)
 
         # Create and connect add button
-        btn_add_voices = QPushButton("Load Sound File(s)")
-        btn_add_voices.clicked.connect(self.onclick_add)
+        self.btn_add_voices = QPushButton("Load Sound File(s)")
+        self.btn_add_voices.clicked.connect(self.onclick_add)
 
         # Create and connect remove button
-        btn_remove_voices = QPushButton("Remove Sound File(s)")
-        btn_remove_voices.clicked.connect(self.onclick_remove)
+        self.btn_remove_voices = QPushButton("Remove Sound File(s)")
+        self.btn_remove_voices.clicked.connect(self.onclick_remove)
 
         # Create and connect start button
         self.btn_start = QPushButton("Start Queue")
         self.btn_start.clicked.connect(self.onclick_start)
         self.btn_start.setDisabled(True)
 
+        # Create and connect cancel button, processing stops once the file being processed is done
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self.cancel_process)
+        self.btn_cancel.setDisabled(True)
+
         # Create and connect help button
         btn_help = QPushButton("Help")
         btn_help.clicked.connect(self.onclick_help)
@@ -92,14 +101,15 @@ class InputTab(VoicelabTab):
         self.progress = QProgressBar()
 
         # Display the widgets in the correct order
-        self.layout.addWidget(btn_add_voices)
-        self.layout.addWidget(btn_remove_voices)
+        self.layout.addWidget(self.btn_add_voices)
+        self.layout.addWidget(self.btn_remove_voices)
         self.layout.addWidget(btn_play)
         self.layout.addWidget(btn_stop)
         self.layout.addWidget(btn_help)
         self.layout.addWidget(btn_about)
         self.layout.addWidget(self.list_loaded_voices)
         self.layout.addWidget(self.btn_start)
+        self.layout.addWidget(self.btn_cancel)
         self.layout.addWidget(self.progress)
 
         # Set the layout
@@ -268,23 +278,43 @@ THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR I
 
         self.data_controller.reset_figures()  # reset the figures
 
-        n_voices = len(self.data_controller.active_voices)  # count how many files to process
-        n_functions = len(self.data_controller.active_functions) + 1  # count how many functions to run + 1
-        n_functions = len(self.data_controller.active_functions) + 1  # count how many functions to run + 1 (why +1?)
+        # the progress bar shows progress weighted by how long each function takes, in tenths of a percent
         self.progress.setMinimum(0)  # start progress bar at 0
-        self.progress.setMaximum(n_voices * n_functions)  # end of the progress bar
-        self.signals["on_progress_update"].connect(self.on_progress_updated)  # connect signal to update progress bar
+        self.progress.setMaximum(1000)  # end of the progress bar
+        self.progress.setValue(0)
+        self.progress.setFormat("%p%")
 
-        self.start_process()  # start the pipeline - code in VoiceLabTab.VoiceLabTab
+        self.start_process()  # start the pipeline in the background - code in VoiceLabTab.VoiceLabTab
 
         self.tabs.setCurrentIndex(2)
 
+    ###############################################################################################
+    # on_processing_started / on_processing_completed: the files can't be changed while they are
+    # processed, and processing can only be cancelled while it runs
+    ###############################################################################################
+    def on_processing_started(self):
+        self.btn_start.setDisabled(True)
+        self.btn_cancel.setDisabled(False)
+        self.btn_add_voices.setDisabled(True)
+        self.btn_remove_voices.setDisabled(True)
+
+    def on_processing_completed(self, results):
+        """
+        Args:
+            results:
+        """
+        self.btn_start.setDisabled(len(self.data_controller.active_voices) == 0)
+        self.btn_cancel.setDisabled(True)
+        self.btn_add_voices.setDisabled(False)
+        self.btn_remove_voices.setDisabled(False)
+
     ###############################################################################################
     # on_progress_updated: callback function for when progress is made during pipeline processing
     # + node: the name of the node that finished running
     # + start: the progress number this started with (most often 0)
     # + current: the current progress as an integer of how many nodes have finished processing
     # + end: the total number of nodes that will be processed as reported at the start of processing
+    # The progress bar itself is moved by on_progress_estimated
     ###############################################################################################
     def on_progress_updated(self, node, start, current, end):
         """
@@ -294,5 +324,4 @@ THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR I
             current:
             end:
         """
-        self.progress.setValue(current)
         print(node, start, current, end)
@@ -0,0 +1,382 @@
+import csv
+import numbers
+import os
+
+import numpy as np
+
+from ..pipeline.ResultSink import CSVSink, ParquetSink, reportable_value
+
+"""
+# Result Export: saves the results and settings of a run as tables
+#
+# Results are saved in two shapes:
+#   long: one row per measurement, with the columns file, function, measure and value
+#   wide: one row per file, with a column for each measurement
+# Values keep their types, numbers stay numbers and lists are saved as JSON text. CSV tables are
+# always written, Parquet (needs pyarrow) and Excel (needs openpyxl) are optional. Tables are
+# written a chunk of files at a time, Excel workbooks are made afterwards from the CSV tables.
+#
+# Tracks of values over frames (pitch contours, MFCCs, ...) are float32 arrays, they are kept out
+# of the tables and saved as arrays: a .npz file per sound, and with Parquet a long table of
+# (file, function, track, time, value).
+"""
+
+# how many files are written to a table at a time
+CHUNK_SIZE = 1000
+
+# Name of the file column in wide tables
+FILE_COLUMN = "Input File"
+
+
+def reportable_results(results):
+    """Keep only the values that can be saved in a table, converted the way they are saved
+
+    Args:
+        results: dictionary of file to dictionary of function name to that function's results
+    """
+    table = {}
+    for file_path, file_results in results.items():
+        table[file_path] = {}
+        for fn_name, fn_results in file_results.items():
+            for measure, value in fn_results.items():
+                value = reportable_value(value)
+                if value is not None:
+                    table[file_path][(fn_name, measure)] = value
+    return table
+
+
+def wide_columns(table):
+    """Name a column for each (function, measure). Measures are named on their own, unless more
+    than one function reports a measure of the same name, then they are named function: measure
+
+    Args:
+        table: results from reportable_results
+    """
+    keys = {}
+    functions_by_measure = {}
+    for file_results in table.values():
+        for fn_name, measure in file_results:
+            if (fn_name, measure) not in keys:
+                keys[(fn_name, measure)] = None
+                functions_by_measure.setdefault(measure, set()).add(fn_name)
+    return {
+        (fn_name, measure): measure if len(functions_by_measure[measure]) == 1 else f"{fn_name}: {measure}"
+        for fn_name, measure in keys
+    }
+
+
+def save_long_table(table, path, chunk_size=CHUNK_SIZE):
+    """Save one row per measurement to a .csv or .parquet file
+
+    Args:
+        table: results from reportable_results
+        path:
+        chunk_size: how many files are written at a time
+    """
+    sink = ParquetSink(path) if path.endswith(".parquet") else CSVSink(path)
+    sink.open()
+    try:
+        rows = []
+        for i, (file_path, file_results) in enumerate(table.items()):
+            rows.extend(
+                {"file": file_path, "function": fn_name, "measure": measure, "value": value}
+                for (fn_name, measure), value in file_results.items()
+            )
+            if (i + 1) % chunk_size == 0:
+                sink.write_rows(rows)
+                rows = []
+        if len(rows) > 0:
+            sink.write_rows(rows)
+    finally:
+        sink.close()
+
+
+def save_wide_table(table, path, chunk_size=CHUNK_SIZE):
+    """Save one row per file to a .csv or .parquet file
+
+    Args:
+        table: results from reportable_results
+        path:
+        chunk_size: how many files are written at a time
+    """
+    columns = wide_columns(table)
+    if path.endswith(".parquet"):
+        _save_wide_parquet(table, columns, path, chunk_size)
+        return
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([FILE_COLUMN] + list(columns.values()))
+        rows = []
+        for file_path, file_results in table.items():
+            rows.append([file_path] + [file_results.get(key, "") for key in columns])
+            if len(rows) >= chunk_size:
+                writer.writerows(rows)
+                rows = []
+        writer.writerows(rows)
+
+
+def _save_wide_parquet(table, columns, path, chunk_size):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Saving results to Parquet needs pyarrow, install it with: pip install pyarrow")
+
+    # A Parquet column holds one type. Columns of only numbers are saved as numbers, columns that
+    # mix in text (usually error messages) are saved as text
+    numeric = {
+        key: all(
+            isinstance(file_results[key], numbers.Number)
+            for file_results in table.values() if key in file_results
+        )
+        for key in columns
+    }
+    schema = pyarrow.schema(
+        [(FILE_COLUMN, pyarrow.string())]
+        + [(name, pyarrow.float64() if numeric[key] else pyarrow.string()) for key, name in columns.items()]
+    )
+
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        file_paths = list(table)
+        for start in range(0, len(file_paths), chunk_size):
+            chunk = file_paths[start:start + chunk_size]
+            data = {FILE_COLUMN: chunk}
+            for key, name in columns.items():
+                values = [table[file_path].get(key) for file_path in chunk]
+                if not numeric[key]:
+                    values = [None if value is None else str(value) for value in values]
+                data[name] = values
+            writer.write_table(pyarrow.table(data, schema=schema))
+
+
+def frame_tracks(results, frame_times=None):
+    """Find the tracks of frame values in the results: {file: {(function, track): (times, values)}}.
+    Arrays with more than one row are one track per row, named track 1, track 2, ...
+
+    Args:
+        results: dictionary of file to dictionary of function name to that function's results
+        frame_times: dictionary of function name to its node's frame_times, mapping each track to
+            the result holding the times of its frames. Tracks without times are timed by frame number
+    """
+    frame_times = frame_times or {}
+    tracks = {}
+    for file_path, file_results in results.items():
+        tracks[file_path] = {}
+        for fn_name, fn_results in file_results.items():
+            times_of = frame_times.get(fn_name, {})
+            time_outputs = set(times_of.values())
+            for name, values in fn_results.items():
+                if not isinstance(values, np.ndarray) or name in time_outputs:
+                    continue
+                values = np.atleast_2d(values).astype(np.float32, copy=False)
+                times = fn_results.get(times_of.get(name))
+                if not isinstance(times, np.ndarray):
+                    times = np.arange(values.shape[-1])
+                times = times.astype(np.float32, copy=False)
+                if len(values) == 1:
+                    tracks[file_path][(fn_name, name)] = (times, values[0])
+                else:
+                    for row, row_values in enumerate(values):
+                        tracks[file_path][(fn_name, f"{name} {row + 1}")] = (times, row_values)
+    return tracks
+
+
+def track_file_name(file_path, used_names):
+    """Name of the .npz file the tracks of file_path are saved to, without the extension. Files of
+    the same name from different folders are numbered
+
+    Args:
+        file_path:
+        used_names: set of the names used so far, the name is added to it
+    """
+    name = os.path.splitext(os.path.basename(str(file_path)))[0]
+    unique_name, number = name, 1
+    while unique_name in used_names:
+        number += 1
+        unique_name = f"{name}_{number}"
+    used_names.add(unique_name)
+    return unique_name
+
+
+def track_arrays(file_tracks):
+    """The tracks of one file as the arrays saved to its .npz file, "<function>: <track>" and
+    "<function>: <track> (time)"
+
+    Args:
+        file_tracks: the tracks of one file, from frame_tracks
+    """
+    arrays = {}
+    for (fn_name, track), (times, values) in file_tracks.items():
+        arrays[f"{fn_name}: {track}"] = values
+        arrays[f"{fn_name}: {track} (time)"] = times
+    return arrays
+
+
+def save_tracks_npz(tracks, directory):
+    """Save the tracks of each file to directory/<file name>.npz, as the arrays
+    "<function>: <track>" and "<function>: <track> (time)". Returns the paths written
+
+    Args:
+        tracks: tracks from frame_tracks
+        directory: created if it doesn't exist
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    used_names = set()
+    for file_path, file_tracks in tracks.items():
+        if len(file_tracks) == 0:
+            continue
+        paths.append(os.path.join(directory, track_file_name(file_path, used_names) + ".npz"))
+        np.savez_compressed(paths[-1], **track_arrays(file_tracks))
+    return paths
+
+
+def save_tracks_parquet(tracks, path):
+    """Save the tracks as one row per frame, (file, function, track, time, value), to a Parquet
+    file, a file at a time. Needs pyarrow
+
+    Args:
+        tracks: tracks from frame_tracks
+        path:
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Saving results to Parquet needs pyarrow, install it with: pip install pyarrow")
+
+    # names repeat on every frame, so they are stored once in a dictionary
+    name_type = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    schema = pyarrow.schema([
+        ("file", name_type),
+        ("function", name_type),
+        ("track", name_type),
+        ("time", pyarrow.float32()),
+        ("value", pyarrow.float32()),
+    ])
+
+    def names(labels, lengths):
+        indices = np.repeat(np.arange(len(labels), dtype=np.int32), lengths)
+        return pyarrow.DictionaryArray.from_arrays(indices, pyarrow.array(labels, pyarrow.string()))
+
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for file_path, file_tracks in tracks.items():
+            if len(file_tracks) == 0:
+                continue
+            keys = list(file_tracks)
+            lengths = [len(values) for times, values in file_tracks.values()]
+            writer.write_table(pyarrow.table({
+                "file": names([str(file_path)], [sum(lengths)]),
+                "function": names([fn_name for fn_name, track in keys], lengths),
+                "track": names([track for fn_name, track in keys], lengths),
+                "time": np.concatenate([times for times, values in file_tracks.values()]),
+                "value": np.concatenate([values for times, values in file_tracks.values()]),
+            }, schema=schema))
+
+
+def settings_rows(settings):
+    """One row per setting of each function, options are saved as the one chosen
+
+    Args:
+        settings: dictionary of function name to its settings
+    """
+    rows = []
+    for fn_name, fn_settings in settings.items():
+        for setting, value in fn_settings.items():
+            # the inputs of the last file processed are kept with the settings
+            if setting in ("voice", "file_path", "context"):
+                continue
+            # if there are options, save the first one
+            if isinstance(value, tuple):
+                value = value[0]
+            value = reportable_value(value)
+            rows.append({"function": fn_name, "setting": setting, "value": "" if value is None else value})
+    return rows
+
+
+def save_settings_table(settings, path):
+    """Save the settings each function ran with to a .csv file
+
+    Args:
+        settings: dictionary of function name to its settings
+        path:
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["function", "setting", "value"])
+        writer.writeheader()
+        writer.writerows(settings_rows(settings))
+
+
+def save_timings_table(timings, path):
+    """Save how long each function took on each file to a .csv file, one row per file and function
+
+    Args:
+        timings: dictionary of file to dictionary of function name to seconds
+        path:
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file", "function", "seconds"])
+        for file_path, file_timings in timings.items():
+            writer.writerows([file_path, fn_name, seconds] for fn_name, seconds in file_timings.items())
+
+
+def save_excel(csv_path, excel_path):
+    """Make an Excel workbook from a CSV table. Needs openpyxl
+
+    Args:
+        csv_path:
+        excel_path:
+    """
+    import pandas as pd
+
+    pd.read_csv(csv_path, keep_default_na=False, na_values=[""]).to_excel(excel_path, index=False)
+
+
+def save_tables(results, settings, save_location, formats=("excel",), chunk_size=CHUNK_SIZE, frame_times=None,
+                timings=None):
+    """Save results and settings as tables in save_location, returning the paths written
+
+        voicelab_results.csv           one row per file
+        voicelab_results_long.csv      one row per measurement
+        voicelab_settings.csv          one row per setting
+        voicelab_tracks/*.npz          the tracks of frame values of each file, if there are any
+        voicelab_timings.csv           seconds each function took on each file, if timings are given
+    and with "parquet" in formats the results and tracks as .parquet files too, with "excel" in
+    formats the wide results and the settings as .xlsx workbooks.
+
+    Args:
+        results: dictionary of file to dictionary of function name to that function's results
+        settings: dictionary of function name to its settings
+        save_location: directory to save the tables in
+        formats: other formats to save besides CSV, "parquet" and/or "excel"
+        chunk_size: how many files are written at a time
+        frame_times: dictionary of function name to its node's frame_times
+        timings: dictionary of file to dictionary of function name to the seconds it took
+    """
+    table = reportable_results(results)
+    tracks = frame_tracks(results, frame_times)
+    has_tracks = any(len(file_tracks) > 0 for file_tracks in tracks.values())
+    paths = []
+
+    def path(name):
+        paths.append(os.path.join(save_location, name))
+        return paths[-1]
+
+    save_wide_table(table, path("voicelab_results.csv"), chunk_size)
+    save_long_table(table, path("voicelab_results_long.csv"), chunk_size)
+    save_settings_table(settings, path("voicelab_settings.csv"))
+    if timings:
+        save_timings_table(timings, path("voicelab_timings.csv"))
+    if has_tracks:
+        paths.extend(save_tracks_npz(tracks, os.path.join(save_location, "voicelab_tracks")))
+    if "parquet" in formats:
+        save_wide_table(table, path("voicelab_results.parquet"), chunk_size)
+        save_long_table(table, path("voicelab_results_long.parquet"), chunk_size)
+        if has_tracks:
+            save_tracks_parquet(tracks, path("voicelab_tracks.parquet"))
+    if "excel" in formats:
+        save_excel(os.path.join(save_location, "voicelab_results.csv"), path("voicelab_results.xlsx"))
+        save_excel(os.path.join(save_location, "voicelab_settings.csv"), path("voicelab_settings.xlsx"))
+    return paths
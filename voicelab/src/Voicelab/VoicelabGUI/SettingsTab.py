@@ -25,6 +25,10 @@ class SettingsTab(VoicelabTab):
         super().__init__(data_controller, signals, tabs, *args, **kwargs)
 
         self.signals["on_files_changed"].connect(self.on_files_changed)
+        self.signals["on_processing_started"].connect(self.on_processing_started)
+        self.signals["on_processing_completed"].connect(self.on_processing_completed)
+        self.signals["on_progress_update"].connect(self.on_progress_updated)
+        self.signals["on_progress_estimate"].connect(self.on_progress_estimated)
 
         # stores the current, cached, and default values for what line edits should be checked
         self.checked_state = {"active": {}, "default": {}, "cached": {}, "required": {}}
@@ -56,6 +60,10 @@ class SettingsTab(VoicelabTab):
         self.btn_start = QPushButton("Start")
         self.btn_start.clicked.connect(self.onclick_start)
         self.btn_start.setDisabled(True)
+        # processing stops once the file being processed is done
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self.cancel_process)
+        self.btn_cancel.setDisabled(True)
         self.progress = QProgressBar()
 
         self.measure_settings = MeasureSettings(
@@ -65,13 +73,14 @@ class SettingsTab(VoicelabTab):
         self.layout.addWidget(self.advanced_toggle)
         self.layout.addWidget(self.measure_settings)
         self.layout.addWidget(self.btn_start)
+        self.layout.addWidget(self.btn_cancel)
         self.layout.addWidget(self.progress)
 
         self.measure_settings.setDisabled(self.is_active)
         self.setLayout(self.layout)
 
     ###############################################################################################
-    # callback for when a single node is run
+    # callback for when a single node is run. The progress bar itself is moved by on_progress_estimated
     ###############################################################################################
     def on_progress_updated(self, node, start, current, end):
         """
@@ -81,9 +90,27 @@ class SettingsTab(VoicelabTab):
             current:
             end:
         """
-        self.progress.setValue(current)
         print(node, start, current, end)
 
+    ###############################################################################################
+    # callbacks for when processing starts and ends. Settings can't be changed while they are used
+    ###############################################################################################
+    def on_processing_started(self):
+        self.btn_start.setDisabled(True)
+        self.btn_cancel.setDisabled(False)
+        self.advanced_toggle.setDisabled(True)
+        self.measure_settings.setDisabled(True)
+
+    def on_processing_completed(self, results):
+        """
+        Args:
+            results:
+        """
+        self.btn_start.setDisabled(len(self.data_controller.active_voices) == 0)
+        self.btn_cancel.setDisabled(True)
+        self.advanced_toggle.setDisabled(False)
+        self.measure_settings.setDisabled(not self.advanced_toggle.isChecked())
+
     ###############################################################################################
     # callback for when files change
     ###############################################################################################
@@ -131,11 +158,11 @@ class SettingsTab(VoicelabTab):
     ###############################################################################################
     def onclick_start(self):
         self.data_controller.reset_figures()
-        n_voices = len(self.data_controller.active_voices)
-        n_functions = len(self.data_controller.active_functions) + 1
+        # progress is weighted by how long each function takes, in tenths of a percent
         self.progress.setMinimum(0)
-        self.progress.setMaximum(n_voices * n_functions)
-        self.signals["on_progress_update"].connect(self.on_progress_updated)
+        self.progress.setMaximum(1000)
+        self.progress.setValue(0)
+        self.progress.setFormat("%p%")
 
         self.start_process()
 
@@ -1,23 +1,24 @@
-import matplotlib.pyplot
 from .VoicelabDataModel import VoicelabDataModel
 from ..pipeline.Pipeline import Pipeline
+from ..pipeline.ResultCache import ResultCache
+from ..pipeline.Profiler import Profiler
 from ..toolkits import Voicelab
+from ..toolkits.Voicelab.LoadVoicesNode import LoadVoicesNode, read_header
 
 import copy
-from .InputTab import InputTab
+import os
 import parselmouth
 from parselmouth.praat import call
+from typing import TYPE_CHECKING
 
 from ..default_settings import visualize_list, function_requirements, display_whitelist
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
+from .ResultExport import save_tables
 
-import numpy as np
-import pandas as pd
-from pandas import ExcelWriter
-from pandas import ExcelFile
 from datetime import datetime
-from PyQt5.QtWidgets import QMessageBox
+
+if TYPE_CHECKING:
+    # matplotlib is only imported once there are figures to handle
+    from matplotlib.figure import Figure
 
 """
 # Voicelab Controller: coordinates the interaction between the presentation of the data and its storage
@@ -38,6 +39,35 @@ class VoicelabController:
         self.active_functions_cache = {}
         self.last_used_settings = {}
         self.progress = 0
+        # Number of worker processes the pipeline spreads files across. 1 runs everything in this process
+        self.processes = 1
+        # Directory to keep results in between runs, so files and settings that have not changed are not
+        # measured again. None turns the result cache off
+        self.cache_directory = None
+        # Size in bytes the result cache is trimmed back to, least recently used results first
+        self.cache_size = 2 ** 30
+        # A ResultSink to write each file's results to as soon as it is processed, instead of holding
+        # them all in memory. None keeps them all to be shown and saved afterwards
+        self.result_sink = None
+        # Results and settings are always saved as CSV tables. Other formats to save them as:
+        # "excel" (needs openpyxl) and "parquet" (needs pyarrow)
+        self.export_formats = ["excel"]
+        # Called with a title, text and level ("information" or "critical") for messages meant for the
+        # user. The GUI shows these in a dialog, without one they are printed
+        self.message_callback = None
+        # The pipeline that is processing, so it can be cancelled from another thread
+        self.pipeline = None
+        # Set when processing is cancelled, so a cancel from before the pipeline is running isn't lost
+        self.cancel_requested = False
+        # Whether to profile each function on each file: time and praat calls, and its peak memory if
+        # profile_memory is set too. The profile of the last run is kept in self.profiler and saved
+        # with the results
+        self.profile = False
+        self.profile_memory = False
+        self.profiler = None
+        # Seconds each function took on each file in the last run, saved with the results:
+        # {file_path: {fn_name: seconds}}
+        self.timings = {}
         # Lambdas are not allowed in multiprocessing.  I made a function below instead.
         #self.progress_callback = lambda node, start, current, end: print(
         #    node.node_id, start, current, end
@@ -51,10 +81,29 @@ class VoicelabController:
     # close the figures when they are not needed. This is important especially given matplotlib's statefulness
     """
 
-    def progress_callback(self, node, start, current, end):
-        print(
-            node.node_id, start, current, end
-        )
+    def progress_callback(self, node, start, current, end, timing=None):
+        if timing is not None and timing["remaining"] is not None:
+            print(
+                node.node_id, start, current, end,
+                f"{timing['fraction']:.0%} done, about {timing['remaining']:.0f} s left"
+            )
+        else:
+            print(
+                node.node_id, start, current, end
+            )
+
+    """
+    # show_message: pass a message on to the user through the message callback, or print it
+    """
+
+    def show_message(self, title, text, level="information"):
+        if self.message_callback is not None:
+            self.message_callback(title, text, level)
+        else:
+            print(f"{title}: {text}")
+
+    def on_warning(self, event_id, text):
+        self.show_message("Warning", text, "critical")
 
     def load_figure(self, figure):
         self.figures.append(figure)
@@ -73,6 +122,8 @@ class VoicelabController:
     """
 
     def reset_figures(self):
+        import matplotlib.pyplot as plt
+
         for figure in self.figures:
             figure.clear()
             plt.close(figure)
@@ -83,12 +134,10 @@ class VoicelabController:
     """
     def load_voices(self, file_paths):
         for file_path in file_paths:
-            #self.data_model.load_voice(parselmouth.Sound(file_path), file_path)
-            sound = parselmouth.Sound(file_path)
-            signal = sound.values
-            sampling_rate = sound.sampling_frequency
-            voice = (signal, sampling_rate)
-            self.data_model.load_voice(file_path, signal, sampling_rate)
+            # Only the header is read here. LoadVoicesNode decodes the samples when processing reaches
+            # the file, so a large corpus is never held in memory all at once
+            header = read_header(file_path)
+            self.data_model.load_voice(file_path, None, header["sampling_rate"])
         return self.data_model.loaded_voices
 
     """
@@ -230,10 +279,13 @@ class VoicelabController:
         self.reset_results()
 
         # Create an empty WARIO pipeline
-        pipeline = Pipeline()
+        cache = ResultCache(self.cache_directory, self.cache_size) if self.cache_directory else None
+        self.profiler = Profiler(trace_memory=self.profile_memory) if self.profile else None
+        pipeline = Pipeline(processes=self.processes, cache=cache, sink=self.result_sink, profiler=self.profiler)
+        self.pipeline = pipeline
 
         # Create a node that will load all of the voices
-        load_voices = Voicelab.LoadVoicesNode("Load Voice")
+        load_voices = LoadVoicesNode("Load Voice")
 
         # Set up the load node with the appropriate file locations
         load_voices.args["file_locations"] = active_voices
@@ -253,6 +305,7 @@ class VoicelabController:
 
             # Connect the loaded voice to the visualize node so it has access to it
             pipeline.connect((load_voices, "voice"), (visualize_voices, "voice"))
+            pipeline.connect((load_voices, "context"), (visualize_voices, "context"))
 
             # Add the node to the pipeline
             pipeline.add(visualize_voices)
@@ -268,6 +321,7 @@ class VoicelabController:
 
             # Connect the loaded voice to the visualize node so it has access to it
             pipeline.connect((load_voices, "voice"), (visualize_spectrum, "voice"))
+            pipeline.connect((load_voices, "context"), (visualize_spectrum, "context"))
 
             # Add the node to the pipeline
             pipeline.add(visualize_spectrum)
@@ -287,6 +341,10 @@ class VoicelabController:
             pipeline.connect(
                 (load_voices, "file_path"), (active_functions[fn], "file_path")
             )
+            # Share Praat analyses of each file (pitch bounds, point process, ...) between nodes
+            pipeline.connect(
+                (load_voices, "context"), (active_functions[fn], "context")
+            )
             #if "Create Spectrograms" in active_functions and fn in visualize_list:
             #    pipeline.connect(
             #        (active_functions[fn], visualize_list[fn]),
@@ -303,15 +361,33 @@ class VoicelabController:
                     parent_node = active_functions[parent_name]
                     pipeline.connect((parent_node, argument), (child_node, argument))
 
-        pipeline.listen(self.progress_callback)
-        pipeline_results = pipeline.start()
+        # progress is weighted by how long each function takes, with an estimate of the time left
+        pipeline.listen(self.progress_callback, timed=True)
+        # a cancel from before the pipeline started running is handed to it as soon as it does
+        pipeline.listen(self.pass_on_cancel)
+        # nodes fire warnings about settings they had to change
+        pipeline.on_event("warning", self.on_warning)
+        try:
+            pipeline_results = pipeline.start()
+        finally:
+            self.pipeline = None
+            self.cancel_requested = False
+
+        if pipeline.cancelled:
+            self.show_message(
+                "Cancelled",
+                f"Processing was cancelled after {len(pipeline_results)} of {len(active_voices)} files.\n"
+                "Check your data, then save.",
+            )
+        else:
+            self.show_message("Finished", "Finished processing.\nCheck your data, then save.")
 
-        finished_window = QMessageBox()
-        finished_window.setWindowTitle("Finished")
-        finished_window.setText("Finished processing.\nCheck your data, then save.")
-        finished_window.setIcon(QMessageBox.Information)
-        finished_window.exec_()
 
+        # Keep how long each function took on each file, for planning how long runs will take
+        self.timings = {
+            active_voices[i]: {node.node_id: seconds for node, seconds in pass_times.items()}
+            for i, pass_times in enumerate(pipeline.timings)
+        }
 
         # Collect the results of the pipeline running
         for i, result_file in enumerate(pipeline_results):
@@ -319,12 +395,12 @@ class VoicelabController:
                 if result_fn.node_id == "Create Spectrogram":
                     # "figure" is the maptlotlib figure returned from VisualizeVoiceNode.py
                     #  it is a dictionary key, the dictionary value is the actual figure `fig`  from fig = plt.figure()
-                    figure: matplotlib.pyplot.Figure = pipeline_results[i][result_fn]["figure"]
+                    figure: Figure = pipeline_results[i][result_fn]["figure"]
                     self.load_figure(figure)
                 elif result_fn.node_id == "Create LPC Power Spectra":
                     # "spectrum" is the matplotlib figure from VisualizeSpectrum.py
                     #  it is a dictionary key, the dictionary value is the actual figure `fig`  from fig = plt.figure()
-                    spectrum: matplotlib.pyplot.Figure = pipeline_results[i][result_fn]["spectrum"]
+                    spectrum: Figure = pipeline_results[i][result_fn]["spectrum"]
                     self.load_spectrum(spectrum)
                 self.data_model.load_result(
                     active_voices[i], result_fn.node_id, pipeline_results[i][result_fn]
@@ -333,6 +409,23 @@ class VoicelabController:
                     self.data_model.set_computed_setting(result_fn.node_id, arg_setting, result_fn.args[arg_setting])
         return self.data_model.active_results
 
+    """
+    # cancel_processing: stop processing once the file being processed is finished. The files that
+    # were processed keep their results. Called from the GUI while processing runs in another thread,
+    # which may not have its pipeline running yet. Then pass_on_cancel stops it after its first file
+    """
+
+    def cancel_processing(self):
+        self.cancel_requested = True
+        pipeline = self.pipeline
+        if pipeline is not None:
+            pipeline.cancel()
+
+    def pass_on_cancel(self, node, start, current, end):
+        pipeline = self.pipeline
+        if self.cancel_requested and pipeline is not None:
+            pipeline.cancel()
+
     """
     # save_results: save the results of processing to the files system
     """
@@ -340,180 +433,81 @@ class VoicelabController:
     def save_results(
             self, active_results, active_functions, last_used_settings, save_location
     ):
-
-        append_file_to_results = False
-        append_file_to_settings = False
+        from matplotlib.figure import Figure
 
         if save_location != "":
 
-            # Prepare the data for saving as an excel workbook
-            results_sheets = {
-                fn_name: {"Input File": []} for fn_name in active_functions
-            }
-            settings_sheets = {
-                fn_name: {"Input File": []} for fn_name in active_functions
-            }
-
-            # Create a new sheet for each function, and fill with the results for each file
-            for i, file_path in enumerate(active_results):
+            # Save the sounds and figures the functions made as files, and put the names of the
+            # files in the tables instead
+            table_results = {}
+            for file_path in active_results:
 
                 file_name = file_path.split("/")[-1].split(".wav")[0]
+                table_results[file_path] = {}
 
                 for fn_name in active_results[file_path]:
 
-                    if fn_name != "Load Voice":
-                        # We want to exclude saving the unmodified voice
-                        for result_name in active_results[file_path][fn_name]:
-
-                            result_value = active_results[file_path][fn_name][
-                                result_name
-                            ]
-                            header_value = ""
-                            output_value = ""
-
-                            if isinstance(result_value, np.generic):
-                                result_value = result_value.item()
-
-                            # if the result is a modified sound file, we want to save that as a wav file
-                            if isinstance(result_value, parselmouth.Sound):
-                                voice_name = result_value.name
-                                modified_path = (
-                                        save_location + "/" + voice_name + ".wav"
-                                )
-                                self.save_voice(result_value, modified_path)
-                                header_value = result_name + " Output File"
-                                output_value = voice_name
-
-                            # if the result is some sort of matlab figure, we want to save it as a png
-                            # assign filenames based on results dictionary key
-                            elif isinstance(result_value, Figure):
+                    # We want to exclude saving the unmodified voice, but keep why a file could not be read
+                    if fn_name == "Load Voice":
+                        if "error" in active_results[file_path][fn_name]:
+                            table_results[file_path][fn_name] = {"error": active_results[file_path][fn_name]["error"]}
+                        continue
+
+                    fn_results = {}
+                    for result_name, result_value in active_results[file_path][fn_name].items():
+
+                        # if the result is a modified sound file, we want to save that as a wav file
+                        if isinstance(result_value, parselmouth.Sound):
+                            voice_name = result_value.name
+                            modified_path = save_location + "/" + voice_name + ".wav"
+                            self.save_voice(result_value, modified_path)
+                            fn_results[result_name + " Output File"] = voice_name
+
+                        # if the result is some sort of matlab figure, we want to save it as a png
+                        # assign filenames based on results dictionary key
+                        elif isinstance(result_value, Figure):
+                            if result_name == "figure":
                                 spectrogram_path = ''.join([save_location, "/", file_name, "_spectrogram.png"])
+                                self.save_spectrogram(result_value, spectrogram_path)
+                                fn_results["Output File"] = spectrogram_path
+                            elif result_name == "spectrum":
                                 spectrum_path = ''.join([save_location, "/", file_name, "_spectrum.png"])
-                                if result_name == "figure":
-                                    self.save_spectrogram(result_value, spectrogram_path)
-                                    output_value = spectrogram_path
-                                elif result_name == "spectrum":
-                                    self.save_spectrum(result_value, spectrum_path)
-                                    output_value = spectrogram_path
-                                header_value = "Output File"
-
-                            # if the result is any other type that we know how to save, save it as part of the work book
-                            elif type(result_value) in display_whitelist:
-                                header_value = result_name
-                                output_value = result_value
-
-                            # create a column in the sheet for this type of result if it hasnt already been created
-                            if header_value not in results_sheets[fn_name]:
-                                results_sheets[fn_name][header_value] = []
-
-                            # append the result to this column
-                            results_sheets[fn_name][header_value].append(
-                                str(output_value)
-                            )
-                            append_file_to_results = True
-
-                        # fill the settings sheets with values
-                        for j, param_name in enumerate(last_used_settings[fn_name]):
-                            if param_name not in settings_sheets[fn_name]:
-                                settings_sheets[fn_name][param_name] = []
-
-                            # if there are options, save the first one
-                            if isinstance(
-                                    last_used_settings[fn_name][param_name], tuple
-                            ):
-                                param_value = last_used_settings[fn_name][param_name][0]
-
-                            else:
-                                param_value = last_used_settings[fn_name][param_name]
-
-                            settings_sheets[fn_name][param_name].append(
-                                str(param_value)
-                            )
-
-                        # Check to see if we have already written the file name to the sheet
-                        results_sheets[fn_name]["Input File"].insert(0, file_name)
-                        settings_sheets[fn_name]["Input File"].insert(0, file_name)
-
-            results_writer = ExcelWriter(save_location + "/voicelab_results.xlsx")
-            settings_writer = ExcelWriter(save_location + "/voicelab_settings.xlsx")
-
-            summary_data = {
-                "files loaded": [file_name for file_name in self.active_voices],
-                "functions loaded": [fn_name for fn_name in self.active_functions],
-            }
-            # these need to be the same size, so we pad the one that needs it with blanks spaces
-            difference = len(summary_data["files loaded"]) - len(
-                summary_data["functions loaded"]
-            )
-            if difference > 0:
-                summary_data["functions loaded"] = summary_data["functions loaded"] + [
-                    "" for i in range(abs(difference))
-                ]
-            else:
-                summary_data["files loaded"] = summary_data["files loaded"] + [
-                    "" for i in range(abs(difference))
-                ]
+                                self.save_spectrum(result_value, spectrum_path)
+                                fn_results["Output File"] = spectrum_path
 
-            try:
-                summary_result_sheets = []
-                for sheet_name in results_sheets:
-                    sheet_data = results_sheets[sheet_name]
-                    if len(sheet_name) > 31:  # Excel column label lengths can't be longer than 31 characters
-                        sheet_name = sheet_name[:31]
-
-                    # Delete Praat pitch object from results dictionary
-                    # We need it for other algos, but we dont' want it in the csv file
-                    if 'Pitch' in sheet_data.keys():
-                        del sheet_data['Pitch']
-
-                    # Same as the above with any empty sheets
-                    if '' in sheet_data.keys():
-                        del sheet_data['']
-
-                    # ...and again for  Formant Objects
-                    if 'Formants' in sheet_data.keys():
-                        del sheet_data['Formants']
-
-                    sheet = pd.DataFrame(sheet_data)
-                    sheet['Measurement Name'] = sheet_name
-                    summary_result_sheets.append(sheet)
-                    print(f"Data from {sheet_name} saved.")
-
-                results_summary_sheet = pd.concat(summary_result_sheets, axis=1)
-                results_summary_sheet = results_summary_sheet.T.drop_duplicates().T
-                results_summary_sheet.to_excel(save_location + "/voicelab_results.xlsx", index=False)
+                        # anything else that can go in a table is saved as it is
+                        else:
+                            fn_results[result_name] = result_value
+                    table_results[file_path][fn_name] = fn_results
 
-            except Exception as e:
-                print(str(e))
-                message_text = str(e)
+            settings = {fn_name: last_used_settings[fn_name] for fn_name in active_functions if fn_name in last_used_settings}
 
+            level = "information"
             try:
-                summary_settings_sheets = []
-                for sheet_name in settings_sheets:
-                    if len(settings_sheets[sheet_name]) > 0:
-                        sheet_data = settings_sheets[sheet_name]
-                        if len(sheet_name) > 31:
-                            sheet_name = sheet_name[:31]
-                        sheet_df = pd.DataFrame(sheet_data)
-                        sheet_df['Measurement Name'] = sheet_name
-                        summary_settings_sheets.append(sheet_df)
-
-                sheet_summary_df = pd.concat(summary_settings_sheets, axis=1)
-                sheet_summary_df = sheet_summary_df.T.drop_duplicates().T
-                sheet_summary_df.to_excel(save_location + "/voicelab_settings.xlsx", index=False)
-
+                frame_times = {fn_name: getattr(node, "frame_times", {}) for fn_name, node in active_functions.items()}
+                save_tables(
+                    table_results, settings, save_location, self.export_formats, frame_times=frame_times,
+                    timings=self.timings,
+                )
+                if self.profiler is not None:
+                    self.save_profile(save_location)
+                message_text = "Results and settings saved successfully."
             except Exception as e:
                 print(str(e))
                 message_text = str(e)
+                level = "critical"
 
-            message_text = "Results and settings saved successfully."
+            self.show_message("Save Results", message_text, level)
 
-            saved_window = QMessageBox()
-            saved_window.setWindowTitle("Save Results")
-            saved_window.setText(message_text)
-            saved_window.setIcon(QMessageBox.Information)
-            saved_window.exec_()
+    """
+    # save_profile: save the profile of the last run: every function on every file, a summary per
+    # function, and a trace to open in chrome://tracing or ui.perfetto.dev
+    """
 
+    def save_profile(self, save_location):
+        self.profiler.save_samples(os.path.join(save_location, "voicelab_profile.csv"))
+        self.profiler.save_summary(os.path.join(save_location, "voicelab_profile_summary.csv"))
+        self.profiler.save_trace(os.path.join(save_location, "voicelab_trace.json"))
 
     def save_voice(self, voice: object, file_name: str) -> object:
         """saves a single parselmouth Sound object to the file system as a .wav file
@@ -530,12 +524,16 @@ class VoicelabController:
     """
 
     def save_spectrogram(self, figure, file_name):
+        import matplotlib.pyplot as plt
+
         figure.set_size_inches(10, 5)
         figure.savefig(file_name, dpi=250)
         plt.close(figure)
         return file_name
 
     def save_spectrum(self, figure, file_name):
+        import matplotlib.pyplot as plt
+
         figure.set_size_inches(10, 5)
         figure.savefig(file_name, dpi=250)
         plt.close(figure)
@@ -85,8 +85,9 @@ class VoicelabDataModel:
 
     ###############################################################################################
     # load_voice: makes the voice available to the system
-    # + voice: parselmouth Sound object
     # + file_path: path to the file in the filesystem. Used for indexing
+    # + signal: the samples of the file, or None if they will be decoded when processing starts
+    # + sampling_rate: sampling rate of the file
     ###############################################################################################
     #def load_voice(self, voice, file_path):
     def load_voice(self, file_path, signal, sampling_rate):
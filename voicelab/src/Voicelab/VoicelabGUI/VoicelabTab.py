@@ -22,20 +22,48 @@ class VoicelabTab(QWidget):
     # start_process: start processing the data through the pipeline
     ###############################################################################################
     def start_process(self):
-        """start_process -tells the data controller to start processing"""
-        pipeline_results = self.data_controller.start_processing(
-            self.data_controller.active_voices,
-            self.data_controller.active_functions,
-            self.data_controller.active_settings,
+        """start_process -tells the data controller to start processing in a background thread, so
+        the window keeps responding. Progress is reported through on_progress_update as it is made"""
+        self.processing_thread = ProcessingThread(self.data_controller, parent=self)
+        self.processing_thread.finished.connect(self.on_process_finished)
+        # a cancel left over from the last run, clicked as it finished, doesn't stop this one
+        self.data_controller.cancel_requested = False
+        self.signals["on_processing_started"].emit()
+        self.processing_thread.start()
 
-        )
+    ###############################################################################################
+    # cancel_process: stop processing once the file being processed is finished
+    ###############################################################################################
+    def cancel_process(self):
+        """cancel_process -tells the data controller to stop after the file it is processing"""
+        self.data_controller.cancel_processing()
 
-        # todo figure out where pipeline_results ends up
-        # notify all those listening that the processing has completed
+    ###############################################################################################
+    # on_process_finished: called on the GUI thread once the processing thread has finished
+    ###############################################################################################
+    def on_process_finished(self):
+        """on_process_finished -notify all those listening that the processing has completed"""
+        self.processing_thread = None
         self.signals["on_processing_completed"].emit(
             self.data_controller.active_results
         )
 
+    ###############################################################################################
+    # on_progress_estimated: show the progress, weighted by how long each function takes, and the
+    # time left on the progress bar
+    ###############################################################################################
+    def on_progress_estimated(self, fraction, seconds_left):
+        """
+        Args:
+            fraction: how much of the work is done, from 0 to 1
+            seconds_left: estimated seconds left, -1 if there is no estimate yet
+        """
+        self.progress.setValue(round(fraction * self.progress.maximum()))
+        if seconds_left >= 0:
+            self.progress.setFormat(f"%p% - about {format_duration(seconds_left)} left")
+        else:
+            self.progress.setFormat("%p%")
+
     ###############################################################################################
     # on_completed: default callback function for when data processing is complete
     ###############################################################################################
@@ -45,3 +73,44 @@ class VoicelabTab(QWidget):
             pipeline_results:
         """
         print("test", pipeline_results)
+
+
+def format_duration(seconds):
+    """Write seconds as hours and minutes, minutes and seconds, or seconds
+
+    Args:
+        seconds:
+    """
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours > 0:
+        return f"{hours} h {minutes} min"
+    if minutes > 0:
+        return f"{minutes} min {seconds} s"
+    return f"{seconds} s"
+
+
+###################################################################################################
+# ProcessingThread: runs the data controller's processing off the GUI thread. Progress and messages
+# from the controller are sent on with signals, which Qt delivers on the GUI thread
+###################################################################################################
+class ProcessingThread(QThread):
+    def __init__(self, data_controller, *args, **kwargs):
+        """
+        Args:
+            data_controller:
+            *args:
+            **kwargs:
+        """
+        super().__init__(*args, **kwargs)
+        self.data_controller = data_controller
+
+    def run(self):
+        try:
+            self.data_controller.start_processing(
+                self.data_controller.active_voices,
+                self.data_controller.active_functions,
+                self.data_controller.active_settings,
+            )
+        except Exception as e:
+            self.data_controller.show_message("Processing Failed", str(e), "critical")
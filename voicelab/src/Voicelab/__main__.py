@@ -21,8 +21,6 @@ from .default_settings import available_functions, default_functions
 # import logging
 
 
-sys.setrecursionlimit(10000)
-
 
 class VoicelabWizard(QMainWindow):
     # triggers when the list of loaded files has changed with the active list of files
@@ -34,12 +32,22 @@ class VoicelabWizard(QMainWindow):
     # triggers when the list of active functions is changed with the list of active functions
     on_functions_changed = pyqtSignal(dict)
 
+    # triggers when the pipeline starts processing in the background
+    on_processing_started = pyqtSignal()
+
     # triggers when the pipeline is done processing all of the files with the results
     on_processing_completed = pyqtSignal(dict)
 
     # triggers on each node finishing with the node name, the start, current, and end count of processed nodes
     on_progress_updated = pyqtSignal(str, int, int, int)
 
+    # triggers on each node finishing with the fraction of the work done, weighted by how long each
+    # node takes, and the estimated seconds left (-1 until there is an estimate)
+    on_progress_estimated = pyqtSignal(float, float)
+
+    # triggers when the data controller has a message for the user, with the title, text and level
+    on_message = pyqtSignal(str, str, str)
+
     def __init__(self):
         super().__init__()
 
@@ -54,8 +62,10 @@ class VoicelabWizard(QMainWindow):
             "on_files_changed": self.on_files_changed,
             "on_settings_changed": self.on_settings_changed,
             "on_functions_changed": self.on_functions_changed,
+            "on_processing_started": self.on_processing_started,
             "on_processing_completed": self.on_processing_completed,
             "on_progress_update": self.on_progress_updated,
+            "on_progress_estimate": self.on_progress_estimated,
         }
 
         # Specifies the default size of the window,
@@ -79,6 +89,10 @@ class VoicelabWizard(QMainWindow):
         self.data_controller = VoicelabController()
         # links the progress updating on the data controller side to a pyqt signal that can be listened to anywhere
         self.data_controller.progress_callback = self.on_progress_update_drf
+        # messages from the controller are shown in dialogs. They can come from the processing
+        # thread, so they are sent through a signal to be shown on the GUI thread
+        self.on_message.connect(self.show_message)
+        self.data_controller.message_callback = self.on_message.emit
 
        #self.data_controller.progress_callback = lambda node, start, current, end: self.voicelab_signals[
        #    "on_progress_update"
@@ -137,12 +151,22 @@ class VoicelabWizard(QMainWindow):
         #    ),
         #    "Experimental",  # Specify the Tab title here
         #)
-    def on_progress_update_drf(self, node, start, current, end):
+    def show_message(self, title, text, level):
+        message_window = QMessageBox()
+        message_window.setWindowTitle(title)
+        message_window.setText(text)
+        message_window.setIcon(QMessageBox.Critical if level == "critical" else QMessageBox.Information)
+        message_window.exec_()
+
+    def on_progress_update_drf(self, node, start, current, end, timing=None):
         self.voicelab_signals[
             "on_progress_update"
         ].emit(
             node.node_id, start, current, end
         )
+        if timing is not None:
+            remaining = timing["remaining"] if timing["remaining"] is not None else -1
+            self.voicelab_signals["on_progress_estimate"].emit(timing["fraction"], remaining)
 
 def main():
 
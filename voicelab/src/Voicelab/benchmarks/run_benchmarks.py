@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+"""
+# voicelab-benchmark: time every VoiceLab function on synthetic vowels, to track across releases.
+#
+#   voicelab-benchmark OUTPUT [--durations 1 30 600] [--sampling-rates 16000 22050 44100]
+#
+# Sustained vowels with a known F0, jitter, shimmer and formants are made for each duration and
+# sampling rate (see synthetic_voices.py), and kept in OUTPUT/corpus to be reused by later runs.
+# Each function in default_settings.available_functions, and the default set of functions the GUI
+# runs, is then run on each vowel in a fresh process, after a short warm-up so imports and first
+# calls aren't counted. Functions that need others are run with them, but only their own time is
+# reported.
+#
+# Results are saved to OUTPUT/voicelab_benchmark.json, with the versions of Python, VoiceLab and
+# its libraries and the machine they ran on, and as a table to OUTPUT/voicelab_benchmark.csv, one
+# row per function and vowel:
+#
+#   cpu seconds                 CPU time of the function, the least over the repeats
+#   wall seconds                wall time of the function, the least over the repeats
+#   audio seconds per cpu second    duration of the vowel over its cpu seconds
+#   peak rss bytes              the most memory the process held, over the whole run
+#   peak memory bytes           the most memory the function allocated at once, as traced by the
+#                               profiler in one more run after the timed ones, which doesn't see
+#                               what Praat allocates itself
+#   praat calls                 calls to parselmouth.praat.call made by the function
+#
+# A function that fails on a vowel has its error in the error column instead.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+from .synthetic_voices import synthesize_corpus, synthesize_vowel
+
+DEFAULT_DURATIONS = [1, 30, 600]
+DEFAULT_SAMPLING_RATES = [16000, 22050, 44100]
+
+# Name of the row timing the GUI's default functions together
+DEFAULT_PIPELINE = "Default functions"
+
+# Seconds of the warm-up vowel
+WARM_UP_SECONDS = 0.5
+
+# Columns of a result row
+COLUMNS = [
+    "function", "duration", "sampling rate", "repeats", "cpu seconds", "wall seconds",
+    "audio seconds per cpu second", "pipeline cpu seconds", "pipeline wall seconds",
+    "peak rss bytes", "peak memory bytes", "praat calls", "error",
+]
+
+# Libraries whose versions are saved with the results
+LIBRARIES = ["praat-parselmouth", "numpy", "scipy", "librosa", "pandas", "matplotlib"]
+
+
+def with_requirements(functions):
+    """The functions to run so each of functions gets its inputs: those it needs from
+    default_settings.function_requirements, recursively, then the functions themselves
+
+    Args:
+        functions: names of functions
+    """
+    from ..default_settings import function_requirements
+
+    needed = []
+
+    def add(fn_name):
+        if fn_name in needed:
+            return
+        for parent, _ in function_requirements.get(fn_name, []):
+            add(parent)
+        needed.append(fn_name)
+
+    for fn_name in functions:
+        add(fn_name)
+    return needed
+
+
+def run_functions(file_path, functions, trace_memory=False):
+    """Run functions on one file the way voicelab-batch does, in this process. Returns the profiler
+    of the run and the wall and CPU seconds of the whole run
+
+    Args:
+        file_path:
+        functions: names of the functions to run
+        trace_memory: profile the peak memory of the functions too, which slows them down
+    """
+    from ..VoicelabGUI.VoicelabController import VoicelabController
+    from ..default_settings import available_functions
+
+    # the controller and nodes report their progress and some of their results by printing them
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        controller = VoicelabController()
+        controller.profile = True
+        controller.profile_memory = trace_memory
+        for fn_name in with_requirements(functions):
+            controller.load_function(fn_name, available_functions[fn_name], default=True)
+            controller.activate_function(fn_name)
+        controller.load_voices([file_path])
+        controller.activate_voices([file_path])
+
+        started = time.perf_counter()
+        cpu_before = time.process_time()
+        controller.start_processing(
+            controller.active_voices, controller.active_functions, controller.active_settings
+        )
+        cpu = time.process_time() - cpu_before
+        wall = time.perf_counter() - started
+    return controller.profiler, wall, cpu
+
+
+def measure(file_path, warm_up_path, function, duration, sampling_rate, repeats):
+    """Benchmark one function, or the default functions, on one file. Meant to run in a fresh
+    process, so the peak memory is its own. Returns a result row
+
+    Args:
+        file_path: the vowel to run on
+        warm_up_path: a short vowel to run on first
+        function: name of a function, or DEFAULT_PIPELINE
+        duration: seconds of the vowel
+        sampling_rate: of the vowel
+        repeats: how many times to run it
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from ..default_settings import default_functions
+    from ..pipeline.Profiler import _peak_rss
+
+    functions = default_functions if function == DEFAULT_PIPELINE else [function]
+    row = {"function": function, "duration": duration, "sampling rate": sampling_rate, "repeats": repeats}
+    try:
+        run_functions(warm_up_path, functions)
+        best = None
+        for _ in range(repeats):
+            profiler, wall, cpu = run_functions(file_path, functions)
+            samples = [sample for sample in profiler.samples if sample["function"] in functions]
+            if function == DEFAULT_PIPELINE:
+                run = {"cpu seconds": cpu, "wall seconds": wall}
+            else:
+                run = {
+                    "cpu seconds": sum(sample["cpu seconds"] for sample in samples),
+                    "wall seconds": sum(sample["wall seconds"] for sample in samples),
+                }
+            run["pipeline cpu seconds"] = cpu
+            run["pipeline wall seconds"] = wall
+            run["praat calls"] = sum(sample["praat calls"] for sample in samples)
+            if best is None or run["cpu seconds"] < best["cpu seconds"]:
+                best = run
+        row.update(best)
+        row["audio seconds per cpu second"] = duration / row["cpu seconds"] if row["cpu seconds"] > 0 else None
+        # before tracing, which takes memory of its own
+        row["peak rss bytes"] = _peak_rss()
+        # memory is traced on its own run so the timed runs aren't slowed by it
+        profiler, wall, cpu = run_functions(file_path, functions, trace_memory=True)
+        memory = [
+            sample["peak memory bytes"] for sample in profiler.samples
+            if sample["function"] in functions and sample["peak memory bytes"] is not None
+        ]
+        row["peak memory bytes"] = max(memory) if len(memory) > 0 else None
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def environment():
+    """Where the benchmark ran: versions of Python, VoiceLab and its libraries, and the machine"""
+    versions = {}
+    for library in ["voicelab"] + LIBRARIES:
+        try:
+            versions[library] = metadata.version(library)
+        except metadata.PackageNotFoundError:
+            versions[library] = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "versions": versions,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_benchmarks(output_path, durations=DEFAULT_DURATIONS, sampling_rates=DEFAULT_SAMPLING_RATES,
+                   functions=None, repeats=1, seed=0):
+    """Benchmark functions on synthetic vowels and save the results to output_path. Returns the
+    results as saved to voicelab_benchmark.json
+
+    Args:
+        output_path: directory to save the vowels and results in
+        durations: seconds of the vowels
+        sampling_rates: of the vowels
+        functions: names of the functions to time, None for every available function and the
+            default functions together
+        repeats: how many times each function is run on each vowel, the fastest is reported
+        seed: seed of the vowels' random perturbations
+    """
+    from ..default_settings import available_functions
+
+    if functions is None:
+        functions = list(available_functions) + [DEFAULT_PIPELINE]
+    corpus_path = os.path.join(output_path, "corpus")
+    corpus = synthesize_corpus(corpus_path, durations, sampling_rates, seed=seed)
+    warm_up = {}
+    for sampling_rate in sampling_rates:
+        warm_up[sampling_rate] = os.path.join(corpus_path, f"warm_up_{sampling_rate}Hz.wav")
+        synthesize_vowel(warm_up[sampling_rate], WARM_UP_SECONDS, sampling_rate, seed=seed)
+
+    rows = []
+    # a fresh process for each run, so nothing is shared between functions and peak memory is theirs
+    context = multiprocessing.get_context("spawn")
+    for file_path, voice in corpus:
+        for function in functions:
+            with context.Pool(1, maxtasksperchild=1) as pool:
+                row = pool.apply(
+                    measure,
+                    (file_path, warm_up[voice["sampling_rate"]], function, voice["duration"],
+                     voice["sampling_rate"], repeats),
+                )
+            rows.append(row)
+            print(
+                f"{function} on {voice['duration']:g} s at {voice['sampling_rate']} Hz: "
+                + (row["error"] if "error" in row else f"{row['audio seconds per cpu second']:.1f} audio s per cpu s"),
+                file=sys.stderr,
+            )
+
+    results = {
+        "environment": environment(),
+        "voices": [voice for _, voice in corpus],
+        "results": rows,
+    }
+    with open(os.path.join(output_path, "voicelab_benchmark.json"), "w") as f:
+        json.dump(results, f, indent=2)
+    with open(os.path.join(output_path, "voicelab_benchmark.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="voicelab-benchmark",
+        description="Time every VoiceLab function on synthetic vowels",
+    )
+    parser.add_argument("output", help="directory to save the vowels and results in")
+    parser.add_argument("--durations", type=float, nargs="+", default=DEFAULT_DURATIONS,
+                        help="seconds of the vowels (default: 1 30 600)")
+    parser.add_argument("--sampling-rates", type=int, nargs="+", default=DEFAULT_SAMPLING_RATES,
+                        help="sampling rates of the vowels (default: 16000 22050 44100)")
+    parser.add_argument("--function", action="append", default=None, dest="functions",
+                        help=f"function to time, can be given more than once, '{DEFAULT_PIPELINE}' times the "
+                             "default functions together (default: every function, and the default functions)")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="runs of each function on each vowel, the fastest is reported (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the vowels' random perturbations")
+    args = parser.parse_args(argv)
+
+    from ..default_settings import available_functions
+
+    for function in args.functions or []:
+        if function != DEFAULT_PIPELINE and function not in available_functions:
+            parser.error(f"Unknown function '{function}', choose from: {', '.join(available_functions)}")
+    os.makedirs(args.output, exist_ok=True)
+    run_benchmarks(
+        args.output,
+        durations=args.durations,
+        sampling_rates=args.sampling_rates,
+        functions=args.functions,
+        repeats=args.repeats,
+        seed=args.seed,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import json
+import os
+
+import numpy as np
+import soundfile
+from scipy.signal import lfilter
+
+###################################################################################################
+# Synthetic voices:
+#
+### Sustained vowels made from a train of glottal pulses passed through formant resonators, so the
+### F0, jitter, shimmer and formants of the sound are known. Each pulse is a Rosenberg pulse of
+### glottal flow, its period and amplitude are perturbed at random to give the jitter and shimmer
+### asked for, and the flow is filtered by a cascade of two-pole resonators, one per formant, and
+### differentiated for the radiation at the lips. Sounds are made and written a block at a time,
+### so even hours of audio only take a few seconds of it in memory.
+###################################################################################################
+
+# An /a/ spoken by an adult male
+DEFAULT_VOICE = {
+    "f0": 120.0,
+    "jitter": 0.01,
+    "shimmer": 0.03,
+    "formants": [730.0, 1090.0, 2440.0, 3400.0, 4500.0],
+    "bandwidths": [80.0, 90.0, 120.0, 175.0, 250.0],
+    "snr": 40.0,
+}
+
+# Fractions of the mean period the glottis spends opening and closing, the rest of it is closed
+OPENING = 0.4
+CLOSING = 0.16
+
+# Seconds of audio made at a time
+BLOCK_SECONDS = 10
+
+
+def glottal_pulses(duration, f0, jitter, shimmer, rng):
+    """Onset times, periods and amplitudes of the glottal pulses of a sound
+
+    Jitter and shimmer are the local jitter and shimmer Praat reports: the mean absolute difference
+    between consecutive periods (or amplitudes) over their mean. Perturbing each period by normal
+    noise with standard deviation s gives a mean absolute difference of 2s / sqrt(pi), so s is
+    chosen from that.
+
+    Args:
+        duration: seconds
+        f0: mean fundamental frequency in Hertz
+        jitter: local jitter, as a fraction
+        shimmer: local shimmer, as a fraction
+        rng: numpy random Generator
+    """
+    period = 1 / f0
+    count = int(np.ceil(duration * f0 * 1.1)) + 2
+    periods = period * (1 + jitter * np.sqrt(np.pi) / 2 * rng.standard_normal(count))
+    amplitudes = 1 + shimmer * np.sqrt(np.pi) / 2 * rng.standard_normal(count)
+    # no period can be so short the next pulse starts before the glottis closes, or so soft it
+    # turns around
+    periods = np.maximum(periods, period * (OPENING + CLOSING))
+    amplitudes = np.maximum(amplitudes, 0.1)
+    onsets = np.concatenate([[0.0], np.cumsum(periods[:-1])])
+    return onsets, periods, amplitudes
+
+
+def glottal_flow(times, onsets, amplitudes, f0):
+    """Glottal flow at times, a Rosenberg pulse per onset. Every pulse lasts the same fraction of
+    the mean period, so the glottis closes exactly one period after it last closed, and the jitter
+    of the closures is that of the periods
+
+    Args:
+        times: seconds to sample the flow at
+        onsets:
+        amplitudes:
+        f0: mean fundamental frequency in Hertz
+    """
+    pulse = np.searchsorted(onsets, times, side="right") - 1
+    phase = (times - onsets[pulse]) * f0
+    flow = np.zeros_like(times)
+    opening = phase < OPENING
+    flow[opening] = 0.5 * (1 - np.cos(np.pi * phase[opening] / OPENING))
+    closing = (phase >= OPENING) & (phase < OPENING + CLOSING)
+    flow[closing] = np.cos(np.pi / 2 * (phase[closing] - OPENING) / CLOSING)
+    return flow * amplitudes[pulse]
+
+
+def resonator(frequency, bandwidth, sampling_rate):
+    """Coefficients of a two-pole resonator with a gain of one at 0 Hz
+
+    Args:
+        frequency: Hertz
+        bandwidth: Hertz
+        sampling_rate:
+    """
+    radius = np.exp(-np.pi * bandwidth / sampling_rate)
+    theta = 2 * np.pi * frequency / sampling_rate
+    a = np.array([1.0, -2 * radius * np.cos(theta), radius ** 2])
+    return np.array([a.sum()]), a
+
+
+def synthesize_vowel(path, duration, sampling_rate, f0=None, jitter=None, shimmer=None, formants=None,
+                     bandwidths=None, snr=None, seed=0):
+    """Write a sustained vowel to a .wav file of 32 bit floats. Anything left out is taken from
+    DEFAULT_VOICE. Returns the voice, as a dictionary of the values the sound was made with
+
+    Args:
+        path: the .wav file to write
+        duration: seconds
+        sampling_rate: samples per second
+        f0: mean fundamental frequency in Hertz
+        jitter: local jitter, as a fraction
+        shimmer: local shimmer, as a fraction
+        formants: formant frequencies in Hertz, those at or above the Nyquist frequency are left out
+        bandwidths: formant bandwidths in Hertz, one per formant
+        snr: ratio of the vowel to added white noise, in dB
+        seed: seed of the random perturbations and noise
+    """
+    voice = dict(DEFAULT_VOICE)
+    for key, value in [("f0", f0), ("jitter", jitter), ("shimmer", shimmer), ("formants", formants),
+                       ("bandwidths", bandwidths), ("snr", snr)]:
+        if value is not None:
+            voice[key] = value
+    resonators = [
+        (frequency, bandwidth)
+        for frequency, bandwidth in zip(voice["formants"], voice["bandwidths"])
+        if frequency < sampling_rate / 2
+    ]
+    voice["formants"] = [float(frequency) for frequency, bandwidth in resonators]
+    voice["bandwidths"] = [float(bandwidth) for frequency, bandwidth in resonators]
+
+    rng = np.random.default_rng(seed)
+    onsets, _, amplitudes = glottal_pulses(duration, voice["f0"], voice["jitter"], voice["shimmer"], rng)
+    filters = [resonator(frequency, bandwidth, sampling_rate) for frequency, bandwidth in resonators]
+    filter_states = [np.zeros(2) for _ in filters]
+    last_sample = 0.0
+    gain = None
+
+    total = int(round(duration * sampling_rate))
+    block = int(BLOCK_SECONDS * sampling_rate)
+    with soundfile.SoundFile(path, "w", samplerate=sampling_rate, channels=1, subtype="FLOAT") as f:
+        for start in range(0, total, block):
+            times = np.arange(start, min(start + block, total)) / sampling_rate
+            signal = glottal_flow(times, onsets, amplitudes, voice["f0"])
+            for i, (b, a) in enumerate(filters):
+                signal, filter_states[i] = lfilter(b, a, signal, zi=filter_states[i])
+            # radiation at the lips
+            signal, last_sample = np.diff(signal, prepend=last_sample), signal[-1]
+            if gain is None:
+                # the same gain for every block, so the level of the first block sets it
+                gain = 0.5 / max(np.abs(signal).max(), 1e-12)
+                noise_level = np.sqrt(np.mean((signal * gain) ** 2)) * 10 ** (-voice["snr"] / 20)
+            signal = signal * gain + noise_level * rng.standard_normal(len(signal))
+            f.write(signal.astype(np.float32))
+
+    voice["duration"] = duration
+    voice["sampling_rate"] = sampling_rate
+    voice["seed"] = seed
+    return voice
+
+
+def synthesize_corpus(directory, durations, sampling_rates, seed=0, **voice):
+    """Write a vowel of each duration at each sampling rate to directory, and a voices.json next to
+    them with the values each was made with. Sounds already there from the same values are kept.
+    Returns a list of (path, voice)
+
+    Args:
+        directory:
+        durations: seconds
+        sampling_rates:
+        seed:
+        **voice: values to change from DEFAULT_VOICE, passed to synthesize_vowel
+    """
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, "voices.json")
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            index = json.load(f)
+
+    corpus = []
+    for duration in durations:
+        for sampling_rate in sampling_rates:
+            file_name = f"vowel_{duration:g}s_{sampling_rate}Hz.wav"
+            path = os.path.join(directory, file_name)
+            wanted = dict(DEFAULT_VOICE, **voice, seed=seed)
+            entry = index.get(file_name)
+            if entry is None or entry["wanted"] != wanted or not os.path.exists(path):
+                entry = {"wanted": wanted, "voice": synthesize_vowel(path, duration, sampling_rate, seed=seed, **voice)}
+                index[file_name] = entry
+            corpus.append((path, entry["voice"]))
+
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+    return corpus
@@ -1,60 +1,46 @@
-from parselmouth.praat import call
-from .toolkits import Voicelab
-
-# List of all available operations the user can perform as well as their associated function node
-available_functions = {
-    "Measure Duration": Voicelab.MeasureDurationNode("Measure Duration"),
-    # "Measure HNR Voice Sauce": Voicelab.MeasureHNRVoiceSauceNode("Measure HNR Voice Sauce"),
-    "Measure Pitch": Voicelab.MeasurePitchNode("Measure Pitch"),
-    # "Measure Subharmonics": Voicelab.MeasureSHRPNode("Measure Subharmonics"),
-    # "Measure Pitch Yin": Voicelab.MeasurePitchYinNode("Measure Pitch Yin"),
-    "Measure Harmonics-to-Noise-Ratio": Voicelab.MeasureHarmonicityNode(
-        "Measure Harmonics-to-Noise-Ratio"
-    ),
-    "Measure Alpha Ratio": Voicelab.MeasureAlphaRatioNode("Measure Alpha Ratio"),
-    #"Measure Harmonics": Voicelab.MeasureHarmonicsNode("Measure Harmonics"),
-    "Measure Jitter": Voicelab.MeasureJitterNode("Measure Jitter"),
-    "Measure Shimmer": Voicelab.MeasureShimmerNode("Measure Shimmer"),
-    "Measure Cepstral Peak Prominance (CPP)": Voicelab.MeasureCPPNode(
-        "Measure Cepstral Peak Prominance (CPP)"
-    ),
-    "Measure Formants": Voicelab.MeasureFormantNode("Measure Formants"),
-    "Measure Vocal Tract Estimates": Voicelab.MeasureVocalTractEstimatesNode(
-        "Measure Vocal Tract Estimates"
-    ),
-    "Measure Intensity": Voicelab.MeasureIntensityNode("Measure Intensity"),
-    "Measure Speech Rate": Voicelab.MeasureSpeechRateNode("Measure Speech Rate"),
-    "Measure LTAS": Voicelab.MeasureLTASNode("Measure LTAS"),
-    "Measure MFCCs": Voicelab.MeasureMFCCNode("Measure MFCCs"),
-    "Measure Spectral Tilt": Voicelab.MeasureSpectralTiltNode("Measure Spectral Tilt"),
-    "Measure Energy": Voicelab.MeasureEnergyNode("Measure Energy"),
-    "Measure Spectral Shape": Voicelab.MeasureSpectralShapeNode("Measure Spectral Shape"),
-
-    "Manipulate Pitch Lower": Voicelab.ManipulatePitchLowerNode(
-        "Manipulate Pitch Lower"
-    ),
-    "Manipulate Pitch Higher": Voicelab.ManipulatePitchHigherNode(
-        "Manipulate Pitch Higher"
-    ),
-    "Manipulate Formants Lower": Voicelab.ManipulateLowerFormantsNode("Manipulate Formants Lower"),
-    "Manipulate Formants Higher": Voicelab.ManipulateRaiseFormantsNode("Manipulate Formants Higher"),
-    "Manipulate Pitch And Formants Lower": Voicelab.ManipulateLowerPitchAndFormantsNode(
-        "Manipulate Pitch And Formants Lower"
-    ),
-    "Manipulate Pitch And Formants Higher": Voicelab.ManipulateRaisePitchAndFormantsNode(
-        "Manipulate Pitch And Formants Higher"
-    ),
-
-    "Trim Sounds": Voicelab.ManipulateTruncateSoundsNode("Trim Sounds"),
-
-    "Resample Sounds": Voicelab.ResampleSoundsNode("Resample Sounds"),
-    "Reverse Sounds": Voicelab.ReverseSoundsNode("Reverse Sounds"),
-    "Rotate Spectrum": Voicelab.RotateSpectrumNode("Rotate Spectrum"),
-    "Scale Intensity (RMS)": Voicelab.ScaleIntensityNode("Scale Intensity (RMS)"),
-    "Create Spectrogram": Voicelab.VisualizeVoiceNode("Create Spectrogram"),
-    "Create LPC Power Spectra": Voicelab.VisualizeSpectrumNode("Create LPC Power Spectra"),
-    #"Create F1F2 Plot": Voicelab.F1F2PlotNode("Create F1F2 Plot"),
-}
+from .pipeline.NodeFactory import NodeCatalog
+
+# List of all available operations the user can perform as well as their associated function node.
+# Each node is only imported and created when it is first looked up
+available_functions = NodeCatalog("Voicelab", {
+    "Measure Duration": "MeasureDurationNode",
+    # "Measure HNR Voice Sauce": "MeasureHNRVoiceSauceNode",
+    "Measure Pitch": "MeasurePitchNode",
+    # "Measure Subharmonics": "MeasureSHRPNode",
+    # "Measure Pitch Yin": "MeasurePitchYinNode",
+    "Measure Harmonics-to-Noise-Ratio": "MeasureHarmonicityNode",
+    "Measure Alpha Ratio": "MeasureAlphaRatioNode",
+    #"Measure Harmonics": "MeasureHarmonicsNode",
+    "Measure Jitter": "MeasureJitterNode",
+    "Measure Shimmer": "MeasureShimmerNode",
+    "Measure Cepstral Peak Prominance (CPP)": "MeasureCPPNode",
+    "Measure Formants": "MeasureFormantNode",
+    "Measure Vocal Tract Estimates": "MeasureVocalTractEstimatesNode",
+    "Measure Intensity": "MeasureIntensityNode",
+    "Measure Speech Rate": "MeasureSpeechRateNode",
+    "Measure LTAS": "MeasureLTASNode",
+    "Measure MFCCs": "MeasureMFCCNode",
+    "Measure Spectral Tilt": "MeasureSpectralTiltNode",
+    "Measure Energy": "MeasureEnergyNode",
+    "Measure Spectral Shape": "MeasureSpectralShapeNode",
+
+    "Manipulate Pitch Lower": "ManipulatePitchLowerNode",
+    "Manipulate Pitch Higher": "ManipulatePitchHigherNode",
+    "Manipulate Formants Lower": "ManipulateLowerFormantsNode",
+    "Manipulate Formants Higher": "ManipulateRaiseFormantsNode",
+    "Manipulate Pitch And Formants Lower": "ManipulateLowerPitchAndFormantsNode",
+    "Manipulate Pitch And Formants Higher": "ManipulateRaisePitchAndFormantsNode",
+
+    "Trim Sounds": "ManipulateTruncateSoundsNode",
+
+    "Resample Sounds": "ResampleSoundsNode",
+    "Reverse Sounds": "ReverseSoundsNode",
+    "Rotate Spectrum": "RotateSpectrumNode",
+    "Scale Intensity (RMS)": "ScaleIntensityNode",
+    "Create Spectrogram": "VisualizeVoiceNode",
+    "Create LPC Power Spectra": "VisualizeSpectrumNode",
+    #"Create F1F2 Plot": "F1F2PlotNode",
+})
 
 # List of default functions that will be performed.
 # NOTE: Excel limits sheet titles to 31 characters, since these are used as the titles of the sheets
@@ -11,6 +11,14 @@ class Node:
     process pipeline
     """
 
+    # Whether end() reads or changes the results of every pass. The pipeline keeps these nodes'
+    # results until it ends, even when it is streaming results to a sink
+    uses_results = False
+    # Names of outputs that are only there to be sent on to other nodes (Praat objects, sounds, ...)
+    # and are not reported. The pipeline drops them from the results it keeps once every node they
+    # are sent to has run
+    transient_outputs = ()
+
     ################################################################################################
     # Node.__init__: Initializes the node
     # + node_id: The unique id for the node.
@@ -63,6 +71,62 @@ class Node:
         self.ready = {**self.default_ready}
         return None
 
+    ################################################################################################
+    # Node.pack: Pipeline runs this on results before sending them back from a worker process
+    ################################################################################################
+    def pack(self, results):
+        """Default pack hook ran by the pipeline on a node's results before they
+        are sent back from a worker process. Override to drop or convert values
+        that cannot be pickled
+
+        Args:
+            results:
+        """
+        return results
+
+    ################################################################################################
+    # Node.merge_state: Pipeline runs this to fold state collected in a worker process back in
+    ################################################################################################
+    def merge_state(self, state):
+        """Default merge hook ran by the pipeline with the state a worker process
+        collected for a single pass. Lists are extended, dictionaries updated and
+        anything else is replaced
+
+        Args:
+            state:
+        """
+        for key, value in state.items():
+            if isinstance(value, list) and isinstance(self.state.get(key), list):
+                self.state[key].extend(value)
+            elif isinstance(value, dict) and isinstance(self.state.get(key), dict):
+                self.state[key].update(value)
+            else:
+                self.state[key] = value
+        return None
+
+    ################################################################################################
+    # Node.cache_key: Pipeline runs this to look the node's results up in its result cache
+    ################################################################################################
+    def cache_key(self):
+        """Default cache key hook ran by the pipeline before this node is processed, when the
+        pipeline has a result cache. Return a string identifying everything the results of this
+        pass depend on to have them stored and reused, or None to always process the node
+        """
+        return None
+
+    ################################################################################################
+    # Node.failed: Pipeline runs this on results before storing them in its result cache
+    ################################################################################################
+    def failed(self, results):
+        """Default failure hook ran by the pipeline on this node's results before they are
+        stored in the result cache. Return True if processing failed, so the results are not
+        reused and the node is processed again next time
+
+        Args:
+            results:
+        """
+        return False
+
     ################################################################################################
     # Node.end: Pipeline runs this when the pipeline ends
     ################################################################################################
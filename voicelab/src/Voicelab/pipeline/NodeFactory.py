@@ -1,4 +1,5 @@
 import importlib
+from collections.abc import Mapping
 
 # Task Factories know about all types of tasks that can be created and creates the appropriate instance when called
 # Abstracts the creation logic, and all of the library importing away from the user
@@ -52,8 +53,48 @@ class NodeFactory:
             class_name:
         """
         if type_id not in cls.registered_nodes:
-            module_name = "toolkits." + toolkit_id + "." + class_name
-            module = importlib.import_module(module_name)
+            # toolkits sit next to the pipeline package
+            module_name = "..toolkits." + toolkit_id + "." + class_name
+            module = importlib.import_module(module_name, __package__)
             cls.register_node(type_id, getattr(module, class_name))
+            # importing the module set it on the toolkit under the class's name, put the class there
+            toolkit = importlib.import_module("..toolkits." + toolkit_id, __package__)
+            setattr(toolkit, class_name, cls.registered_nodes[type_id])
 
         return cls.registered_nodes[type_id]
+
+
+###################################################################################################
+# NodeCatalog: A read only dictionary of nodes by node id. Each node's class is imported through
+# the NodeFactory, and the node created, the first time it is looked up, so listing what a toolkit
+# offers doesn't import every node and everything they depend on
+###################################################################################################
+class NodeCatalog(Mapping):
+    """Nodes by node id, imported and created when first looked up
+
+    Args:
+        toolkit_id: the toolkit the node classes are in
+        class_names: dictionary of node id to the name of the node's class
+    """
+
+    def __init__(self, toolkit_id, class_names):
+        self.toolkit_id = toolkit_id
+        self.class_names = dict(class_names)
+        self.nodes = {}
+
+    def __getitem__(self, node_id):
+        if node_id not in self.nodes:
+            class_name = self.class_names[node_id]
+            node_class = NodeFactory.import_node(class_name, self.toolkit_id, class_name)
+            self.nodes[node_id] = node_class(node_id)
+        return self.nodes[node_id]
+
+    def __contains__(self, node_id):
+        # don't create the node just to see if it is there
+        return node_id in self.class_names
+
+    def __iter__(self):
+        return iter(self.class_names)
+
+    def __len__(self):
+        return len(self.class_names)
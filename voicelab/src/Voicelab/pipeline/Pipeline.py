@@ -1,3 +1,8 @@
+import copy
+import time
+from collections import deque
+from multiprocessing import Pool, cpu_count
+
 from ..pipeline.Node import Node
 
 ###################################################################################################
@@ -18,7 +23,7 @@ class Pipeline:
     """
 
     # TODO: Validation step for initialization arguments
-    def __init__(self, nodes=None, global_vars=None, roots=None):
+    def __init__(self, nodes=None, global_vars=None, roots=None, processes=1, cache=None, sink=None, profiler=None):
         """Pipeline initialization. Optionally can initialize with nodes,
         global_vars, roots
 
@@ -26,6 +31,15 @@ class Pipeline:
             nodes:
             global_vars:
             roots:
+            processes: number of worker processes to run passes in. 1 runs everything in this
+                process, 0 or None uses one worker per cpu
+            cache: a ResultCache to reuse the results of nodes from earlier runs, None to always
+                process every node
+            sink: a ResultSink each pass's results are written to as soon as the pass is done. The
+                results are then dropped, except those of nodes that use them when the pipeline
+                ends. None keeps every result and returns them all from start()
+            profiler: a Profiler to record the time, memory and praat calls of every node run, None
+                to not profile
         """
         # tree of nodes, storing return value names and its subsequent children
         self.nodes = nodes if nodes is not None else {}
@@ -39,9 +53,29 @@ class Pipeline:
         self.results = {}
         # Naive listener list for listening for run time updates
         self.listeners = []
+        # Listeners that are also told the progress weighted by how long each node takes
+        self.timed_listeners = []
         self.progress_start = 0
         self.progress_current = 0
         self.progress_end = 0
+        # How many passes each node is expected to run, from the batch size reported at the start
+        self.progress_runs = 0
+        # When the pipeline started, to estimate the time left
+        self.progress_started = None
+        # Seconds each node took to process, for every pass: a list of {node: seconds}
+        self.timings = []
+        # [number of runs, total seconds] of each node so far, to weight progress by
+        self.node_costs = {}
+        # How many worker processes each pass over the data is spread across
+        self.processes = processes
+        # Results of earlier runs, for nodes that provide a cache key
+        self.cache = cache
+        # Where results are written as each pass finishes
+        self.sink = sink
+        # Set by cancel() to stop once the pass that is running is finished, cleared by start()
+        self.cancelled = False
+        # Records what each node run costs, when profiling
+        self.profiler = profiler
 
     ################################################################################################
     # Pipeline: Add
@@ -108,6 +142,10 @@ class Pipeline:
 
         print("############################ Starting ############################")
         results = [{}]
+        self.timings = []
+        self.node_costs = {}
+        self.cancelled = False
+        self.progress_started = time.perf_counter()
 
         # runs each node's start function once at the beginning
         for node in self.nodes:
@@ -116,73 +154,180 @@ class Pipeline:
             if batch_size is not None:
                 self.initialize_progress(batch_size, len(self.nodes))
 
-        if len(self.roots) > 0:
-            results = self.run_pass(True, results=results)
-
-        for node in self.nodes:
-            results = node.end(results)
+        if self.sink is not None:
+            self.sink.open()
+        if self.profiler is not None:
+            self.profiler.start()
+        try:
+            if len(self.roots) > 0:
+                if self.processes == 1:
+                    results = self.run_pass()
+                else:
+                    results = self.run_pool()
+
+            for node in self.nodes:
+                results = node.end(results)
+
+            # what end() added to the results that were kept back
+            if self.sink is not None:
+                for i, pass_results in enumerate(results):
+                    self.sink.write(i, pass_results)
+        finally:
+            if self.sink is not None:
+                self.sink.close()
+            if self.profiler is not None:
+                self.profiler.stop()
+
+        if self.cache is not None:
+            print("Result cache: {hits} hits, {misses} misses".format(**self.cache.stats()))
 
         return results
 
+    ###############################################################################################
+    # Pipeline: Schedule
+    #
+    ### Orders the nodes so every node comes after all of its parents (a topological order). Each
+    ### entry carries the node's outgoing edges so a pass never has to look them up.
+    ###############################################################################################
+
+    def schedule(self):
+        """Topologically sort the graph, returning a list of (node, edges)
+        pairs with every parent ahead of its children
+        """
+        n_parents = {node: 0 for node in self.nodes}
+        for node in self.nodes:
+            for parent_terminal, child_terminal, child in self.nodes[node]:
+                n_parents[child] = n_parents.get(child, 0) + 1
+
+        queue = deque(node for node in n_parents if n_parents[node] == 0)
+        order = []
+        while len(queue) > 0:
+            node = queue.popleft()
+            edges = tuple(self.nodes.get(node, ()))
+            order.append((node, edges))
+            for parent_terminal, child_terminal, child in edges:
+                n_parents[child] = n_parents[child] - 1
+                if n_parents[child] == 0:
+                    queue.append(child)
+
+        if len(order) < len(n_parents):
+            raise ValueError("Pipeline graph has a cycle, it can not be scheduled")
+        return order
+
     ###############################################################################################
     # Pipeline: Run_Pass
-    # + done: Indicates if more passes over the data need to be done
     #
-    ### Recursively run passes over the pipeline until each node has processed all of its data.
+    ### Run passes over the pipeline until each node has processed all of its data.
     ### Since a pipeline can have input nodes that iteratively return parts of their data (batches)
     ### multiple runnings of these nodes must be performed (a pass). Each pass over the data runs
-    ### all of the nodes from the start until they all report that they are done.
+    ### all of the nodes from the start until they all report that they are done. Passes run in a
+    ### loop over a precomputed schedule, so the stack does not grow with the number of files.
     ###############################################################################################
 
-    def run_pass(self, done, results=None, i_pass=0):
-        """Recursively runs all of the roots nodes until they report they are
+    def run_pass(self, results=None):
+        """Runs passes over the graph until the roots nodes report they are
         done
 
         Args:
-            done:
             results:
-            i_pass:
         """
+        if results is None:
+            results = []
+        schedule = self.schedule()
+        releases = self.release_points(schedule)
+
+        done = False
+        while not done:
+            pass_results = {}
+            pass_times = {}
+            for position, (node, edges) in enumerate(schedule):
+                self.run_node(node, edges, pass_results, pass_times)
+                for finished in releases[position]:
+                    self.release_transient(finished, pass_results)
+            self.timings.append(pass_times)
+            results.append(self.finish_pass(len(results), pass_results))
+            done = all(root.done for root in self.roots) or self.cancelled
 
-        for root in self.roots:
-            _done = self.run_node(root, results, i_pass)
-            done = done and _done
+        return results
 
-        if not done:
-            i_pass = i_pass + 1
-            self.run_pass(True, results, i_pass)
+    def release_points(self, schedule):
+        """For each position in the schedule, list the nodes whose outputs have been read by all
+        of their children once the node at that position has run
 
-        return results
+        Args:
+            schedule: list of (node, edges) as from schedule()
+        """
+        position = {node: i for i, (node, edges) in enumerate(schedule)}
+        releases = [[] for node in schedule]
+        for i, (node, edges) in enumerate(schedule):
+            if len(node.transient_outputs) > 0:
+                last_consumer = max([position[child] for parent_terminal, child_terminal, child in edges], default=i)
+                releases[last_consumer].append(node)
+        return releases
+
+    def release_transient(self, node, pass_results):
+        """Drop a node's transient outputs from the results kept for this pass
+
+        Args:
+            node:
+            pass_results:
+        """
+        if node in pass_results:
+            pass_results[node] = {
+                key: value for key, value in pass_results[node].items() if key not in node.transient_outputs
+            }
+
+    def finish_pass(self, pass_index, pass_results):
+        """Write a finished pass's results to the sink, if there is one, returning the results
+        that have to be kept until the pipeline ends
+
+        Args:
+            pass_index:
+            pass_results:
+        """
+        if self.sink is None:
+            return pass_results
+        self.sink.write(
+            pass_index,
+            {node: output for node, output in pass_results.items() if not node.uses_results},
+        )
+        return {node: output for node, output in pass_results.items() if node.uses_results}
 
     ################################################################################################
     # Pipeline: Process Node
-    # + node_id: Unique identifier for retrieving the node to be processed
+    # + node: the node to be processed
+    # + edges: the node's outgoing edges
     #
-    ### Recursive function to traverse the sequence of nodes (the graph) visiting each node once and
-    ### running it's accompanied process function.
+    ### Runs a node's process function if all of its inputs have arrived this pass, and hands its
+    ### results to its children. The children are run later in the pass by the schedule.
     ################################################################################################
 
-    def run_node(self, node, results=None, i_pass=0):
-        """Called on each node, and recursively on each child node
+    def run_node(self, node, edges, pass_results, pass_times=None):
+        """Run a node if it is ready, and pass its results downstream
 
         Args:
             node:
-            results:
-            i_pass:
+            edges:
+            pass_results:
+            pass_times: dictionary the seconds the node took are recorded in
         """
-        if results is None:
-            results = [{}]
-        if len(results) <= i_pass:
-            results.append({})
-
-        if all(node.ready.values()):
-
-            node.global_vars = self.global_vars
-            results[i_pass][node] = node.process()
-            self.global_vars = node.global_vars
+        ready = node.ready
+        if all(ready.values()):
+
+            started = time.perf_counter()
+            if self.profiler is not None:
+                with self.profiler.profile(node) as sample:
+                    output = self.process_node(node, edges)
+                sample["file"] = node.args.get("file_path", output.get("file_path") if isinstance(output, dict) else None)
+            else:
+                output = self.process_node(node, edges)
+            pass_results[node] = output
+            seconds = time.perf_counter() - started
+            if pass_times is not None:
+                pass_times[node] = seconds
 
             # increment the progress by this node
-            self.update_progress(node)
+            self.update_progress(node, seconds)
 
             if len(node.events_fired) > 0:
                 for event_id in node.events_fired:
@@ -190,18 +335,176 @@ class Pipeline:
                     self.resolve_event(event_id, event_data)
                 node.events_fired = {}
 
-            if node in self.nodes:  # if this is a parent of another node
-                for parent_terminal, child_terminal, child in self.nodes[node]:
-                    if parent_terminal in results[i_pass][node]:
-                        child.args[child_terminal] = results[i_pass][node][
-                            parent_terminal
-                        ]
-                        child.ready[child_terminal] = True
-                        self.run_node(child, results, i_pass)
+            self.send_results(edges, output)
             node.reset()
 
         return node.done
 
+    def process_node(self, node, edges):
+        """Return a node's results, from the cache if they are there, otherwise by processing it
+
+        Args:
+            node:
+            edges:
+        """
+        key = node.cache_key() if self.cache is not None else None
+        output = None
+        if key is not None:
+            # the stored results have to cover everything the children are waiting on
+            output = self.cache.get(key, [parent_terminal for parent_terminal, child_terminal, child in edges])
+
+        if output is None:
+            node.global_vars = self.global_vars
+            output = node.process()
+            self.global_vars = node.global_vars
+            # a failure is tried again next time, and a hit would not fire the node's events again
+            if key is not None and not node.events_fired and not node.failed(output):
+                self.cache.put(key, node.pack(output))
+        return output
+
+    ################################################################################################
+    # Pipeline: Send Results
+    # + edges: the outgoing edges of the node whose results have been computed for this pass
+    # + output: the node's results
+    ################################################################################################
+
+    def send_results(self, edges, output):
+        """Pass a node's results downstream, marking each child's terminal as
+        ready
+
+        Args:
+            edges:
+            output:
+        """
+        for parent_terminal, child_terminal, child in edges:
+            if parent_terminal in output:
+                child.args[child_terminal] = output[parent_terminal]
+                child.ready[child_terminal] = True
+
+    ###############################################################################################
+    # Pipeline: Run_Pool
+    #
+    ### Runs the root nodes here, and every pass's downstream nodes in a pool of worker processes.
+    ### Each worker holds its own copy of the graph, so state that nodes collect for their end()
+    ### hooks is sent back per pass and merged in pass order. Only a bounded number of passes are
+    ### in flight at once so inputs are not all held in memory waiting for a worker.
+    ###############################################################################################
+
+    def run_pool(self):
+        """Run every pass over the data in a pool of worker processes, returning
+        the results in pass order
+        """
+        order = list(self.nodes)
+        index = {node: i for i, node in enumerate(order)}
+        processes = self.processes or cpu_count()
+        results = []
+        pending = deque()
+
+        # Roots stay in this process, workers only need the nodes downstream of them
+        worker_nodes = [None if node in self.roots else node for node in order]
+        edges = {
+            index[node]: [
+                (parent_terminal, child_terminal, index[child])
+                for parent_terminal, child_terminal, child in self.nodes[node]
+            ]
+            for node in order
+        }
+
+        with Pool(
+            processes,
+            initializer=_init_worker,
+            initargs=(worker_nodes, edges, self.global_vars, self.cache, self.profiler),
+        ) as pool:
+            for root_results, root_times in self.run_roots():
+                self.timings.append(root_times)
+                root_outputs = {index[root]: root_results[root] for root in root_results}
+                # the roots' children all run in the workers, what they only send on isn't kept here
+                for root in self.roots:
+                    self.release_transient(root, root_results)
+                results.append(root_results)
+                pending.append(
+                    (
+                        len(results) - 1,
+                        pool.apply_async(_run_pass_in_worker, (root_outputs,)),
+                    )
+                )
+                # Wait on the oldest pass before queueing up more work than the workers can take
+                while len(pending) >= processes * 2:
+                    i_pass, worker_results = pending.popleft()
+                    self.collect_pass(worker_results.get(), results[i_pass], order, self.timings[i_pass])
+                    results[i_pass] = self.finish_pass(i_pass, results[i_pass])
+            while len(pending) > 0:
+                i_pass, worker_results = pending.popleft()
+                self.collect_pass(worker_results.get(), results[i_pass], order, self.timings[i_pass])
+                results[i_pass] = self.finish_pass(i_pass, results[i_pass])
+
+        # each worker only trimmed the cache by what it had stored itself
+        if self.cache is not None and self.cache.max_size is not None:
+            self.cache.evict()
+
+        return results
+
+    def run_roots(self):
+        """Run the root nodes once per pass until they all report they are
+        done, yielding the results and the times of each pass
+        """
+        done = False
+        while not done:
+            root_results = {}
+            root_times = {}
+            for root in self.roots:
+                # children are run in the workers, so nothing is sent downstream here
+                self.run_node(root, (), root_results, root_times)
+            done = all(root.done for root in self.roots) or self.cancelled
+            yield root_results, root_times
+
+    def collect_pass(self, worker_results, pass_results, order, pass_times=None):
+        """Merge the results of a pass run in a worker process back into this
+        pipeline
+
+        Args:
+            worker_results:
+            pass_results:
+            order:
+            pass_times: dictionary the seconds each node took in the worker are recorded in
+        """
+        node_results, node_states, node_args, global_vars, cache_stats, events, node_times, samples = worker_results
+        for i, result in node_results.items():
+            node = order[i]
+            pass_results[node] = result
+            node.merge_state(node_states[i])
+            node.args.update(node_args[i])
+            if pass_times is not None:
+                pass_times[node] = node_times[i]
+            self.update_progress(node, node_times[i])
+        self.global_vars.update(global_vars)
+        if self.profiler is not None:
+            self.profiler.samples.extend(samples)
+        for event_id, event_data in events:
+            self.resolve_event(event_id, event_data)
+        if self.cache is not None:
+            self.cache.hits += cache_stats["hits"]
+            self.cache.misses += cache_stats["misses"]
+
+    def cancel(self):
+        """Stop running passes once the pass that is running is finished. Passes already handed to
+        worker processes are finished too. The end hooks still run on the passes that were run, and
+        their results are returned from start(). Safe to call from another thread
+        """
+        self.cancelled = True
+
+    def on_event(self, event_id, callback):
+        """Register a callback for an event fired by nodes, it is called with the event id and
+        the data the node fired it with
+
+        Args:
+            event_id:
+            callback:
+        """
+        if event_id not in self.event_callbacks:
+            self.event_callbacks[event_id] = []
+        self.event_callbacks[event_id].append(callback)
+
     def resolve_event(self, event_id, event_data):
         """
         Args:
@@ -225,34 +528,202 @@ class Pipeline:
         self.progress_start = 0
         self.progress_current = 0
         self.progress_end = m_runs * n_functions
+        self.progress_runs = m_runs
 
     ###############################################################################################
     # update_progress: Naive method of tracking progress. Simply increments our progress by 1 and
-    # tells our listener functions using the callback methods they provided
+    # tells our listener functions using the callback methods they provided. The time the node took
+    # is added to its running cost, which timed listeners are told the weighted progress from
     ###############################################################################################
-    def update_progress(self, node):
+    def update_progress(self, node, seconds=None):
         """
         Args:
             node:
+            seconds: how long the node took to run
         """
         self.progress_current = self.progress_current + 1
+        if seconds is not None:
+            cost = self.node_costs.setdefault(node, [0, 0.0])
+            cost[0] += 1
+            cost[1] += seconds
         for listener in self.listeners:
             listener(
                 node, self.progress_start, self.progress_current, self.progress_end
             )
+        if len(self.timed_listeners) > 0:
+            timing = self.progress_timing()
+            for listener in self.timed_listeners:
+                listener(
+                    node, self.progress_start, self.progress_current, self.progress_end, timing
+                )
+
+    ###############################################################################################
+    # progress_timing: progress weighted by the mean time each node has taken so far, so slow
+    # nodes count for more than quick ones, and an estimate of the time left
+    ###############################################################################################
+    def progress_timing(self):
+        """Return a dictionary of
+            fraction: how much of the work is done, from 0 to 1
+            elapsed: seconds since the pipeline started
+            remaining: estimated seconds left, None until there is something to estimate from
+        """
+        elapsed = time.perf_counter() - self.progress_started if self.progress_started is not None else 0.0
+        done = sum(total for runs, total in self.node_costs.values())
+        means = [total / runs for runs, total in self.node_costs.values() if runs > 0]
+        # nodes that haven't run yet are guessed to take as long as the average node
+        guess = sum(means) / len(means) if len(means) > 0 else 0.0
+        left = 0.0
+        for node in self.nodes:
+            runs, total = self.node_costs.get(node, (0, 0.0))
+            mean = total / runs if runs > 0 else guess
+            left += mean * max(self.progress_runs - runs, 0)
+
+        if done + left <= 0:
+            return {"fraction": 0.0, "elapsed": elapsed, "remaining": None}
+        # the work left takes as long as the work done did, however many processes share it
+        return {
+            "fraction": done / (done + left),
+            "elapsed": elapsed,
+            "remaining": elapsed * left / done if done > 0 else None,
+        }
 
     ###############################################################################################
     # listen: Naive method of listening for progress. Simply registers a callback
     ###############################################################################################
-    def listen(self, callback):
+    def listen(self, callback, timed=False):
         """
         Args:
-            callback:
+            callback: called with (node, start, current, end) each time a node has run
+            timed: also call it with the timing from progress_timing, as
+                (node, start, current, end, timing)
         """
-        self.listeners.append(callback)
+        if timed:
+            self.timed_listeners.append(callback)
+        else:
+            self.listeners.append(callback)
 
     ###############################################################################################
     # reset_progress: Naive method of reseting the progress. progress start cannot be anything but 0 for now
     ###############################################################################################
     def reset_progress(self):
         self.progress_current = self.progress_start
+
+
+###################################################################################################
+# Worker processes
+#
+### Each worker rebuilds the graph below the roots once, then runs single passes of it on the root
+### results it is handed. Node state is reset before every pass to what it was when the pool
+### started, and only what that pass added to it is sent back to be merged.
+###################################################################################################
+
+_worker_pipeline = None
+_worker_order = None
+_worker_schedule = None
+_worker_states = None
+_worker_releases = None
+_worker_events = []
+
+
+def _init_worker(worker_nodes, edges, global_vars, cache=None, profiler=None):
+    """Build this worker's copy of the pipeline
+
+    Args:
+        worker_nodes: the pipeline's nodes in order, with None in place of each root
+        edges: each node's children, by position in worker_nodes
+        global_vars:
+        cache: the pipeline's ResultCache, if it has one
+        profiler: a new Profiler if the pipeline is profiling, its samples are sent back each pass
+    """
+    global _worker_pipeline, _worker_order, _worker_schedule, _worker_states, _worker_releases
+
+    # roots are stood in for by empty nodes that only carry their results to their children
+    _worker_order = [node if node is not None else Node() for node in worker_nodes]
+    _worker_pipeline = Pipeline(global_vars=global_vars, cache=cache, profiler=profiler)
+    if profiler is not None:
+        profiler.start()
+    for i, children in edges.items():
+        _worker_pipeline.nodes[_worker_order[i]] = [
+            (parent_terminal, child_terminal, _worker_order[child])
+            for parent_terminal, child_terminal, child in children
+        ]
+    roots = {_worker_order[i] for i, node in enumerate(worker_nodes) if node is None}
+    _worker_schedule = [
+        (node, edges) for node, edges in _worker_pipeline.schedule() if node not in roots
+    ]
+    _worker_releases = _worker_pipeline.release_points(_worker_schedule)
+    _worker_states = [copy.deepcopy(node.state) for node in _worker_order]
+    # events are resolved by the callbacks registered with the pipeline in the main process
+    _worker_pipeline.resolve_event = _send_event_back
+
+
+def _send_event_back(event_id, event_data):
+    """Hold on to an event fired in this worker, to be sent back with the pass
+
+    Args:
+        event_id:
+        event_data:
+    """
+    _worker_events.append((event_id, event_data))
+
+
+def _state_added(before, state):
+    """What a pass added to a node's state, so merging it doesn't repeat what the node already
+    held when the pool started: lists it held lose the items they started with, anything else is
+    sent whole
+
+    Args:
+        before: the node's state when the pool started
+        state: the node's state after the pass
+    """
+    added = {}
+    for key, value in state.items():
+        if isinstance(value, list) and isinstance(before.get(key), list):
+            added[key] = value[len(before[key]):]
+        else:
+            added[key] = value
+    return added
+
+
+def _run_pass_in_worker(root_outputs):
+    """Run one pass of the pipeline below the roots
+
+    Args:
+        root_outputs: the results of each root for this pass, by node position
+    """
+    for node, state in zip(_worker_order, _worker_states):
+        node.state = copy.deepcopy(state)
+
+    pass_results = {}
+    pass_times = {}
+    for i, output in root_outputs.items():
+        _worker_pipeline.send_results(_worker_pipeline.nodes[_worker_order[i]], output)
+    for position, (node, edges) in enumerate(_worker_schedule):
+        _worker_pipeline.run_node(node, edges, pass_results, pass_times)
+        for finished in _worker_releases[position]:
+            _worker_pipeline.release_transient(finished, pass_results)
+
+    node_results = {}
+    node_states = {}
+    node_args = {}
+    node_times = {}
+    for i, node in enumerate(_worker_order):
+        if node not in pass_results:
+            continue
+        node_results[i] = node.pack(pass_results[node])
+        node_states[i] = _state_added(_worker_states[i], node.state)
+        node_times[i] = pass_times[node]
+        node_args[i] = {
+            key: value for key, value in node.args.items() if key not in node.default_ready
+        }
+    cache_stats = {"hits": 0, "misses": 0}
+    if _worker_pipeline.cache is not None:
+        cache_stats = _worker_pipeline.cache.stats()
+        _worker_pipeline.cache.hits = _worker_pipeline.cache.misses = 0
+    events = list(_worker_events)
+    _worker_events.clear()
+    samples = []
+    if _worker_pipeline.profiler is not None:
+        samples = _worker_pipeline.profiler.samples
+        _worker_pipeline.profiler.samples = []
+    return node_results, node_states, node_args, _worker_pipeline.global_vars, cache_stats, events, node_times, samples
@@ -0,0 +1,230 @@
+import csv
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import parselmouth.praat
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the rise in the peak memory of the process is left out there
+    resource = None
+
+###################################################################################################
+# Profiler:
+#
+### Opt-in instrumentation of a pipeline run. Each time a node runs on a file, records its wall
+### time, CPU time, how many times it called parselmouth.praat.call, and optionally the most
+### memory it had allocated at once. Some nodes make thousands of small Praat calls, which only
+### shows up in the call count. Memory is traced with tracemalloc, which sees what Python and NumPy
+### allocate but not what Praat allocates inside its own objects, and slows down nodes that make
+### many small Python allocations, so it is left off unless asked for. What Praat allocates shows up
+### in how far each run raised the process's peak resident memory (ru_maxrss), which is always
+### recorded. It is a high-water mark, so a run that stays under an earlier peak records 0, and other
+### threads count towards it. Runs in worker processes are profiled there and sent back with the
+### pass.
+### The samples can be saved as a summary table per node, or as a Chrome trace (JSON) to open in
+### chrome://tracing or ui.perfetto.dev.
+###################################################################################################
+
+# Columns of a profile sample
+COLUMNS = [
+    "file", "function", "wall seconds", "cpu seconds", "peak memory bytes", "peak rss increase bytes", "praat calls",
+]
+
+# ru_maxrss is in kilobytes, except on macOS where it is in bytes
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+_original_call = parselmouth.praat.call
+# counted per thread, so processing in a background thread isn't counted by anything else
+_counter = threading.local()
+
+
+def _counting_call(*args, **kwargs):
+    _counter.calls = getattr(_counter, "calls", 0) + 1
+    return _original_call(*args, **kwargs)
+
+
+def _peak_rss():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class Profiler:
+    """Collects a sample each time a node runs
+
+    Args:
+        trace_memory: also record the peak memory of each run, which makes them slower
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        # one dictionary per node run, with the keys in COLUMNS, and when and where it ran for traces
+        self.samples = []
+        # modules whose call was swapped for the counting one, to put back in stop()
+        self.patched = []
+        # whether start() started tracemalloc, so stop() only stops it then
+        self.tracing = False
+
+    def __getstate__(self):
+        # worker processes start with no samples, theirs are sent back with each pass
+        return {"trace_memory": self.trace_memory}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def start(self):
+        """Count praat calls, and trace memory if asked to, from here on. parselmouth.praat.call itself is
+        swapped for the counting one, so it is counted however it is called or imported later.
+        Most nodes imported call by name already, so every loaded module holding it is pointed at
+        the counting one too"""
+        if len(self.patched) > 0:
+            return
+        parselmouth.praat.call = _counting_call
+        self.patched.append(parselmouth.praat)
+        for module in list(sys.modules.values()):
+            if module is not parselmouth.praat and getattr(module, "__dict__", {}).get("call") is _original_call:
+                module.call = _counting_call
+                self.patched.append(module)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+
+    def stop(self):
+        """Stop counting praat calls and tracing memory"""
+        for module in self.patched:
+            if getattr(module, "call", None) is _counting_call:
+                module.call = _original_call
+        self.patched = []
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    @contextmanager
+    def profile(self, node):
+        """Measure what runs inside the with block as a run of node. Yields the sample, the file is
+        filled in by the caller once it knows it
+
+        Args:
+            node:
+        """
+        sample = {"file": None, "function": node.node_id}
+        calls_before = getattr(_counter, "calls", 0)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            memory_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        rss_before = _peak_rss()
+        started_at = time.time()
+        cpu_before = time.thread_time()
+        started = time.perf_counter()
+        try:
+            yield sample
+        finally:
+            sample["wall seconds"] = time.perf_counter() - started
+            sample["cpu seconds"] = time.thread_time() - cpu_before
+            # the peak above what was allocated when the node started, not counting what it was handed
+            sample["peak memory bytes"] = tracemalloc.get_traced_memory()[1] - memory_before if tracing else None
+            sample["peak rss increase bytes"] = _peak_rss() - rss_before if rss_before is not None else None
+            sample["praat calls"] = getattr(_counter, "calls", 0) - calls_before
+            sample["start"] = started_at
+            sample["pid"] = os.getpid()
+            sample["tid"] = threading.get_ident()
+            self.samples.append(sample)
+
+    def summary(self):
+        """One row per node: how many times it ran, its total and mean wall and CPU time, the most
+        memory it allocated in a run, the most a run raised the peak memory of the process, and its
+        praat calls in total and per run"""
+        nodes = {}
+        for sample in self.samples:
+            nodes.setdefault(sample["function"], []).append(sample)
+
+        rows = []
+        for function, samples in nodes.items():
+            runs = len(samples)
+            wall = sum(sample["wall seconds"] for sample in samples)
+            cpu = sum(sample["cpu seconds"] for sample in samples)
+            calls = sum(sample["praat calls"] for sample in samples)
+            memory = [sample["peak memory bytes"] for sample in samples if sample["peak memory bytes"] is not None]
+            rss = [sample["peak rss increase bytes"] for sample in samples if sample["peak rss increase bytes"] is not None]
+            rows.append({
+                "function": function,
+                "runs": runs,
+                "wall seconds": wall,
+                "mean wall seconds": wall / runs,
+                "max wall seconds": max(sample["wall seconds"] for sample in samples),
+                "cpu seconds": cpu,
+                "mean cpu seconds": cpu / runs,
+                "max peak memory bytes": max(memory) if len(memory) > 0 else None,
+                "max peak rss increase bytes": max(rss) if len(rss) > 0 else None,
+                "praat calls": calls,
+                "mean praat calls": calls / runs,
+            })
+        # where the time went first
+        rows.sort(key=lambda row: row["wall seconds"], reverse=True)
+        return rows
+
+    def save_samples(self, path):
+        """Save every sample to a .csv file, one row per node and file
+
+        Args:
+            path:
+        """
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(self.samples)
+
+    def save_summary(self, path):
+        """Save the summary to a .csv file, one row per node
+
+        Args:
+            path:
+        """
+        rows = self.summary()
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if len(rows) > 0 else ["function"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def trace(self):
+        """The samples as Chrome trace events, one span per node run on the process and thread it
+        ran on"""
+        if len(self.samples) == 0:
+            return {"traceEvents": []}
+        first = min(sample["start"] for sample in self.samples)
+        events = []
+        for sample in self.samples:
+            events.append({
+                "name": sample["function"],
+                "cat": "node",
+                "ph": "X",
+                "ts": (sample["start"] - first) * 1e6,
+                "dur": sample["wall seconds"] * 1e6,
+                "pid": sample["pid"],
+                "tid": sample["tid"],
+                "args": {
+                    "file": str(sample["file"]),
+                    "cpu seconds": sample["cpu seconds"],
+                    "peak memory bytes": sample["peak memory bytes"],
+                    "peak rss increase bytes": sample["peak rss increase bytes"],
+                    "praat calls": sample["praat calls"],
+                },
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path):
+        """Save the samples as a Chrome trace .json file
+
+        Args:
+            path:
+        """
+        with open(path, "w") as f:
+            json.dump(self.trace(), f)
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+###################################################################################################
+# ResultCache:
+#
+### Keeps the results of nodes on disk between runs, so running the pipeline again over the same
+### data with the same settings only has to compute what has changed. Results are stored under a
+### key the node builds from everything its results depend on (see Node.cache_key). When the cache
+### grows past its size limit the least recently used results are removed.
+###################################################################################################
+
+
+class ResultCache:
+    """Persistent store of node results, keyed by content
+
+    Args:
+        directory: where the results are kept
+        max_size: size in bytes the cache is trimmed back to, least recently used results first.
+            None lets it grow without limit
+    """
+
+    def __init__(self, directory, max_size=2 ** 30):
+        self.directory = directory
+        self.max_size = max_size
+        # how many results were served from the cache, and how many had to be computed
+        self.hits = 0
+        self.misses = 0
+        # bytes on disk, read from the directory the first time something is stored
+        self.size = None
+
+    def __getstate__(self):
+        # each worker process counts its own hits and misses and sends them back with its results
+        return {"directory": self.directory, "max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["directory"], state["max_size"])
+
+    def path(self, key):
+        """Where the result stored under key is kept
+
+        Args:
+            key:
+        """
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def get(self, key, required=()):
+        """Return the result stored under key, or None if there is none. A stored result that is
+        missing any of the required values counts as a miss
+
+        Args:
+            key:
+            required: names of values the result must have, usually what is sent downstream
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        if not all(name in result for name in required):
+            self.misses += 1
+            return None
+
+        # mark it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Store a result under key. Results that cannot be pickled are not stored
+
+        Args:
+            key:
+            result:
+        """
+        try:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to the side and move into place, so other processes never read half a result
+        descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        if self.size is None:
+            self.size = sum(size for path, size, used in self.entries())
+        else:
+            self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            self.evict()
+
+    def entries(self):
+        """List every stored result as (path, size, last used)"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for bucket in os.scandir(self.directory):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".pkl"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self):
+        """Remove the least recently used results until the cache fits in max_size"""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        size = sum(entry[1] for entry in entries)
+        for path, entry_size, used in entries:
+            if self.max_size is None or size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self.size = size
+
+    def clear(self):
+        """Remove every stored result"""
+        for path, size, used in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.size = 0
+
+    def stats(self):
+        """Hit and miss counts"""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def fingerprint(value):
+    """Return a stable hash of a node's settings, for building cache keys. Raises TypeError for
+    values whose contents can not be hashed reliably, such as Praat objects
+
+    Args:
+        value:
+    """
+    digest = hashlib.sha256()
+    _update(digest, value)
+    return digest.hexdigest()
+
+
+def _update(digest, value):
+    if value is None or isinstance(value, (bool, int, float, str, bytes, np.generic)):
+        digest.update(repr((type(value).__name__, value)).encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(("%s(%d" % (type(value).__name__, len(value))).encode())
+        for item in value:
+            _update(digest, item)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        digest.update(("dict(%d" % len(value)).encode())
+        for key in sorted(value, key=repr):
+            _update(digest, key)
+            _update(digest, value[key])
+        digest.update(b")")
+    elif isinstance(value, np.ndarray):
+        digest.update(repr(("ndarray", value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).data)
+    else:
+        raise TypeError("Can not fingerprint %s" % type(value).__name__)
@@ -0,0 +1,313 @@
+import csv
+import json
+import numbers
+import os
+import sqlite3
+
+import numpy as np
+
+###################################################################################################
+# ResultSink:
+#
+### Receives the results of each pass over the pipeline as soon as the pass is finished, so they
+### can be written out and released instead of being held until the whole run is done. Each
+### measurement becomes one row of (file, function, measure, value), which keeps the same columns
+### whatever nodes are run. Values that can't be reported as numbers, text or lists of them
+### (sounds, Praat objects, figures, ...) are left out. Tracks of frame values are saved as arrays
+### instead, to a .npz file per sound, when the sink is given a directory for them.
+###################################################################################################
+
+COLUMNS = ["file", "function", "measure", "value"]
+
+
+class ResultSink:
+    """Base sink, subclasses write the rows somewhere by overriding write_rows"""
+
+    def __init__(self):
+        # the file each pass processed, to label results that are written after the pass is over
+        self.file_names = {}
+        # directory each pass's tracks of frame values are saved in, None to leave them out
+        self.tracks_directory = None
+        # the .npz file each pass's tracks were saved to, and the names used for them so far
+        self.track_paths = {}
+        self.track_names = set()
+
+    def open(self):
+        """Called by the pipeline before the first pass"""
+        return None
+
+    def write(self, pass_index, pass_results):
+        """Write the results of a pass
+
+        Args:
+            pass_index: which pass over the data the results are from
+            pass_results: dictionary of node to its results for this pass
+        """
+        rows = self.rows(pass_index, pass_results)
+        if len(rows) > 0:
+            self.write_rows(rows)
+        if self.tracks_directory is not None:
+            self.write_tracks(pass_index, pass_results)
+
+    def write_rows(self, rows):
+        """
+        Args:
+            rows: list of dictionaries with the keys in COLUMNS
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Called by the pipeline once it has ended, even if it failed"""
+        return None
+
+    def write_tracks(self, pass_index, pass_results):
+        """Save the tracks of frame values of a pass to tracks_directory/<file name>.npz, the same
+        way as when results are saved at the end. A pass written again, by the end hooks, has its
+        new tracks added to the file
+
+        Args:
+            pass_index:
+            pass_results:
+        """
+        # the tracks are found and named the way the GUI saves them
+        from ..VoicelabGUI.ResultExport import frame_tracks, track_arrays, track_file_name
+
+        file_name = self.file_name(pass_index, pass_results)
+        results = {node.node_id: output for node, output in pass_results.items() if isinstance(output, dict)}
+        frame_times = {node.node_id: getattr(node, "frame_times", {}) for node in pass_results}
+        arrays = track_arrays(frame_tracks({file_name: results}, frame_times)[file_name])
+        if len(arrays) == 0:
+            return
+
+        path = self.track_paths.get(pass_index)
+        if path is None:
+            os.makedirs(self.tracks_directory, exist_ok=True)
+            path = os.path.join(self.tracks_directory, track_file_name(file_name, self.track_names) + ".npz")
+            self.track_paths[pass_index] = path
+        else:
+            with np.load(path) as saved:
+                arrays = {**saved, **arrays}
+        np.savez_compressed(path, **arrays)
+
+    def file_name(self, pass_index, pass_results):
+        """The file a pass processed, or the pass index if none of its results say
+
+        Args:
+            pass_index:
+            pass_results:
+        """
+        if pass_index not in self.file_names:
+            self.file_names[pass_index] = pass_index
+            for results in pass_results.values():
+                if isinstance(results, dict) and isinstance(results.get("file_path"), str):
+                    self.file_names[pass_index] = results["file_path"]
+                    break
+        return self.file_names[pass_index]
+
+    def rows(self, pass_index, pass_results):
+        """Turn the results of a pass into rows of (file, function, measure, value)
+
+        Args:
+            pass_index:
+            pass_results:
+        """
+        file_name = self.file_name(pass_index, pass_results)
+
+        rows = []
+        for node, results in pass_results.items():
+            if not isinstance(results, dict):
+                continue
+            for measure, value in results.items():
+                if measure == "file_path":
+                    continue
+                value = reportable_value(value)
+                if value is not None:
+                    rows.append(
+                        {"file": file_name, "function": node.node_id, "measure": measure, "value": value}
+                    )
+        return rows
+
+
+def reportable_value(value):
+    """Return value as a number or text, lists as JSON text, or None if it can't be reported in a
+    table. NumPy arrays are not reported, they are tracks of frame values saved on their own by
+    write_tracks
+
+    Args:
+        value:
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, numbers.Number):
+        return value.item() if isinstance(value, np.generic) else value
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        try:
+            return json.dumps(value, default=_json_scalar)
+        except TypeError:
+            return None
+    return None
+
+
+def _json_scalar(value):
+    # numpy numbers inside lists, anything else makes the list unreportable
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} can not be reported")
+
+
+class CallbackSink(ResultSink):
+    """Hands the rows of each pass to a function
+
+    Args:
+        callback: called with the list of rows of each pass
+    """
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def write_rows(self, rows):
+        self.callback(rows)
+
+
+class CSVSink(ResultSink):
+    """Appends rows to a CSV file, flushed after every pass
+
+    Args:
+        path: the CSV file, it is overwritten
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.file = None
+        self.writer = None
+
+    def open(self):
+        self.file = open(self.path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SQLiteSink(ResultSink):
+    """Inserts rows into a table of an SQLite database, committed after every pass
+
+    Args:
+        path: the database file, created if it doesn't exist
+        table: the table to add the rows to, created if it doesn't exist
+    """
+
+    def __init__(self, path, table="results"):
+        super().__init__()
+        self.path = path
+        self.table = table
+        self.connection = None
+
+    def open(self):
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self.table}" (file TEXT, function TEXT, measure TEXT, value)'
+        )
+        self.connection.commit()
+
+    def write_rows(self, rows):
+        self.connection.executemany(
+            f'INSERT INTO "{self.table}" (file, function, measure, value) VALUES (?, ?, ?, ?)',
+            [(str(row["file"]), row["function"], row["measure"], row["value"]) for row in rows],
+        )
+        self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class ParquetSink(ResultSink):
+    """Writes rows to a Parquet file, a row group at a time. Parquet columns hold one type, so
+    numbers go in the value column and text in the text column. Needs pyarrow
+
+    Args:
+        path: the Parquet file, it is overwritten
+        row_group_size: how many rows are held before they are written out
+    """
+
+    def __init__(self, path, row_group_size=10000):
+        super().__init__()
+        self.path = path
+        self.row_group_size = row_group_size
+        self.rows_held = []
+        self.writer = None
+
+    def open(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Saving results to Parquet needs pyarrow, install it with: pip install pyarrow")
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([
+            ("file", pyarrow.string()),
+            ("function", pyarrow.string()),
+            ("measure", pyarrow.string()),
+            ("value", pyarrow.float64()),
+            ("text", pyarrow.string()),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+    def write_rows(self, rows):
+        self.rows_held.extend(rows)
+        if len(self.rows_held) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if len(self.rows_held) == 0:
+            return
+        numeric = [isinstance(row["value"], numbers.Number) for row in self.rows_held]
+        columns = {
+            "file": [str(row["file"]) for row in self.rows_held],
+            "function": [row["function"] for row in self.rows_held],
+            "measure": [row["measure"] for row in self.rows_held],
+            "value": [row["value"] if is_number else None for row, is_number in zip(self.rows_held, numeric)],
+            "text": [None if is_number else row["value"] for row, is_number in zip(self.rows_held, numeric)],
+        }
+        self.writer.write_table(self.pyarrow.table(columns, schema=self.schema))
+        self.rows_held = []
+
+    def close(self):
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
+
+
+def open_sink(path, tracks_directory=None):
+    """Choose a sink from the extension of path: .csv, .parquet, .sqlite or .db
+
+    Args:
+        path:
+        tracks_directory: directory to save each pass's tracks of frame values in, None to leave
+            them out
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        sink = CSVSink(path)
+    elif extension == ".parquet":
+        sink = ParquetSink(path)
+    elif extension in (".sqlite", ".db"):
+        sink = SQLiteSink(path)
+    else:
+        raise ValueError(f"Can't save results to '{path}', use a .csv, .parquet, .sqlite or .db file")
+    sink.tracks_directory = tracks_directory
+    return sink
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, Hashable
+
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+
+
+class AnalysisContext:
+    """Praat analyses of a single loaded file, shared by every node that measures it.
+
+    Each analysis is computed the first time a node asks for it and reused after that, so a file is
+    only turned into a Sound, pitch tracked for its bounds, and so on, once per run. Everything
+    handed out is shared: copy a Sound (``sound.copy()``) before changing it in place.
+
+    :param voice: the samples and sampling rate of the loaded file, as sent by LoadVoicesNode
+    :type voice: tuple[numpy.ndarray, float]
+    :param file_path: path to the file
+    :type file_path: str
+    """
+    def __init__(self, voice, file_path=None):
+        self.voice = voice
+        self.file_path = file_path
+        self.cache = {}
+
+    def __getstate__(self):
+        # Praat analyses cannot be pickled, a context sent to a worker process starts over
+        return {"voice": self.voice, "file_path": self.file_path, "cache": {}}
+
+    def memoize(self, key: Hashable, compute: Callable):
+        """Return the analysis stored under key, computing it the first time
+
+        :param key: name and settings of the analysis
+        :type key: Hashable
+        :param compute: function that computes the analysis
+        :type compute: Callable
+
+        :returns: the analysis
+        """
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    def release(self):
+        """Drop every analysis computed so far"""
+        self.cache.clear()
+
+    @property
+    def content_hash(self) -> str:
+        """A hash of the samples and sampling rate, the same for the same audio wherever it was
+        loaded from"""
+        return self.memoize("content_hash", self._content_hash)
+
+    def _content_hash(self):
+        signal, sampling_rate = self.voice
+        signal = np.ascontiguousarray(signal)
+        digest = hashlib.sha256()
+        digest.update(repr((signal.dtype.str, signal.shape, float(sampling_rate))).encode())
+        digest.update(signal.data)
+        return digest.hexdigest()
+
+    @property
+    def sound(self) -> parselmouth.Sound:
+        """The file as a Praat Sound"""
+        return self.memoize("sound", lambda: parselmouth.Sound(*self.voice))
+
+    @property
+    def broad_pitch(self) -> parselmouth.Pitch:
+        """A wide range (50-500 Hz) autocorrelation pitch track, used to choose pitch bounds"""
+        return self.memoize(
+            "broad_pitch",
+            lambda: self.sound.to_pitch_ac(None, 50, 15, True, 0.03, 0.45, 0.01, 0.35, 0.14, 500),
+        )
+
+    @property
+    def pitch_bounds(self) -> tuple[int, int]:
+        """Pitch floor and ceiling chosen from the mean of the broad pitch track"""
+        return self.memoize("pitch_bounds", self._pitch_bounds)
+
+    def _pitch_bounds(self):
+        try:
+            broad_mean_f0: float = call(self.broad_pitch, "Get mean", 0, 0, "hertz")  # get mean pitch
+        except:
+            broad_mean_f0 = 0
+
+        if broad_mean_f0 > 170:
+            pitch_floor = 100
+            pitch_ceiling = 500
+        elif broad_mean_f0 < 170:
+            pitch_floor = 50
+            pitch_ceiling = 300
+        else:
+            pitch_floor = 50
+            pitch_ceiling = 500
+        return pitch_floor, pitch_ceiling
+
+    def max_formant(self, method: str = "praat_manual") -> float:
+        """Maximum formant frequency for formant analysis based on voice pitch
+
+        :param method: method to use for finding the maximum formant frequency, default is praat_manual
+        :type method: str
+
+        :returns: maximum formant frequency
+        :rtype: float
+        """
+        return self.memoize(("max_formant", method), lambda: self._max_formant(method))
+
+    def _max_formant(self, method):
+        try:
+            if method == "praat_manual":
+                pitch: parselmouth.Pitch = self.sound.to_pitch(None, 50, 600)  # check pitch to set formant settings
+                mean_f0: float = call(pitch, "Get mean", 0, 0, "Hertz")
+                max_formant: float
+                if 170 <= mean_f0 <= 300:
+                    max_formant = 5500
+                elif mean_f0 < 170:
+                    max_formant = 5000
+                else:
+                    max_formant = 5500
+                return max_formant
+            else:
+                max_formant = 5500
+        except:
+            max_formant = 5500
+        return max_formant
+
+    def point_process(self, pitch_floor: float, pitch_ceiling: float) -> parselmouth.Data:
+        """Glottal pulses from "To PointProcess (periodic, cc)"
+
+        :param pitch_floor: pitch floor in Hz
+        :type pitch_floor: float
+        :param pitch_ceiling: pitch ceiling in Hz
+        :type pitch_ceiling: float
+
+        :returns: the PointProcess
+        :rtype: parselmouth.Data
+        """
+        return self.memoize(
+            ("point_process", pitch_floor, pitch_ceiling),
+            lambda: call(self.sound, "To PointProcess (periodic, cc)", pitch_floor, pitch_ceiling),
+        )
+
+    def intensity(self, minimum_pitch: float = 100.0, time_step: float | None = None,
+                  subtract_mean: bool = True) -> parselmouth.Intensity:
+        """Intensity contour, as from Sound.to_intensity
+
+        :param minimum_pitch: minimum pitch in Hz
+        :type minimum_pitch: float
+        :param time_step: time step in seconds, None for Praat's default
+        :type time_step: float
+        :param subtract_mean: subtract the mean pressure before measuring
+        :type subtract_mean: bool
+
+        :returns: the Intensity
+        :rtype: parselmouth.Intensity
+        """
+        return self.memoize(
+            ("intensity", minimum_pitch, time_step, subtract_mean),
+            lambda: self.sound.to_intensity(minimum_pitch, time_step, subtract_mean),
+        )
+
+    @property
+    def spectrum(self) -> parselmouth.Spectrum:
+        """Spectrum of the whole file"""
+        return self.memoize("spectrum", lambda: self.sound.to_spectrum())
@@ -1,15 +1,10 @@
 from ...pipeline.Node import Node
 import parselmouth
 from parselmouth.praat import call
-from .VoicelabNode import VoicelabNode
+from .VoicelabNode import VoicelabNode, hz_to_bark
 
 from .MeasureFormantNode import MeasureFormantNode
-from ...VoicelabGUI.VoicelabTab import VoicelabTab
-from ...VoicelabGUI.F1F2PlotWindow import F1F2PlotWindow
 
-from PyQt5.QtGui import *
-from PyQt5.QtWidgets import *
-from PyQt5.QtCore import *
 import datetime
 import io
 import pandas as pd
@@ -42,6 +37,11 @@ from scipy import stats
 
 
 class F1F2PlotNode(VoicelabNode):
+    # Draws figures, so it always processes
+    cache_results = False
+    # end() marks each file's results once the plot is drawn
+    uses_results = True
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -483,8 +483,8 @@ class F1F2PlotNode(VoicelabNode):
         )
         if self.scale == "Bark":
             # Convert Our formant measurements to bark
-            f1_bark = [hz_to_bark(f1) for f1 in self.state["f1 means"]]
-            f2_bark = [hz_to_bark(f2) for f2 in self.state["f2 means"]]
+            f1_bark = hz_to_bark(self.state["f1 means"]).tolist()
+            f2_bark = hz_to_bark(self.state["f2 means"]).tolist()
             user_data = pd.DataFrame(
                 {
                     "F1 Bark": f1_bark,
@@ -682,6 +682,8 @@ class F1F2PlotNode(VoicelabNode):
         fig1 = plt.gcf()
         plt.show()
         fig1.savefig(f"F1F2_Plot_{datetime.datetime.now()}.png", dpi=1000)
+        # The plot window is part of the GUI, only bring in Qt once there is something to show
+        from ...VoicelabGUI.F1F2PlotWindow import F1F2PlotWindow
         self.f1f2plotwindow = F1F2PlotWindow()
 
         for i, result in enumerate(results):
@@ -707,8 +709,8 @@ class F1F2PlotNode(VoicelabNode):
         ells = []
 
         # Convert Our formant measurements to bark
-        f1_bark = [hz_to_bark(f1) for f1 in self.state['f1 means']]
-        f2_bark = [hz_to_bark(f2) for f2 in self.state['f2 means']]
+        f1_bark = hz_to_bark(self.state['f1 means']).tolist()
+        f2_bark = hz_to_bark(self.state['f2 means']).tolist()
 
         # convert peterson barney f1 f2 data into numpy arrays
         search_data = df[["F1 Bark", "F2 Bark"]].values
@@ -759,6 +761,8 @@ class F1F2PlotNode(VoicelabNode):
         fig1.savefig('f1f2.png', dpi=1000)
         results[i][self]["F1F2 Plot"] = ["Figure Created"]
 
+        # The plot window is part of the GUI, only bring in Qt once there is something to show
+        from ...VoicelabGUI.F1F2PlotWindow import F1F2PlotWindow
         self.f1f2plotwindow = F1F2PlotWindow()
         return results
 
@@ -840,22 +844,6 @@ class F1F2PlotNode(VoicelabNode):
         return ax.add_patch(ellipse)
 
 
-def hz_to_bark(hz):
-    """
-    This function converts Hz to Bark.
-        Parameters
-        ----------
-        hz is the frequency in Hz
-
-        Returns
-        -------
-        bark is the frequency in bark
-    """
-
-    bark = 7 * np.log(hz / 650 + np.sqrt(1 + (hz / 650) ** 2))
-    return bark
-
-
 def gather_data():
     """
     This function collects data from Peterson & Barney 1952 from Praat there is no input for the function.
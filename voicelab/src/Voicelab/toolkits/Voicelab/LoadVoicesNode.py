@@ -1,7 +1,11 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import parselmouth
+import soundfile
 from ...pipeline.Node import Node
 from parselmouth.praat import call
-from ...pipeline.FileWidget import FileWidget
+from .AnalysisContext import AnalysisContext
 
 
 """
@@ -10,14 +14,23 @@ WARIO pipeline node for loading voice files.
 ###################################################################################################
 ARGUMENTS
 'file_locations'   : list of filesystem locations for where to find the voice files
+'prefetch'   : how many files to decode ahead of the one being processed. 0 decodes each file
+               only when it is needed
 ###################################################################################################
 RETURNS
 'voice' [batch]   : return a parselmouth voice object for each file loaded
+'file_path' [batch]   : return the location of each file loaded
+'context' [batch]   : return an AnalysisContext sharing Praat analyses of each file between nodes
+'error' [batch]   : why a file could not be read, instead of 'voice' and 'context', so the nodes
+                    measuring it don't run
 ###################################################################################################
 """
 
 
 class LoadVoicesNode(Node):
+    # The samples and analyses of each file are only needed by the nodes that measure it
+    transient_outputs = ("voice", "context")
+
     def __init__(self, name):
         """
         Args:
@@ -25,55 +38,115 @@ class LoadVoicesNode(Node):
         """
         super().__init__(name)
         self.done = False
+        self.args["prefetch"] = 2
 
 
     def process(self):
         """
-        process: Retrieve the next file location and return it
+        process: Retrieve the next file and return it
         """
-        #item, file_path = self.get_next(self.state["voices"])
-        #return {"voice": item, "file_path": file_path}
-        (signal, sampling_rate), file_path = self.get_next(self.state["voices"])
-        return {"voice": (signal, sampling_rate), "file_path": file_path}
+        # The previous file has been through every node, its analyses are no longer needed
+        if self.state.get("context") is not None:
+            self.state["context"].release()
+            self.state["context"] = None
+
+        file_path, loading = self.get_next(self.state["loading"])
+        try:
+            voice = loading.result() if self.state["loader"] is not None else load_voice(file_path)
+        except Exception as e:
+            # a file that can not be read is reported and left out, rather than stopping the whole run
+            self.events_fired["warning"] = f"Could not read {file_path}: {e}"
+            return {"file_path": file_path, "error": str(e)}
+
+        self.state["context"] = AnalysisContext(voice, file_path)
+        return {"voice": voice, "file_path": file_path, "context": self.state["context"]}
 
 
     def start(self):
         """
-        start: WARIO hook, run before any data is processed to load the data in
+        start: WARIO hook, run before any data is processed to find the files to load. Files are
+        only decoded as processing reaches them, with up to 'prefetch' files decoded ahead in the
+        background, so only a few are held in memory at once.
         """
-        self.state["voices"] = []
-
         # If a collection of file locations are present use those, otherwise prompt for them
         if len(self.args["file_locations"]) == 0:
+            # FileWidget starts a QApplication when imported, only bring it in when we need to ask
+            from ...pipeline.FileWidget import FileWidget
             ex = FileWidget()
             self.state["files"] = ex.openFileNamesDialog()
         else:
             self.state["files"] = self.args["file_locations"]
 
-        for file_path in self.state["files"]:
-            #  This is where we load files
-            #  Select Load None if we want to load nothing
-            #  Append the parselmouth.Sound object if you don't need multiprocessing
-            #  We are going to try passing the data and sampling rate through nodes instead of sound objects.
-            sound = parselmouth.Sound(file_path)
-            signal = sound.values
-            sampling_rate = sound.sampling_frequency
-            voice = (signal, sampling_rate)
-            self.state["voices"].append((voice, file_path))
-            #self.state["voices"].append((None, file_path))
-
-        # return how many files have been loaded
-        return len(self.state["voices"])
+        self.state["waiting"] = deque(self.state["files"])
+        self.state["loading"] = deque()
+        prefetch = self.args.get("prefetch", 0)
+        self.state["loader"] = ThreadPoolExecutor(max_workers=1) if prefetch > 0 else None
+
+        # return how many files will be loaded
+        return len(self.state["files"])
+
+    def end(self, results):
+        """
+        end: WARIO hook, run after all the data is processed to stop the background loader
+        """
+        if self.state.get("loader") is not None:
+            self.state["loader"].shutdown(cancel_futures=True)
+            self.state["loader"] = None
+        self.state["loading"] = deque()
+        return results
 
     """
-    get_next: Retrieve the next file location by simply popping off the stack
+    get_next: Retrieve the next file from the front of the queue, so results come out in the order
+    the files were given. Keeps the queue topped up with the files being decoded ahead. Returns the
+    file and, with a background loader, the future decoding it
     """
     def get_next(self, collection):
         """
         Args:
             collection:
         """
-        item = collection.pop()
-        if len(collection) <= 0:
+        loader = self.state["loader"]
+        depth = self.args.get("prefetch", 0) + 1
+        while len(collection) < depth and len(self.state["waiting"]) > 0:
+            file_path = self.state["waiting"].popleft()
+            if loader is None:
+                collection.append((file_path, None))
+            else:
+                collection.append((file_path, loader.submit(load_voice, file_path)))
+
+        item = collection.popleft()
+        if len(collection) <= 0 and len(self.state["waiting"]) <= 0:
             self.done = True
         return item
+
+
+def load_voice(file_path):
+    """Decode a file into the (signal, sampling_rate) voice sent through the pipeline
+
+    Args:
+        file_path:
+    """
+    #  We are going to try passing the data and sampling rate through nodes instead of sound objects.
+    sound = parselmouth.Sound(file_path)
+    signal = sound.values
+    sampling_rate = sound.sampling_frequency
+    return signal, sampling_rate
+
+
+def read_header(file_path):
+    """Read the sampling rate, channels and length of a file without decoding it. For formats
+    libsndfile can not read, they are None until Praat decodes the file when it is processed.
+
+    Args:
+        file_path:
+    """
+    try:
+        info = soundfile.info(file_path)
+    except (RuntimeError, TypeError):
+        return {"sampling_rate": None, "channels": None, "frames": None, "duration": None}
+    return {
+        "sampling_rate": info.samplerate,
+        "channels": info.channels,
+        "frames": info.frames,
+        "duration": info.duration,
+    }
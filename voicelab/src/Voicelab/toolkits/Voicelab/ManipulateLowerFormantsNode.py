@@ -24,6 +24,8 @@ class ManipulateLowerFormantsNode(VoicelabNode):
             If true, the amplitude of the manipulated voice will be normalized to 70dB RMS.  Default is True.
 
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
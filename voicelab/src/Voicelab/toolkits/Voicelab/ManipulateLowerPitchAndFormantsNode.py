@@ -22,6 +22,9 @@ class ManipulateLowerPitchAndFormantsNode(VoicelabNode):
         self.args['normalize amplitude'] : bool, default=True
             Normalize amplitude to 70 dB RMS
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -5,13 +5,15 @@ from ...pipeline.Node import Node
 from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
 
-from PyQt5.QtWidgets import QMessageBox
 import parselmouth
 
 
 class ManipulatePitchHigherNode(VoicelabNode):
     """Manipulate pitch higher node.
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -104,12 +106,8 @@ class ManipulatePitchHigherNode(VoicelabNode):
         # Multiply frequencies does not have a unit argument
         else:
             if amount <= 0:
-                warning_window = QMessageBox()
-                warning_window.setWindowTitle("Warning")
-                warning_window.setText(
+                self.events_fired["warning"] = (
                     "You cannot multiply freqeuncies by a number less than or equal to 0.\nWe have used the absolute value of your number")
-                warning_window.setIcon(QMessageBox.Critical)
-                warning_window.exec_()
                 amount *= -1
             call(pitch_tier, method, sound.xmin, sound.xmax, amount)
         call([pitch_tier, manipulation], "Replace pitch tier")
@@ -7,12 +7,14 @@ import parselmouth
 from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
 
-from PyQt5.QtWidgets import QMessageBox
 
 
 class ManipulatePitchLowerNode(VoicelabNode):
     """This node manipulates the pitch of the sound by raising it.
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -95,11 +97,7 @@ class ManipulatePitchLowerNode(VoicelabNode):
             # Multiply frequencies does not have a unit argument
             else:
                 if amount <= 0:
-                    warning_window = QMessageBox()
-                    warning_window.setWindowTitle("Warning")
-                    warning_window.setText("You cannot multiply freqeuncies by a number less than or equal to 0.\nWe have used the absolute value of your number")
-                    warning_window.setIcon(QMessageBox.Critical)
-                    warning_window.exec_()
+                    self.events_fired["warning"] = "You cannot multiply freqeuncies by a number less than or equal to 0.\nWe have used the absolute value of your number"
                     amount *= -1
 
                 call(pitch_tier, method, sound.xmin, sound.xmax, amount)
@@ -23,6 +23,9 @@ class ManipulateRaiseFormantsNode(VoicelabNode):
         self.args{'normalize amplitude'} (bool, default=True):
             If true, the amplitude of the manipulated voice will be normalized to 70dB RMS.  Default is True.
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import os
 
@@ -8,7 +7,6 @@ from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
 
 
-from PyQt5.QtWidgets import QMessageBox
 
 
 class ManipulateTruncateSoundsNode(VoicelabNode):
@@ -27,6 +25,9 @@ class ManipulateTruncateSoundsNode(VoicelabNode):
         self.args["Percent to trim from each end"]: int, float, default=10.0
             Percent of total sound duration to trim from each end
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
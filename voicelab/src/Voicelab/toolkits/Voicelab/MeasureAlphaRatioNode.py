@@ -44,10 +44,11 @@ class MeasureAlphaRatioNode(VoicelabNode):
         """
         try:
             signal, sampling_rate = self.args['voice']
-            voice: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
-            sound = voice
+            sound: parselmouth.Sound = self.context.sound
 
             if self.args["Pre-Emphasis"] > 0:
+                # pre-emphasis is done in place, so work on a copy of the shared sound
+                sound = sound.copy()
                 sound.pre_emphasize(self.args["Pre-Emphasis"])
             if self.args["Smoothing Bandwidth"]:
                 sound = call(sound, "Filter (pass Hann band)", 500, 1000, self.args['Smoothing Bandwidth'])
@@ -46,10 +46,9 @@ class MeasureCPPNode(VoicelabNode):
         """
         try:
             file_path: str = self.args["file_path"]
-            signal, sampling_rate = self.args['voice']
-            voice: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+            voice: parselmouth.Sound = self.context.sound
             sound = voice
-            spectrum: parselmouth.Spectrum = voice.to_spectrum()
+            spectrum: parselmouth.Spectrum = self.context.spectrum
             cepstrum: parselmouth.Data = call(spectrum, "To PowerCepstrum")
 
             interpolation: str = self.args["interpolation"]
@@ -12,8 +12,7 @@ class MeasureDurationNode(VoicelabNode):
         try:
             """Returns the total duration of a sound file."""
             file_path: str = self.args["file_path"]
-            signal, sampling_rate = self.args['voice']
-            sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+            sound: parselmouth.Sound = self.context.sound
             return {"Voice Duration": sound.duration}
         except Exception as e:
             return {"Voice Duration": str(e)}
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import numpy as np
 import os
-import pandas as pd
 from parselmouth.praat import call
 import parselmouth
 
@@ -64,9 +63,8 @@ class MeasureEnergyNode(VoicelabNode):
 
         try:
             # Get the pitch in order to set a variable window length based on 5 pitch periods. What this does is makes sure the energy is
-            audio_file_path: str = self.args["file_path"]
-            signal, sampling_rate = self.args['voice']
-            sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+            # The pitch track and the energy are both measured on the one Sound, shared with the other nodes
+            sound: parselmouth.Sound = self.context.sound
             self.fs: Union[float, int] = sound.sampling_frequency
             self.audio_file_path: str = self.args["file_path"]
             if isinstance(self.args["pitch algorithm"], tuple):
@@ -80,14 +78,12 @@ class MeasureEnergyNode(VoicelabNode):
             n_periods: int = 5  # Nperiods_EC
             self.n_periods: int = n_periods
             frameshift: int = 1  # variables.frameshift
-            time_praat: pd.DataFrame
-            f0_praat: pd.DataFrame
-            time_praat, f0_praat = self.get_times_and_pitches(audio_file_path) # Get the times and pitches from Praat
+            time_praat: np.array
+            f0_praat: np.array
+            time_praat, f0_praat = self.get_times_and_pitches(sound) # Get the times and pitches from Praat
             # Refine the pitch using Voice Sauce's algorithm by removing undefined values and interpolating
             f0: np.array = self.refine_pitch_voice_sauce(time_praat, f0_praat)
             self.f0: np.array = f0 # Set the pitch as an attribute of the class
-            signal, sampling_rate = self.args['voice'] # Get the signal and sampling rate
-            sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate) # Create a parselmouth sound object
             fs: Union[float, int] =  sound.sampling_frequency # Get the sampling frequency
             self.fs: Union[float, int] = fs # Set the sampling frequency as an attribute of the class
 
@@ -97,7 +93,7 @@ class MeasureEnergyNode(VoicelabNode):
 
             # Calculate Energy
             try:
-                voice_sauce_rms = self.get_energy_voice_sauce(audio_file_path)
+                voice_sauce_rms = self.get_energy_voice_sauce(sound, f0)
             except Exception as e:
                 voice_sauce_rms = str(e) # If there is an error, set the total_energy as the error message
 
@@ -133,13 +129,15 @@ class MeasureEnergyNode(VoicelabNode):
             }
 
 
-    def get_energy_voice_sauce(self, audio_file_path: str) -> Union[np.array, str]:
+    def get_energy_voice_sauce(self, sound: parselmouth.Sound, f0: np.array) -> Union[np.array, str]:
         """Get energy from Voice Sauce formula
         The formula measures energy the normal way, but the window length is variable based on 5 pitch periods.
         I added some extra calculations like RMS and Equivalent Continuous Sound Level (Leq)
 
-        :param audio_file_path: path to audio file
-        :type audio_file_path: str
+        :param sound: the sound to measure
+        :type sound: parselmouth.Sound
+        :param f0: pitch at each frame, from refine_pitch_voice_sauce
+        :type f0: np.array
         :return: energy: Energy values or error message
         :rtype: Union[np.array, str]
         """
@@ -147,95 +145,75 @@ class MeasureEnergyNode(VoicelabNode):
         # Get the number of periods in the signal
         n_periods: int = 5  # Nperiods_EC
         frameshift: int = 1 # variables.frameshift
-        time_praat, f0_praat = self.get_times_and_pitches(audio_file_path) # get the times and pitches
-        f0 = self.refine_pitch_voice_sauce(time_praat, f0_praat) # refine the pitch values
-        signal, sampling_rate = self.args['voice'] # get the signal and sampling rate
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate) # create a sound object
-        sound.resample(16000) # resample to 16kHz
         y = sound.values.T # get the signal values
         fs = sound.sampling_frequency # get the sampling frequency
         sampleshift: float = (fs / 1000 * frameshift) # calculate the sample shift (hop size)
 
         # Calculate Energy
-        #energy: np.array = np.full(len(f0), np.nan)  # create an array and fill it with NaNs
+        # Every frame is a window of 5 pitch periods centred on the frame, so rather than slicing
+        # the signal once per frame, the windows are all found at once and their sums of squares
+        # are read off a running total of the squared signal.
         rms: np.array = np.full(len(f0), np.nan)  # create an array and fill it with NaNs
-        for k, f0_curr in enumerate(f0):
-            ks: Union[float, int] = self.round_half_away_from_zero(k * sampleshift)
-            # If the frame is too short, skip it
-            if ks <= 0:
-                continue
-            # If the frame is too long, skip it
-            if ks >= len(y):
-                continue
-
-            f0_curr: Union[float, int] = f0[k] # get the current pitch
-            # If the pitch is NaN, skip it
-            if np.isnan(f0_curr):
-                continue
-            # If the pitch is 0, skip it
-            if f0_curr == 0:
-                continue
+        ks: np.array = self.round_half_away_from_zero(np.arange(len(f0)) * sampleshift)
+        with np.errstate(divide='ignore', invalid='ignore'):
             # Calculate the window length
-            n0_curr: Union[float, int] = fs / f0_curr
+            n0: np.array = fs / f0
             # Calculate the start and end of the window
-            ystart: int = int(self.round_half_away_from_zero(ks- n_periods / 2 * n0_curr))
-            yend: int = int(self.round_half_away_from_zero(ks + n_periods / 2 * n0_curr) - 1)
-
-            # If the window is 0 or negative, skip it
-            if ystart <= 0:
-                continue
-
-            # If the window is after the end of the signal, skip it
-            if yend > len(y):
-                continue
-
-            # Get the segment of the signal
-            yseg: np.array = y[ystart:yend]
-            # This is the voice sauce algorithm.  It's total energy.  So the windows don't matter at all in
-            # the calculation.  It's just the total energy of the signal.
-            # When it gets added up after the loop
-            # I'm putting RMS in the get_energy function instead.
-            # The Voice Sauce Manual says that it calculates RMS, so this is a bug.
-            # I don't think this was intended, and I contacted the authors.
-            # If you need the old way, you can uncomment the line below, or use an older version of VoiceLab or use
-            # Voice Sauce directly.
-            # Voicelab used to give the mean of the total energy, but I changed it to RMS of the RMS'd Frames.
-            # As you can see, the values are much closer to Praat now.
-            # The total energy of the signal negates any cleverness of the window length being based on pitch.
-            # RMS is a better measure of the energy of the signal.
-            # People should not use the old way anymore.
-            # It is not what they think it is.
-            # All of the papers that use VoiceLab should be re-run with the new way.
-            #energy[k] = np.sum(yseg ** 2)
-            # Calculate the RMS of the segment
-            rms[k] = np.sqrt(np.mean(yseg ** 2))
+            ystart: np.array = self.round_half_away_from_zero(ks - n_periods / 2 * n0)
+            yend: np.array = self.round_half_away_from_zero(ks + n_periods / 2 * n0) - 1
+        frames: np.array = (
+            (ks > 0) & (ks < len(y))  # If the frame is too short or too long, skip it
+            & ~np.isnan(f0) & (f0 != 0)  # If the pitch is NaN or 0, skip it
+            & (ystart > 0)  # If the window is 0 or negative, skip it
+            & (yend <= len(y))  # If the window is after the end of the signal, skip it
+        )
+        ystart, yend = ystart[frames], yend[frames]
+
+        # This is the voice sauce algorithm.  It's total energy.  So the windows don't matter at all in
+        # the calculation.  It's just the total energy of the signal.
+        # When it gets added up after the loop
+        # I'm putting RMS in the get_energy function instead.
+        # The Voice Sauce Manual says that it calculates RMS, so this is a bug.
+        # I don't think this was intended, and I contacted the authors.
+        # If you need the old way, you can use an older version of VoiceLab or use
+        # Voice Sauce directly.
+        # Voicelab used to give the mean of the total energy, but I changed it to RMS of the RMS'd Frames.
+        # As you can see, the values are much closer to Praat now.
+        # The total energy of the signal negates any cleverness of the window length being based on pitch.
+        # RMS is a better measure of the energy of the signal.
+        # People should not use the old way anymore.
+        # It is not what they think it is.
+        # All of the papers that use VoiceLab should be re-run with the new way.
+        # Calculate the RMS of each segment y[ystart:yend]
+        cumulative_energy: np.array = np.concatenate(([0.0], np.cumsum(np.sum(y ** 2, axis=1))))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rms[frames] = np.sqrt(
+                (cumulative_energy[yend] - cumulative_energy[ystart]) / ((yend - ystart) * y.shape[1])
+            )
         return rms
 
 
-    def get_times_and_pitches(self, audio_file_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    def get_times_and_pitches(self, sound: parselmouth.Sound) -> tuple[np.array, np.array]:
         """Get raw pitch from Praat. This is used to set the window length for the energy calculation.
 
-        :argument: audio_file_path: path to the audio file
-        :type: str
-        :return: time, f0
-        :rtype: tuple[pd.DataFrame, pd.DataFrame]
+        :argument: sound: the sound to measure
+        :type: parselmouth.Sound
+        :return: time, f0, with NaN for unvoiced frames
+        :rtype: tuple[np.array, np.array]
         """
-        signal, sampling_rate = self.args['voice'] # get the signal and sampling rate
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate) # create a sound object
-        sound.resample(16000) # resample to 16kHz
         pitch: parselmouth.Pitch = sound.to_pitch_cc(
             time_step=0.001,
             pitch_floor=40,
             pitch_ceiling=500,
         ) # get the pitch
 
-        df = pd.DataFrame() # create a dataframe
-        df['Time'] = pitch.xs() # add the times to the dataframe
-        df['Frequency'] = [pitch.get_value_at_time(value) for value in pitch.xs()] # add frequencies to the dataframe
-        return df.Time, df.Frequency # return the times and frequencies
+        # read the whole track at once, Praat marks unvoiced frames with 0
+        frequencies: np.array = pitch.selected_array['frequency']
+        frequencies[frequencies == 0] = np.nan
+        return pitch.xs(), frequencies # return the times and frequencies
 
 
-    def refine_pitch_voice_sauce(self, times: pd.DataFrame, frequencies: pd.DataFrame) -> np.array:
+    def refine_pitch_voice_sauce(self, times: np.array, frequencies: np.array) -> np.array:
         """Refine praat Pitch to remove undefined values, and interpolate values to match our time step.
 
         :argument: times: np.array
@@ -282,18 +260,28 @@ class MeasureEnergyNode(VoicelabNode):
         # stop time is the last time point
         else:
             stop = pitch_times_ms[-1]
-        # Iterate through timepoints corresponding to each frame in time range
-        for i, frame_length in enumerate(range(start, stop, frame_shift)):
-            # Find closest time point among calculated Praat values
-            closest_time_point: np.ndarray[int] = np.argmin(np.abs(pitch_times_ms - frame_length))
-
-            # If closest time point is outside of the frame, skip
-            if np.abs(pitch_times_ms[closest_time_point] - frame_length) > frame_precision * frame_shift:
-                continue
-
-            # If index is in range, set value of f0
-            if 0 <= i < number_of_pitch_points: # This is the index of the frame, we are double checking it's a valid index
-                f0[i] = pitch_values[closest_time_point]
+        # Timepoints corresponding to each frame in time range, only the frames that have a place
+        # in f0 are kept
+        frame_times: np.array = np.arange(start, stop, frame_shift)[:number_of_pitch_points]
+        # Find closest time point among calculated Praat values. The times are sorted, so it is
+        # either the last one before the frame or the first one at or after it, with ties going
+        # to the earlier one.
+        after: np.array = np.searchsorted(pitch_times_ms, frame_times)
+        before: np.array = np.maximum(after - 1, 0)
+        after = np.minimum(after, number_of_pitch_points - 1)
+        distance_before: np.array = np.abs(pitch_times_ms[before] - frame_times)
+        distance_after: np.array = np.abs(pitch_times_ms[after] - frame_times)
+        closest_time_point: np.array = np.where(
+            distance_before <= distance_after,
+            # the first of any repeated time points
+            np.searchsorted(pitch_times_ms, pitch_times_ms[before]),
+            after,
+        )
+        closest_distance: np.array = np.minimum(distance_before, distance_after)
+
+        # If closest time point is outside of the frame, skip
+        in_frame: np.array = closest_distance <= frame_precision * frame_shift
+        f0[:len(frame_times)][in_frame] = pitch_values[closest_time_point[in_frame]]
         return f0
 
 
@@ -36,6 +36,9 @@ class MeasureFormantNode(VoicelabNode):
             self.args['method']: str, default='Formant Path'
                 Method to use for formant measurement. Options are: Formant Path or Formant Burg.
     """
+    # The Formant object is only sent on to nodes that need it
+    transient_outputs = ("Formants",)
+
     def __init__(self, *args, **kwargs):
 
         """
@@ -95,8 +98,7 @@ class MeasureFormantNode(VoicelabNode):
         ceiling_step_size = self.args["Ceiling Step Size (Formant Path)"]
         number_of_steps = self.args["Number of Steps (Formant Path)"]
 
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+        sound: parselmouth.Sound = self.context.sound
 
         try:
             # Burg Method
@@ -208,8 +210,7 @@ class MeasureFormantNode(VoicelabNode):
         """
         # This is the function to call to measure the formants
 
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+        sound: parselmouth.Sound = self.context.sound
         print(f'{max_formant=}')
         try:
             if max_formant == 'Auto':
@@ -4,9 +4,7 @@ import numpy as np
 import parselmouth
 from parselmouth.praat import call
 
-from sklearn.preprocessing import StandardScaler,  RobustScaler
 import statistics
-from scipy import stats
 from typing import Union
 
 from ...pipeline.Node import Node
@@ -17,6 +15,11 @@ from.MeasurePitchNode import measure_pitch_praat
 class MeasureFormantPositionsNode(VoicelabNode):
     """Measure Formnat Positions Node. This measures formant frequency position. This code is called from the MeasureVocalTractEstimatesNode. It's recommended you use that node to access this code.
     """
+    # Collects measurements for end(), so it always processes
+    cache_results = False
+    # end() adds what it finds across all the files to each file's results
+    uses_results = True
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -44,62 +47,54 @@ class MeasureFormantPositionsNode(VoicelabNode):
             :rtype results: dict
         """
         file_path: str = self.args["file_path"]
-        voice: parselmouth.Sound = parselmouth.Sound(file_path)
+        voice: parselmouth.Sound = self.context.sound
         formant_object: parselmouth.Formant = self.args["Formants"]
 
         pitch_floor: float = self.args["Pitch Floor"]
         pitch_ceiling: float = self.args["Pitch Ceiling"]
-        pitch: tuple[float, list[float], float, float, float, float] = measure_pitch_praat(
+        pitch: parselmouth.Pitch = measure_pitch_praat(
             file_path=file_path,
-            method="cc",
+            sound=voice,
+            method="To Pitch (cc)",
             floor=pitch_floor,
             ceiling=pitch_ceiling
-        )
+        )[0]
 
         point_process: parselmouth.Data = call([voice, pitch], "To PointProcess (cc)")  # Create PointProcess object
-        num_points: Union[float, int] = call(point_process, "Get number of points")
-
-        f1_list: list = []
-        f2_list: list = []
-        f3_list: list = []
-        f4_list: list = []
-        measurement_times: list = []
-        normalization_method_list: list = []
-
-        point: Union[float, int]
-        for point in range(0, num_points):
-            point += 1
-            t: float = call(point_process, "Get time from index", point)
-            measurement_times.append(t)
-            f1: float = call(formant_object, "Get value at time", 1, t, "Hertz", "Linear")
-            f2: float = call(formant_object, "Get value at time", 2, t, "Hertz", "Linear")
-            f3: float = call(formant_object, "Get value at time", 3, t, "Hertz", "Linear")
-            f4: float = call(formant_object, "Get value at time", 4, t, "Hertz", "Linear")
-            f1_list.append(f1)
-            f2_list.append(f2)
-            f3_list.append(f3)
-            f4_list.append(f4)
-
-        f1_list = [f1 for f1 in f1_list if str(f1) != "nan"]
-        f2_list = [f2 for f2 in f2_list if str(f2) != "nan"]
-        f3_list = [f3 for f3 in f3_list if str(f3) != "nan"]
-        f4_list = [f4 for f4 in f4_list if str(f4) != "nan"]
+        num_points: int = call(point_process, "Get number of points")
+
+        # the time of every glottal pulse at once, rather than a call per pulse
+        if num_points > 0:
+            measurement_times: np.ndarray = call(point_process, "To Matrix").values[0]
+        else:
+            measurement_times: np.ndarray = np.zeros(0)
+
+        # each formant track is read once, and sampled at all of the pulses at once
+        formant_values: list = []
+        for formant_number in range(1, 5):
+            track: parselmouth.Matrix = call(formant_object, "To Matrix", formant_number)
+            frequencies: np.ndarray = track.values[0].astype(np.float64)
+            # frames with fewer formants hold 0
+            frequencies[frequencies == 0] = np.nan
+            values: np.ndarray = self.values_at_times(frequencies, track.x1, track.dx, measurement_times)
+            formant_values.append(values[~np.isnan(values)])
+        f1_list, f2_list, f3_list, f4_list = formant_values
 
         # calculate mean
         if len(f1_list) > 0:
-            f1_mean_pf: Union[float, str] = sum(f1_list) / len(f1_list)
+            f1_mean_pf: Union[float, str] = float(np.mean(f1_list))
         else:
             f1_mean_pf: Union[float, str] = "N/A"
         if len(f2_list) > 0:
-            f2_mean_pf: Union[float, str] = sum(f2_list) / len(f2_list)
+            f2_mean_pf: Union[float, str] = float(np.mean(f2_list))
         else:
             f2_mean_pf: Union[float, str] = "N/A"
         if len(f3_list) > 0:
-            f3_mean_pf: Union[float, str] = sum(f3_list) / len(f3_list)
+            f3_mean_pf: Union[float, str] = float(np.mean(f3_list))
         else:
             f3_mean_pf: Union[float, str] = "N/A"
         if len(f4_list) > 0:
-            f4_mean_pf: Union[float, str] = sum(f4_list) / len(f4_list)
+            f4_mean_pf: Union[float, str] = float(np.mean(f4_list))
         else:
             f4_mean_pf: Union[float, str] = "N/A"
 
@@ -156,6 +151,9 @@ class MeasureFormantPositionsNode(VoicelabNode):
         if len(formant_mean_lists[0]) < 30:
             return "Not enough samples, requires at least 30", "Not enough samples, requires at least 30"
 
+        from scipy import stats
+        from sklearn.preprocessing import StandardScaler, RobustScaler
+
         # Normality test for mean data
         _, p_f1_mean = stats.normaltest(formant_mean_lists[0])
         _, p_f2_mean = stats.normaltest(formant_mean_lists[1])
@@ -51,7 +51,7 @@ class MeasureHarmonicityNode(VoicelabNode):
 
         try:
             file_path: str = self.args["file_path"]
-            sound: parselmouth.Sound = parselmouth.Sound(file_path)
+            sound: parselmouth.Sound = self.context.sound
             algorithm: str = self.args["Algorithm"][0]
             timestep: float = self.args["Timestep"]
             silence_threshold: float = self.args["Silence Threshold"]
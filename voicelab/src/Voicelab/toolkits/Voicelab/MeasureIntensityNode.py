@@ -20,6 +20,9 @@ class MeasureIntensityNode(VoicelabNode):
             Subtract Mean: bool, default True
                 Subtract the mean intensity from the intensity
     """
+    # The Intensity object is only sent on to nodes that need it
+    transient_outputs = ("Intensity",)
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -44,10 +47,9 @@ class MeasureIntensityNode(VoicelabNode):
         :rtype: dict[str, Union[int, float, str, list]]
         """
         file_path = self.args['file_path']
-        voice = parselmouth.Sound(file_path)
         try:
             minimum_pitch = self.args["minimum_pitch"]
-            intensity = voice.to_intensity(minimum_pitch)
+            intensity = self.context.intensity(minimum_pitch)
             mean_intensity = intensity.get_average()
             return {
                 "Intensity": intensity,
@@ -5,9 +5,6 @@ from typing import Union
 import numpy as np
 import parselmouth
 
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-
 from ...pipeline.Node import Node
 from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
@@ -41,6 +38,11 @@ class MeasureJitterNode(VoicelabNode):
             self.state["ppq5_jitter_list"]: list
             self.state["ddp_jitter_list"]: list
     """
+    # Collects measurements for end(), so it always processes
+    cache_results = False
+    # end() adds what it finds across all the files to each file's results
+    uses_results = True
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -76,7 +78,7 @@ class MeasureJitterNode(VoicelabNode):
         :rtype dict:[str, Union[float, int, str]]
         """
         file_path = self.args["file_path"]
-        voice = parselmouth.Sound(file_path)
+        voice = self.context.sound
 
         try:
             print(self.args["Measure PCA"])
@@ -90,9 +92,7 @@ class MeasureJitterNode(VoicelabNode):
             longest_period = self.args["longest_period"]
             max_period_factor = self.args["maximum_period_factor"]
 
-            point_process: object = call(
-                voice, "To PointProcess (periodic, cc)", pitch_floor, pitch_ceiling
-            )
+            point_process: object = self.context.point_process(pitch_floor, pitch_ceiling)
 
             local_jitter: float = call(
                 point_process,
@@ -197,6 +197,10 @@ class MeasureJitterNode(VoicelabNode):
             ddp_jitter_list,
         ]
 
+        # sklearn takes a while to import, so only load it when there is a PCA to run
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+
         try:
             # Z-score the data
             x = StandardScaler().fit_transform(x).T
@@ -65,7 +65,7 @@ class MeasureLTASNode(VoicelabNode):
 
         """
         file_path = self.args['file_path']
-        sound = parselmouth.Sound(file_path)
+        sound = self.context.sound
 
         try:
             f0min, f0max = self.pitch_bounds(file_path)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import numpy as np
 import parselmouth
 from typing import Union
 
@@ -16,6 +17,9 @@ class MeasureMFCCNode(VoicelabNode):
     :return: dict of results
     :rtype: dict[str, Union[int, float, str, list]]
     """
+    version = 2
+    frame_times = {"mfcc": "mfcc times"}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -34,11 +38,13 @@ class MeasureMFCCNode(VoicelabNode):
         :rtype: dict[str, Union[int, float, str, list]]
         """
         file_path = self.args['file_path']
-        sound = parselmouth.Sound(file_path)
+        sound = self.context.sound
         try:
-            mfcc = sound.to_mfcc(number_of_coefficients=24)
+            features = sound.to_mfcc(number_of_coefficients=24).extract_features()
+            # one row of values over the frames for each feature
             return {
-                "mfcc": mfcc.extract_features().values.tolist()
+                "mfcc": features.values.astype(np.float32),
+                "mfcc times": features.xs().astype(np.float32),
             }
         except Exception as e:
             return {
@@ -44,6 +44,16 @@ class MeasurePitchNode(VoicelabNode):
         -----------------------
         Use minF0 and maxF0 to set the range of frequencies to search for. Values supplied above. None of the other arguments are used.
     """
+    version = 2
+    # The Pitch object is only sent on to nodes that need it
+    transient_outputs = ("Pitch",)
+    frame_times = {
+        "Pitch Values (Praat To Pitch (ac))": "Pitch Times (Praat To Pitch (ac))",
+        "Pitch Values (Praat To Pitch (cc))": "Pitch Times (Praat To Pitch (cc))",
+        **MeasurePitchYinNode.frame_times,
+        **MeasureSHRPNode.frame_times,
+    }
+
     def __init__(self, *args, **kwargs):
 
         """
@@ -113,7 +123,7 @@ class MeasurePitchNode(VoicelabNode):
 
         """
         file_path: str = self.args["file_path"]
-        voice: parselmouth.Sound = parselmouth.Sound(file_path)
+        voice: parselmouth.Sound = self.context.sound
         time_step: float = self.args["Time Step"]
         max_number_of_candidates: int = self.args["Max Number of Candidates"]
         silence_threshold: float = self.args["Silence Threshold"]
@@ -144,6 +154,7 @@ class MeasurePitchNode(VoicelabNode):
                 method = 'To Pitch (ac)'
                 pitch, praat_ac_pitch_values, praat_ac_mean_f0, praat_ac_median_f0, praat_ac_stdev_f0, praat_ac_min_f0, praat_ac_max_f0 = measure_pitch_praat(
                     file_path,
+                    sound=voice,
                     floor=pitch_floor,
                     ceiling=pitch_ceiling,
                     method=method,
@@ -161,6 +172,7 @@ class MeasurePitchNode(VoicelabNode):
                     "Pitch": pitch,
                     "Pitch Praat To Pitch (ac)": pitch,
                     "Pitch Values (Praat To Pitch (ac))": praat_ac_pitch_values,
+                    "Pitch Times (Praat To Pitch (ac))": pitch.xs().astype(np.float32),
                     "Mean Pitch (F0) (Praat To Pitch (ac))": praat_ac_mean_f0,
                     "Median Pitch (F0) (Praat To Pitch (ac))": praat_ac_median_f0,
                     "Standard Deviation Pitch (F0) (Praat To Pitch (ac))": praat_ac_stdev_f0,
@@ -176,6 +188,7 @@ class MeasurePitchNode(VoicelabNode):
                     pitch, praat_cc_pitch_values, praat_cc_mean_f0, praat_cc_median_f0, praat_cc_stdev_f0, praat_cc_min_f0, praat_cc_max_f0\
                         = measure_pitch_praat(
                         file_path,
+                        sound=voice,
                         floor=pitch_floor,
                         ceiling=pitch_ceiling,
                         method=method,
@@ -193,6 +206,7 @@ class MeasurePitchNode(VoicelabNode):
                         "Pitch": pitch,
                         "Pitch To Pitch (cc)": pitch,
                         "Pitch Values (Praat To Pitch (cc))": praat_cc_pitch_values,
+                        "Pitch Times (Praat To Pitch (cc))": pitch.xs().astype(np.float32),
                         "Mean Pitch (F0) ( To Pitch (cc))": praat_cc_mean_f0,
                         "Median Pitch (F0) (Praat To Pitch (cc))": praat_cc_median_f0,
                         "Standard Deviation Pitch (F0) (Praat To Pitch (cc))": praat_cc_stdev_f0,
@@ -206,18 +220,19 @@ class MeasurePitchNode(VoicelabNode):
 
             if pitch_algorithms["yin"]:
                 yin = MeasurePitchYinNode()
-                yin_results = yin.process(audioFilePath=file_path)
+                yin_results = yin.process(voice=self.args['voice'])
                 pitch_results_list_of_dictionaries.append(yin_results)
 
             if pitch_algorithms["subharmonic_pitch"]:
                 shrp = MeasureSHRPNode()
-                shrp_results = shrp.process(filename=file_path)
+                shrp_results = shrp.process(voice=self.args['voice'])
                 pitch_results_list_of_dictionaries.append(shrp_results)
 
             if all(value is False for value in pitch_algorithms.values()):
                 method = 'To Pitch (ac)'
                 pitch, praat_ac_pitch_values, praat_ac_mean_f0, praat_ac_median_f0, praat_ac_stdev_f0, praat_ac_min_f0, praat_ac_max_f0 = measure_pitch_praat(
                     file_path,
+                    sound=voice,
                     floor=pitch_floor,
                     ceiling=pitch_ceiling,
                     method=method,
@@ -234,6 +249,7 @@ class MeasurePitchNode(VoicelabNode):
                 praat_ac_results = {
                     "Pitch": pitch,
                     "Pitch Values (Praat To Pitch (ac))": praat_ac_pitch_values,
+                    "Pitch Times (Praat To Pitch (ac))": pitch.xs().astype(np.float32),
                     "Mean Pitch (F0) (Praat To Pitch (ac))": praat_ac_mean_f0,
                     "Median Pitch (F0) (Praat To Pitch (ac))": praat_ac_median_f0,
                     "Standard Deviation Pitch (F0) (Praat To Pitch (ac)": praat_ac_stdev_f0,
@@ -265,7 +281,7 @@ class MeasurePitchNode(VoicelabNode):
 
 
 def measure_pitch_praat(
-    file_path: str,
+    file_path: str = None,
     floor: Union[float, int] = 50,
     ceiling: Union[float, int] = 500,
     method: str = "ac",
@@ -278,7 +294,8 @@ def measure_pitch_praat(
     voiced_unvoiced_cost: Union[float, int] = 0.14,
     unit: str = "Hertz",
     very_accurate: str = "no",
-) -> Tuple[float, List[float], float, float, float, float, float]:
+    sound: parselmouth.Sound = None,
+) -> Tuple[parselmouth.Pitch, np.ndarray, float, float, float, float, float]:
     """
         :param file_path:The path to the audio file to be analyzed.
         :type file_path: str
@@ -315,16 +332,19 @@ def measure_pitch_praat(
         :type unit: str
         :param very_accurate: very_accurate is a boolean value that determines if the algorithm used 3 pitch periods or 6. 6 are used if the value is yes.
         :type very_accurate: str
+        :param sound: The already loaded sound to analyze. The file at file_path is only read if this is not given.
+        :type sound: parselmouth.Sound
 
 
         :returns:
             - **pitch**: *(parselmouth.Data)* - parselmouth pitch object
+            - **pitch_values**: *(np.ndarray)* - float32 pitch of each frame, NaN where unvoiced
             - **mean_f0**: *(float)* - The mean pitch
             - **std_f0**: *(float)* - The standard deviation of the pitch
             - **min_f0**: *(float)* - The minimum pitch
             - **max_f0**: *(float)* - The maximum pitch
     """
-    voice: Sound = parselmouth.Sound(file_path)
+    voice: Sound = sound if sound is not None else parselmouth.Sound(file_path)
     pitch: parselmouth.Pitch = call(
         voice,
         method,
@@ -344,7 +364,6 @@ def measure_pitch_praat(
     stdev_f0: float = call(pitch, "Get standard deviation", 0, 0, unit)
     min_f0: Union[float, int] = call(pitch, "Get minimum", 0, 0, unit, "Parabolic")
     max_f0: Union[float, int] = call(pitch, "Get maximum", 0, 0, unit, "Parabolic")
-    pitch_values: np.array = pitch.selected_array['frequency']
-    pitch_values[pitch_values == 0]: np.array = np.nan
-    pitch_values: list[Union[int, float]] = pitch_values.tolist()
+    pitch_values: np.ndarray = pitch.selected_array['frequency'].astype(np.float32)
+    pitch_values[pitch_values == 0] = np.nan
     return pitch, pitch_values, mean_f0, median_f0, stdev_f0, min_f0, max_f0
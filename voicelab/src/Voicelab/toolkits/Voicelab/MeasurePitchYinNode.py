@@ -7,10 +7,11 @@ import numpy as np
 # from scipy.io.wavfile import read as wavread
 # from scipy.signal import resample
 # import statistics
-import librosa
 
 
 class MeasurePitchYinNode(VoicelabNode):
+    version = 2
+    frame_times = {'Pitch Values (Yin)': 'Pitch Times (Yin)'}
 
     def __init__(self, *args, **kwargs):
         """
@@ -27,13 +28,23 @@ class MeasurePitchYinNode(VoicelabNode):
             'max f0': 600,
         }
 
-    def process(self, audioFilePath=None, *args, **kwargs):
+    def process(self, voice=None, *args, **kwargs):
+        """Measure pitch with Yin on the loaded samples
+
+        Args:
+            voice: (signal, sampling_rate) to measure, defaults to args['voice']
+        """
+        # librosa is slow to import (it brings numba with it), so wait until Yin actually runs
+        import librosa
+
         try:
-            if audioFilePath[-3:].lower() != "wav":
-                tmp_praat_object = parselmouth.Sound(audioFilePath)
-                tmp_praat_object.save("tmp.wav", "WAV")
-                audioFilePath = 'tmp.wav'
-            y, sr = librosa.load(audioFilePath)
+            if voice is None:
+                voice = self.args['voice']
+            signal, sampling_rate = voice
+            # Mix down and resample the loaded samples the way librosa.load would from the file
+            y = librosa.to_mono(np.asarray(signal, dtype=np.float32))
+            sr = 22050
+            y = librosa.resample(y, orig_sr=sampling_rate, target_sr=sr)
             fmin = self.args["min f0"]
             fmax = self.args["max f0"]
             pitches_full = librosa.yin(y, fmin=fmin, fmax=fmax, sr=sr) # This changed to keyword arguments to future proof incoming Librosa changes
@@ -49,7 +60,8 @@ class MeasurePitchYinNode(VoicelabNode):
                 'Mean Pitch (Yin)': yin_mean_pitch,
                 'Median Pitch (Yin)': yin_median_pitch,
                 'Standard Deviation Pitch (Yin)': yin_standard_deviation_pitch,
-                'Pitch Values (Yin)': pitches_full.tolist()
+                'Pitch Values (Yin)': pitches_full.astype(np.float32),
+                'Pitch Times (Yin)': librosa.times_like(pitches_full, sr=sr).astype(np.float32),
             }
 
         except Exception as e:
@@ -3,16 +3,14 @@ import parselmouth
 from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
 import numpy as np
-from scipy.fftpack import fft
-from scipy.interpolate import interp1d
-from scipy.io import wavfile
+import scipy.fft
 
 ###################################################################################################
 # MEASURE DURATION NODE
 # WARIO pipeline node for measuring the duration of a voice.
 ###################################################################################################
 # ARGUMENTS
-# 'filename'   : sound path
+# 'voice'   : (signal, sampling rate) of the loaded sound
 ###################################################################################################
 # RETURNS
 # 'Subharmonic-to-Harmonic Ratio'  :Subharmonic-to-Harmonic Ratio
@@ -21,6 +19,9 @@ from scipy.io import wavfile
 
 
 class MeasureSHRPNode(VoicelabNode):
+    version = 2
+    frame_times = {"Subharmonic Pitch Values": "Subharmonic Pitch Times"}
+
     def __init__(self, *args, **kwargs):
 
         """
@@ -36,26 +37,20 @@ class MeasureSHRPNode(VoicelabNode):
 
 
 
-    def process(self, filename=None, *args, **kwargs):
-        """Returns subharmonic-to-harmonic ratio and Pitch from Subharmonics."""
+    def process(self, voice=None, *args, **kwargs):
+        """Returns subharmonic-to-harmonic ratio and Pitch from Subharmonics.
+
+        Args:
+            voice: (signal, sampling_rate) to measure, defaults to args['voice']
+        """
 
         try:
-            if filename is None:
-                filename = self.args['file_path']
-            # filename = self.args["file_path"]
-            # If it's an mp3, convert it to wav
-            if filename[-3:].lower() != "wav":
-                signal, sampling_rate = self.args['voice']
-                tmp_praat_object: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
-                # If it's stereo, convert it to mo
-                number_of_channels = call(tmp_praat_object, 'Get number of channels')
-                if number_of_channels == 2:
-                    tmp_praat_object = call(tmp_praat_object, 'Convert to mono')
-                tmp_praat_object.save("tmp.wav", "WAV")
-                filename = 'tmp.wav'
-
-
-            wav_data, wavdata_int, fps = wavread(filename)
+            if voice is None:
+                voice = self.args['voice']
+            signal, fps = voice
+            # The loaded samples are already floats between -1 and 1, as Matlab's wavread gives.
+            # Mix stereo down to mono
+            wav_data = np.mean(np.atleast_2d(signal), axis=0)
             shr, f0 = shr_pitch(wav_data, fps, datalen=200)
             mean_shr = np.nanmean(shr)
             median_shr = np.nanmedian(shr)
@@ -68,7 +63,9 @@ class MeasureSHRPNode(VoicelabNode):
                 "Subharmonic Mean Pitch": mean_f0.item(),
                 "Subharmonic Median Pitch": median_shr.item(),
                 "Subharmonic Stdev of Pitch": sd_shr.item(),
-                "Subharmonic Pitch Values": f0.tolist() # padded or truncated to 200 values
+                "Subharmonic Pitch Values": f0.astype(np.float32), # padded or truncated to 200 values
+                # shr_pitch puts the frame at time t ms at index t + 1
+                "Subharmonic Pitch Times": ((np.arange(len(f0)) - 1) / 1000).astype(np.float32),
             }
 
 
@@ -80,6 +77,7 @@ class MeasureSHRPNode(VoicelabNode):
                 "Subharmonic Median Pitch": str(e),
                 "Subharmonic Stdev of Pitch": str(e),
                 "Subharmonic Pitch Values": str(e),
+                "Subharmonic Pitch Times": str(e),
             }
 
 
@@ -90,53 +88,9 @@ SHRP - a pitch determination algorithm based on subharmonic-to-harmonic ratio.
 # Licensed under Apache v2 (see LICENSE)
 
 # imports moved to top of file import numpy as np
-# imports moved to top of file from scipy.fftpack import fft
-# imports moved to top of file from scipy.interpolate import interp1d
-# imports moved to top of file from scipy.io import wavfile
 # Comments in quotes are copied from the matlab source.
 
 
-def wavread(fn):
-    """Read in a 16-bit integer PCM WAV file for processing
-
-    Args:
-        fn - filename of WAV file [string]
-
-    Returns:
-         y_float - Audio samples in float format [NumPy vector]
-         y_int - Audio samples in int format [NumPy vector]
-        fs - Sampling frequency in Hz [integer]
-
-    Emulate the parts of the Matlab wavread function that we need.
-
-    Matlab's wavread is used by voicesauce to read in the wav files for
-    processing.  As a consequence, all the translated algorithms assume the
-    data from the wav file is in matlab form, which in this case means a double
-    precision float between -1 and 1.  The corresponding scipy function returns
-    the actual integer PCM values from the file, which range between -32768 and
-    32767.  (matlab's wavread *can* return the integers, but does not by
-    default and voicesauce uses the default).  Consequently, after reading the
-    data using scipy's io.wavfile, we convert to float by dividing each integer
-    by 32768.
-
-    Also, save the 16-bit integer data in another NumPy vector.
-
-    The input WAV file is assumed to be in 16-bit integer PCM format.
-    """
-    # For reference, I figured this out from:
-    # http://mirlab.org/jang/books/audiosignalprocessing/matlab4waveRead.asp?title=4-2%20Reading%20Wave%20Files
-    # XXX: if we need to handle 8 bit files we'll need to detect them and
-    # special case them here.
-    try:
-        fs, y = wavfile.read(fn)
-    except ValueError:
-        raise
-    if y.dtype != 'int16':
-        raise IOError('Input WAV file must be in 16-bit integer PCM format')
-
-    return y/np.float64(32768.0), y, fs
-
-
 def round_half_away_from_zero(x):
     """Rounds a number according to round half away from zero method
     Args:
@@ -230,19 +184,22 @@ def shr_pitch(wav_data, fps, window_length=None, frame_shift=1,
     start = 0
     finish = t[-1]
     increment = frame_shift
-    for k in np.arange(start, finish, increment):
-        # "try to find the closest value"
-        dabs = np.abs(t - k)
-        inx = np.argmin(dabs)
-        if dabs[inx] > frame_precision * frame_shift:
-            # "no valid value found"
-            continue
-        n = int(round(k / frame_shift)) + 1
-        if n < 0 or n >= datalen:
-            continue
-        F0[n] = f0_value[inx]
-        SHR[n] = shr_value[inx]
-        # "I eventually would like to get candidates as well"
+    k = np.arange(start, finish, increment)
+    n = np.round(k / frame_shift).astype(int) + 1
+    in_range = (n >= 0) & (n < datalen)
+    k = k[in_range]
+    n = n[in_range]
+    # "try to find the closest value": t is sorted, so the closest is on one side
+    # of where k would be inserted. Ties go to the earlier time.
+    right = np.minimum(np.searchsorted(t, k), len(t) - 1)
+    left = np.maximum(right - 1, 0)
+    inx = np.where(np.abs(t[left] - k) <= np.abs(t[right] - k), left, right)
+    inx = np.searchsorted(t, t[inx])
+    # "no valid value found" when the closest is further than the precision
+    found = np.abs(t[inx] - k) <= frame_precision * frame_shift
+    F0[n[found]] = f0_value[inx[found]]
+    SHR[n[found]] = shr_value[inx[found]]
+    # "I eventually would like to get candidates as well"
     return SHR, F0
 
 
@@ -402,79 +359,50 @@ def shrp(Y, Fs, F0MinMax=[50, 500], frame_length=40, timestep=10,
     # "--- segmentation of speech ---"
     # "position for each frame in terms of index, not time"
     curpos = np.around(f0_time / 1000 * Fs).astype(int) - 1
-    frames = toframes(Y, curpos, segmentlen, 'hamm')
-    nf, framelen = frames.shape
-    del Y
+    nf = len(curpos)
     # "--- initialize vectors for f0 time, f0 values, and SHR ---"
-    f0_value = np.zeros(nf)
-    SHR = np.zeros(nf)
     f0_time = f0_time[0:nf+1]
-    f0_candidates = np.zeros((nf, 2))
     # "--- voicing determination ---"
     if CHECK_VOICING:
         raise NotImplementedError
         #NoiseFloor=sum(frames(1,:).^2);
         #voicing=vda(frames,segmentduration/1000,NoiseFloor);
-    else:
-        voicing = np.ones(nf)
     # "--- the main loop ---"
-    curf0 = 0
-    cur_SHR = 0
-    cur_cand1 = 0
-    cur_cand2 = 0
-    for n in range(nf):
-        segment = frames[n, :]
-        if voicing[n] == 0:
-            curf0 = 0
-            cur_SHR = 0
-        else:
-            log_spectrum = get_log_spectrum(
-                segment,
-                fftlen,
-                limit,
-                logf,
-                interp_logf)
-            peak_index, cur_SHR, shshift, all_peak_indices = compute_shr(
-                log_spectrum,
-                min_bin,
-                startpos,
-                endpos,
-                lowerbound,
-                upperbound,
-                N,
-                shift_units,
-                SHR_Threshold)
-            # "-1 indicates a possibly unvoiced frame, if CHECK_VOICING, set f0
-            # to 0, otherwise uses previous value"
-            if peak_index == -1:
-                if CHECK_VOICING: # pragma: no cover
-                    curf0 = 0
-                    cur_cand1 = 0
-                    cur_cand2 = 0
-            else:
-                curf0 = newfre[peak_index] * 2
-                if curf0 > maxf0:
-                    curf0 = curf0 / 2
-                if len(all_peak_indices) == 1:
-                    cur_cand1 = 0
-                    cur_cand2 = newfre[all_peak_indices[0]] * 2
-                else:
-                    cur_cand1 = newfre[all_peak_indices[0]] * 2
-                    cur_cand2 = newfre[all_peak_indices[1]] * 2
-                if cur_cand1 > maxf0:
-                    cur_cand1 = cur_cand1 / 2
-                if cur_cand2 > maxf0:
-                    cur_cand2 = cur_cand2 / 2
-                if CHECK_VOICING: # pragma: no cover
-                    raise NotImplementedError
-                    #voicing(n)=postvda(segment,curf0,Fs);
-                    #if (voicing(n)==0)
-                    #    curf0=0;
-                    #end
-        f0_value[n] = curf0
-        SHR[n] = cur_SHR
-        f0_candidates[n, 0] = cur_cand1
-        f0_candidates[n, 1] = cur_cand2
+    # Rather than one frame at a time, frames are analysed in blocks: one FFT, one interpolation
+    # and one product with the shift weights per block. Blocks keep memory bounded on long files.
+    interpolation = log_interpolation(logf, interp_logf)
+    shifts = shift_weights(
+        interp_len, startpos, endpos, lowerbound, upperbound, N, shift_units)
+    peak_index = np.empty(nf, dtype=int)
+    SHR = np.empty(nf)
+    candidates = np.empty((nf, 2), dtype=int)
+    for block in range(0, nf, FRAMES_PER_BLOCK):
+        block_pos = curpos[block:block + FRAMES_PER_BLOCK]
+        frames = toframes(Y, block_pos, segmentlen, 'hamm')
+        log_spectra = get_log_spectrum(frames, fftlen, limit, interpolation)
+        (peak_index[block:block + len(block_pos)],
+         SHR[block:block + len(block_pos)],
+         candidates[block:block + len(block_pos)]) = compute_shr(
+            log_spectra,
+            min_bin,
+            shifts,
+            SHR_Threshold)
+    del Y
+    # "-1 indicates a possibly unvoiced frame, if CHECK_VOICING, set f0
+    # to 0, otherwise uses previous value"
+    voiced = peak_index != -1
+    f0_value = newfre[np.where(voiced, peak_index, 0)] * 2
+    f0_value = np.where(f0_value > maxf0, f0_value / 2, f0_value)
+    # a frame with a single candidate has no lower (subharmonic) candidate
+    f0_candidates = np.where(
+        candidates >= 0, newfre[np.maximum(candidates, 0)] * 2, 0.0)
+    f0_candidates = np.where(
+        f0_candidates > maxf0, f0_candidates / 2, f0_candidates)
+    # carry the last voiced frame's values through unvoiced frames, or 0 before the first
+    last_voiced = np.maximum.accumulate(np.where(voiced, np.arange(nf), -1))
+    f0_value = np.where(last_voiced >= 0, f0_value[last_voiced], 0.0)
+    f0_candidates = np.where(
+        (last_voiced >= 0)[:, np.newaxis], f0_candidates[last_voiced], 0.0)
     # "--- post-processing ---"
     if med_smooth > 0:
         raise NotImplementedError
@@ -483,83 +411,117 @@ def shrp(Y, Fs, F0MinMax=[50, 500], frame_length=40, timestep=10,
     return f0_time, f0_value, SHR, f0_candidates
 
 
+# Number of frames analysed together by shrp, small enough for a block to stay in cache
+FRAMES_PER_BLOCK = 128
+
+
 # ---- GetLogSpectrum -----
 
-def get_log_spectrum(segment, fftlen, limit, logf, interp_logf):
-    spectra = fft(segment, fftlen)
+def log_interpolation(logf, interp_logf):
+    """Return the bins and weights to linearly interpolate a spectrum sampled at
+    logf onto interp_logf, matching scipy's interp1d."""
+    hi = np.clip(np.searchsorted(logf, interp_logf), 1, len(logf) - 1)
+    lo = hi - 1
+    weight = (interp_logf - logf[lo]) / (logf[hi] - logf[lo])
+    return lo, hi, weight
+
+
+def get_log_spectrum(segments, fftlen, limit, interpolation):
+    """Return the amplitude spectrum of each segment (one per row) on the
+    interpolated log frequency scale."""
+    spectra = scipy.fft.rfft(segments, fftlen, axis=1)
     # "fftlen is always even here."
-    amplitude = np.abs(spectra[0:fftlen//2+1])
     # "ignore the zero frequency component"
-    amplitude = amplitude[1:limit+2]
-    interp_amplitude = interp1d(logf, amplitude)(interp_logf)
-    interp_amplitude = interp_amplitude - min(interp_amplitude)
+    amplitude = np.abs(spectra[:, 1:limit+2])
+    lo, hi, weight = interpolation
+    interp_amplitude = amplitude[:, lo] + (amplitude[:, hi] - amplitude[:, lo]) * weight
+    interp_amplitude = interp_amplitude - np.min(interp_amplitude, axis=1, keepdims=True)
     return interp_amplitude
 
 
 # ---- ComputeSHR -----
 
-def compute_shr(log_spectrum, min_bin, startpos, endpos, lowerbound, upperbound,
-                n, shift_units, shr_threshold):
+def shift_weights(len_spectrum, startpos, endpos, lowerbound, upperbound, n,
+                  shift_units):
+    """Return the weights that sum the shifted spectra of a frame into the odd
+    minus even sums compute_shr needs, and the bounds of the search region.
+
+       "each row corresponds to a shift version" of the spectrum. Row i holds
+       the spectrum starting at startpos[i-1], the first row is the spectrum
+       itself. Only the columns from shift_units on are used, and peaks are only
+       searched for between lowerbound and upperbound, so rather than building
+       the shift matrix, the bin of the spectrum each row puts in each column of
+       the search region is found once. Odd rows add to the column and even rows
+       subtract from it. The layout is the same for every frame, so this is only
+       done once per analysis.
+    """
+    offsets = np.concatenate(([0], shift_units - startpos))
+    lengths = np.concatenate(
+        ([len_spectrum], np.minimum(endpos - startpos + 1, len_spectrum)))
+    lengths = lengths - offsets
+    upperbound = min(upperbound, len_spectrum - 1)
+    width = upperbound - lowerbound + 1
+    # odd and even are reversed from matlab due to different origin
+    rows = np.arange(n)
+    signs = np.where(rows % 2 == 0, -1.0, 1.0)
+    # the last row is never added to the odd sum
+    signs[(rows == n - 1) & (rows % 2 == 1)] = 0
+    columns = np.arange(width)
+    bins = offsets[:n, np.newaxis] + lowerbound + columns
+    used = (columns < (lengths[:n, np.newaxis] - lowerbound)) & (signs[:, np.newaxis] != 0)
+    weights = np.zeros((len_spectrum, width))
+    np.add.at(weights, (bins[used], np.broadcast_to(columns, bins.shape)[used]),
+              np.broadcast_to(signs[:, np.newaxis], bins.shape)[used])
+    return weights, lowerbound, upperbound
+
+
+def compute_shr(log_spectra, min_bin, shifts, shr_threshold):
     """ "compute subharmonic-to-harmonic ratio for a short-term signal"
 
-       returns peak_index = -1 if frame appears to be unvoiced.
+       Works on a block of log spectra, one frame per row, with the shift
+       weights and search region from shift_weights. Returns the peak index,
+       SHR and the two candidate indices of each frame. peak_index is -1 if the
+       frame appears to be unvoiced, and the first candidate is -1 if there is
+       only one.
     """
-    len_spectrum = len(log_spectrum)
-    total_len = shift_units + len_spectrum
-    # "initialize the subharmonic shift matrix; each row corresponds to a shift
-    # version"
-    shshift = np.zeros((n, total_len))
-    # "place the spectrum at the right end of the first row"
-    shshift[0, total_len-len_spectrum:total_len] = log_spectrum
-    # "note that here startpos and endpos has n-1 rows, so we start from 2"
-    # "the first row in shshift is the original log spectrum"
-    # Actually we start from 1 since python is zero-origined.
-    for i in range(1, n):
-        # "store each shifted sequence"
-        shshift[i, startpos[i-1]:endpos[i-1]+1] = (
-            log_spectrum[:endpos[i-1]-startpos[i-1]+1])
-    # "we don't need the stuff smaller than shift_units"
-    shshift = shshift[:, shift_units:total_len]
-    # odd and even are reversed from matlab due to different origin
-    shseven = sum(shshift[0:n:2, :], 0)
-    shsodd = sum(shshift[1:n-1:2, :], 0)
-    difference = shsodd - shseven
+    num_frames = log_spectra.shape[0]
+    weights, lowerbound, upperbound = shifts
+    width = upperbound - lowerbound + 1
+    # the odd sum minus the even sum of every shifted spectrum, for all the frames at once
+    difference = log_spectra @ weights
     # "peak picking process"
-    shr = 0
     # "only find two maxima"
-    mag, index = two_max(difference, lowerbound, upperbound, min_bin)
+    mag, index = two_max(difference, 0, width - 1, min_bin)
+    index = index + lowerbound
     # "first mag is always the maximum, the second, if there is, is the second
     # max"
-    num_pitch_candidates = len(mag)
-    if num_pitch_candidates == 1:
-        # "this is possible, mainly due to we put a constraint on search region,
-        # i.e., f0 range"
-        if mag <= 0:
-            # "this must be an unvoiced frame"
-            peak_index = -1
-            return peak_index, shr, shshift, index
-        peak_index = index
-        shr = 0
-    else:
-        shr = (mag[0]-mag[1]) / (mag[0]+mag[1])
-        if shr <= shr_threshold:
-            # "subharmonic is weak, so favor the harmonic"
-            peak_index = index[1]
-        else:
-            # "subharmonic is strong, so favor the subharmonic as F0"
-            peak_index = index[0]
-    return peak_index, shr, shshift, index
+    single = np.isnan(mag[:, 1])
+    # "this is possible, mainly due to we put a constraint on search region,
+    # i.e., f0 range"
+    # "this must be an unvoiced frame" when the single maximum is not positive
+    unvoiced = single & (mag[:, 0] <= 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shr = np.where(single, 0.0, (mag[:, 0]-mag[:, 1]) / (mag[:, 0]+mag[:, 1]))
+    # "subharmonic is weak, so favor the harmonic", "subharmonic is strong, so
+    # favor the subharmonic as F0"
+    peak_index = np.where(single | (shr > shr_threshold), index[:, 0], index[:, 1])
+    peak_index[unvoiced] = -1
+    candidates = np.where(single[:, np.newaxis],
+                          np.stack([np.full(num_frames, -1), index[:, 0]], axis=1),
+                          index)
+    return peak_index, shr, candidates
 
 
 # ---- twomax -----
 
 def two_max(x, lowerbound, upperbound, unit_len):
-    """Return up to two successive maximum peaks and their indices in x.
+    """Return up to two successive maximum peaks and their indices in each row of x.
 
-    Return the magnitudes of the peaks and the indices as two lists.
+    Return the magnitudes of the peaks and the indices as two columns, with a
+    NaN magnitude where a row has only one peak.
     If the first maximum is less than zero, just return it.  Otherwise
     look to the right of the first maximum, and if there is a second
-    maximum that is greater than zero, add that to the returned lists.
+    maximum that is greater than zero, add that to the returned peaks.
 
     lowerbound and upperbound comprise a closed interval, unlike the
     normal python half closed interval.  [RDM XXX: fix this?]
@@ -568,25 +530,33 @@ def two_max(x, lowerbound, upperbound, unit_len):
     # XXX The above description is not completely accurate: there's a window to
     # the search for the second peak, but I don't understand the goal well
     # enough to describe it better, and the original comments are less precise.
-    max_index = min(upperbound, len(x)-1)
+    num_rows, length = x.shape
+    rows = np.arange(num_rows)
+    max_index = min(upperbound, length-1)
     # "find the maximum value"
-    mag = np.array([np.amax(x[lowerbound:upperbound+1])])
-    index = np.where(x == mag)[0]
-    if mag < 0:
-        return mag, index
+    mag = np.full((num_rows, 2), np.nan)
+    index = np.zeros((num_rows, 2), dtype=int)
+    mag[:, 0] = np.amax(x[:, lowerbound:upperbound+1], axis=1)
+    index[:, 0] = np.argmax(x == mag[:, 0:1], axis=1)
     harmonics = 2
     limit = 0.0625  # "1/8 octave"
-    startpos = index[0] + int(round(np.log2(harmonics-limit)/unit_len))
-    if startpos <= max_index:
-        # "for example, 100hz-200hz is one octave, 200hz-250hz is 1/4octave"
-        endpos = index[0] + int(round(np.log2(harmonics + limit)/unit_len))
-        endpos = min(max_index, endpos)
+    startpos = index[:, 0] + int(round(np.log2(harmonics-limit)/unit_len))
+    # "for example, 100hz-200hz is one octave, 200hz-250hz is 1/4octave"
+    endpos = np.minimum(
+        max_index, index[:, 0] + int(round(np.log2(harmonics + limit)/unit_len)))
+    search = (mag[:, 0] >= 0) & (startpos <= max_index)
+    if np.any(search):
         # "find the maximum value at right side of last maximum"
-        mag2 = np.amax(x[startpos:endpos+1])
-        index2 = np.where(x[startpos:] == mag2)[0][0] + startpos
-        if mag2 > 0:
-            mag = np.append(mag, mag2)
-            index = np.append(index, index2)
+        width = int(np.max(endpos[search] - startpos[search])) + 1
+        window_index = startpos[search, np.newaxis] + np.arange(max(width, 1))
+        in_window = window_index <= endpos[search, np.newaxis]
+        window_values = np.where(
+            in_window, x[rows[search, np.newaxis], np.minimum(window_index, length-1)], -np.inf)
+        mag2 = np.amax(window_values, axis=1)
+        index2 = startpos[search] + np.argmax(window_values == mag2[:, np.newaxis], axis=1)
+        second = mag2 > 0
+        mag[rows[search][second], 1] = mag2[second]
+        index[rows[search][second], 1] = index2[second]
     return mag, index
 
 
@@ -608,7 +578,6 @@ def ethreshold(frames):
 
 def toframes(samples, curpos, segmentlen, window_type):
     last_index = len(samples) - 1
-    num_frames = len(curpos)
     start = curpos - int(round(segmentlen/2))
     offset = np.arange(segmentlen)
     index_start = np.nonzero(start < 1)[0]
@@ -617,10 +586,9 @@ def toframes(samples, curpos, segmentlen, window_type):
     index = np.nonzero(endpos > last_index)[0]
     endpos[index] = last_index
     start[index] = last_index + 1 - segmentlen
-    frames = samples[(np.tile(np.expand_dims(start, 1),
-                     (1, segmentlen)) + np.tile(offset, (num_frames, 1)))]
-    window_vector = np.tile(window(segmentlen, window_type), (num_frames, 1))
-    return np.multiply(frames, window_vector)
+    frames = samples[start[:, np.newaxis] + offset]
+    frames *= window(segmentlen, window_type)
+    return frames
 
 
 # ---- voicing ----
@@ -47,8 +47,7 @@ class MeasureSNRNode(VoicelabNode):
             tier1_label = self.args["tier1_label"]
             tier2_label = self.args["tier2_label"]
             file_path: str = self.args["file_path"]
-            signal, sampling_rate = self.args['voice']
-            voice: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+            voice: parselmouth.Sound = self.context.sound
             #voice = self.args["voice"]
             start_time = 0
             end_time = 0  # Zero start and end time means select all in Praat
@@ -56,7 +55,7 @@ class MeasureSNRNode(VoicelabNode):
             signal = call(
                 voice, "Get absolute extremum", start_time, end_time, interpolation
             )
-            intensity = voice.to_intensity()
+            intensity = self.context.intensity()
 
             text_grid = call(
                 intensity,
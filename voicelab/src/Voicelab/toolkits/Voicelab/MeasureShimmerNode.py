@@ -1,7 +1,4 @@
-import pandas as pd
 import numpy as np
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 
 from ...pipeline.Node import Node
 import parselmouth
@@ -43,6 +40,11 @@ class MeasureShimmerNode(VoicelabNode):
             self.state["apq11_shimmer"]: list
             self.state["dda_shimmer"]: list
     """
+    # Collects measurements for end(), so it always processes
+    cache_results = False
+    # end() adds what it finds across all the files to each file's results
+    uses_results = True
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -90,15 +92,12 @@ class MeasureShimmerNode(VoicelabNode):
         """
 
         file_path: str = self.args["file_path"]
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+        sound: parselmouth.Sound = self.context.sound
         try:
             pitch_floor = self.pitch_floor(file_path)
             pitch_ceiling = self.pitch_ceiling(file_path)
 
-            point_process: object = call(
-                sound, "To PointProcess (periodic, cc)", pitch_floor, pitch_ceiling
-            )
+            point_process: object = self.context.point_process(pitch_floor, pitch_ceiling)
 
             local_shimmer: float = call(
                 [sound, point_process],
@@ -192,6 +191,10 @@ class MeasureShimmerNode(VoicelabNode):
             }
 
     def shimmer_pca(self):
+        import pandas as pd
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+
         try:
             local_shimmer = self.state["local_shimmer"]
             localdb_shimmer = self.state["localdb_shimmer"]
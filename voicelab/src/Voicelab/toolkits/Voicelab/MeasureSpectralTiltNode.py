@@ -1,17 +1,25 @@
-import math
+import numpy as np
 import parselmouth
 
 from ...pipeline.Node import Node
 from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
 
+# Frames of the whole file transformed at a time, so long files don't need a spectrum of every
+# frame in memory at once
+FRAMES_PER_BLOCK = 1024
+
 
 class MeasureSpectralTiltNode(VoicelabNode):
     """Measure Spectral Tilt by returning the slope of zero-intercept linear regression of the power spectrum.
 
     :argument window_length_in_millisecs: Window length in milliseconds
     :type window_length_in_millisecs: str
+    :argument method: Measure one window at the middle of the file, or every window of the whole file
+    :type method: str
     """
+    frame_times = {"Spectral Tilt (frames)": "Spectral Tilt Times"}
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -22,22 +30,36 @@ class MeasureSpectralTiltNode(VoicelabNode):
 
         self.args = {
             "window_length_in_millisecs": ("32", ["32", "64", "128", "256"]),
+            "method": ("Midpoint", ["Midpoint", "Whole file"]),
         }
 
     def process(self):
         """run the Spectral tilt measurement
 
-            :return {"Spectral Tilt": spectral_tilt}
-            :rtype dict[str|Union[float, str]]
+            :return {"Spectral Tilt": spectral_tilt}, and with the whole file method the median
+                tilt, the tilt of each window and the time of each window
+            :rtype dict[str|Union[float, str, np.ndarray]]
             """
         try:
             "Measure spectral tilt"
-            file_path: str = self.args["file_path"]
-            signal, sampling_rate = self.args['voice']
-            sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
-            window_length_in_millisecs = int(self.args["window_length_in_millisecs"][0])
-            print(f'{window_length_in_millisecs=}')
-            window_length = window_length_in_millisecs / 1000
+            sound: parselmouth.Sound = self.context.sound
+            window_length_in_millisecs = self.args["window_length_in_millisecs"]
+            if isinstance(window_length_in_millisecs, tuple):
+                window_length_in_millisecs = window_length_in_millisecs[0]
+            method = self.args["method"]
+            if isinstance(method, tuple):
+                method = method[0]
+            window_length = int(window_length_in_millisecs) / 1000
+
+            if method == "Whole file":
+                times, tilts = self.spectral_tilt_per_frame(sound, window_length)
+                return {
+                    "Spectral Tilt": float(np.nanmean(tilts)),
+                    "Spectral Tilt Median": float(np.nanmedian(tilts)),
+                    "Spectral Tilt (frames)": tilts.astype(np.float32),
+                    "Spectral Tilt Times": times.astype(np.float32),
+                }
+
             # Compute begin and end times, set window
             end = sound.duration
             midpoint = end / 2
@@ -46,48 +68,80 @@ class MeasureSpectralTiltNode(VoicelabNode):
             endtime = midpoint + (window_length / 2)
             part_to_measure = sound.extract_part(begintime, endtime)
             spectrum = part_to_measure.to_spectrum()
-            total_bins = spectrum.get_number_of_bins()
-            dBValue = []
-            bins = []
-
-            # convert spectral values to dB
-            for bin in range(total_bins):
-                bin_number = bin + 1
-                realValue = spectrum.get_real_value_in_bin(bin_number)
-                imagValue = spectrum.get_imaginary_value_in_bin(bin_number)
-                rmsPower = math.sqrt((realValue ** 2) + (imagValue ** 2))
-                db = 20 * (math.log10(rmsPower / 0.0002))
-                dBValue.append(db)
-                bin_number += 1
-                bins.append(bin)
-
-            # find maximum dB value, for rescaling purposes
-            maxdB = max(dBValue)
-            mindB = min(dBValue)  # this is wrong in Owren's script, where mindB = 0
-            rangedB = maxdB - mindB
-
-            # stretch the spectrum to a normalized range that matches the number of frequency values
-            scalingConstant = (total_bins - 1) / rangedB
-            scaled_dB_values = []
-            for value in dBValue:
-                scaled_dBvalue = value + abs(mindB)
-                scaled_dBvalue *= scalingConstant
-                scaled_dB_values.append(scaled_dBvalue)
-
-            # find slope
-            sumXX = 0
-            sumXY = 0
-            sumX = sum(bins)
-            sumY = sum(scaled_dB_values)
-
-            for bin in bins:
-                currentX = bin
-                sumXX += currentX ** 2
-                sumXY += currentX * scaled_dB_values[bin]
-
-            sXX = sumXX - ((sumX * sumX) / len(bins))
-            sXY = sumXY - ((sumX * sumY) / len(bins))
-            spectral_tilt = sXY / sXX
-            return {"Spectral Tilt": spectral_tilt}
+            # real and imaginary parts of every bin, in one array
+            real_values, imaginary_values = spectrum.values
+            magnitudes = np.sqrt(real_values ** 2 + imaginary_values ** 2)
+            if np.any(magnitudes <= 0):
+                raise ValueError("math domain error")
+            spectral_tilt = self.spectral_tilt(magnitudes[np.newaxis, :])[0]
+            return {"Spectral Tilt": float(spectral_tilt)}
         except Exception as e:
             return {"Spectral Tilt": str(e)}
+
+    def spectral_tilt(self, magnitudes):
+        """Spectral tilt of each row of spectrum magnitudes
+
+        Each spectrum is converted to dB, stretched so its range of dB matches its number of bins,
+        and the slope of the least squares line through it, against the bin number, is the tilt.
+
+        :param magnitudes: magnitude of each bin, one spectrum per row
+        :type magnitudes: np.ndarray
+
+        :return: the tilt of each spectrum
+        :rtype: np.ndarray
+        """
+        total_bins = magnitudes.shape[1]
+        # convert spectral values to dB
+        db_values = 20 * np.log10(magnitudes / 0.0002)
+
+        # find maximum dB value, for rescaling purposes
+        max_db = db_values.max(axis=1, keepdims=True)
+        min_db = db_values.min(axis=1, keepdims=True)  # this is wrong in Owren's script, where mindB = 0
+        range_db = max_db - min_db
+
+        # stretch the spectrum to a normalized range that matches the number of frequency values
+        scaling_constant = (total_bins - 1) / range_db
+        scaled_db_values = (db_values + np.abs(min_db)) * scaling_constant
+
+        # find slope
+        bins = np.arange(total_bins)
+        sum_x = bins.sum()
+        sum_xx = np.sum(bins ** 2)
+        sum_y = scaled_db_values.sum(axis=1)
+        sum_xy = scaled_db_values @ bins
+        s_xx = sum_xx - sum_x * sum_x / total_bins
+        s_xy = sum_xy - sum_x * sum_y / total_bins
+        return s_xy / s_xx
+
+    def spectral_tilt_per_frame(self, sound, window_length):
+        """Spectral tilt of every window of the sound, half overlapping, the same way as of the
+        midpoint window: with a rectangular window, zero padded to a power of two
+
+        :param sound: the sound to measure
+        :type sound: parselmouth.Sound
+        :param window_length: window length in seconds
+        :type window_length: float
+
+        :return: the time of the middle of each window and its tilt, NaN for windows with bins of no
+            energy, such as digital silence
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        samples = sound.values.mean(axis=0)
+        sampling_rate = sound.sampling_frequency
+        frame_length = int(round(window_length * sampling_rate))
+        hop = max(frame_length // 2, 1)
+        if len(samples) < frame_length:
+            raise ValueError("The sound is shorter than the window")
+        fft_length = 1 << int(np.ceil(np.log2(frame_length)))
+        frames = np.lib.stride_tricks.sliding_window_view(samples, frame_length)[::hop]
+        times = sound.xmin + (np.arange(len(frames)) * hop + frame_length / 2) / sampling_rate
+
+        tilts = np.empty(len(frames))
+        for start in range(0, len(frames), FRAMES_PER_BLOCK):
+            block = frames[start:start + FRAMES_PER_BLOCK]
+            # scaled like Praat's spectrum, which doesn't change the tilt but keeps the dB the same
+            magnitudes = np.abs(np.fft.rfft(block, n=fft_length, axis=1)) / sampling_rate
+            silent = np.any(magnitudes <= 0, axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                tilts[start:start + len(block)] = np.where(silent, np.nan, self.spectral_tilt(magnitudes))
+        return times, tilts
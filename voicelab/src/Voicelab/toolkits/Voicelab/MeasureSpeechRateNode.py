@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import math
 import numpy as np
 
 from typing import Union
@@ -128,16 +127,12 @@ class MeasureSpeechRateNode(VoicelabNode):
         """
         try:
             file_path: str = self.args["file_path"]
-            signal, sampling_rate = self.args['voice']
-            sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+            sound: parselmouth.Sound = self.context.sound
             snr = call(sound.to_harmonicity(), "Get mean", 0, 0)
             if snr < 60:
                 self.args["mindip"] = 2
             originaldur = sound.duration
-            intensity = sound.to_intensity(50)
-            start = call(intensity, "Get time from frame number", 1)
-            nframes = call(intensity, "Get number of frames")
-            end = call(intensity, "Get time from frame number", nframes)
+            intensity = self.context.intensity(50)
             min_intensity = call(intensity, "Get minimum", 0, 0, "Parabolic")
             max_intensity = call(intensity, "Get maximum", 0, 0, "Parabolic")
 
@@ -164,22 +159,18 @@ class MeasureSpeechRateNode(VoicelabNode):
             silencetier = call(textgrid, "Extract tier", 1)
             silencetable = call(silencetier, "Down to TableOfReal", "sounding")
             npauses = call(silencetable, "Get number of rows")
-            speakingtot = 0
-            for ipause in range(npauses):
-                pause = ipause + 1
-                beginsound = call(silencetable, "Get value", pause, 1)
-                endsound = call(silencetable, "Get value", pause, 2)
-                speakingdur = endsound - beginsound
-                speakingtot += speakingdur
+            # start and end of each sounding interval, read at once rather than a call per value
+            if npauses > 0:
+                sounding = call(silencetable, "To Matrix").values
+            else:
+                sounding = np.zeros((0, 2))
+            speakingtot = float(np.sum(sounding[:, 1] - sounding[:, 0]))
 
             intensity_matrix = call(intensity, "Down to Matrix")
             sound_from_intensity_matrix = call(intensity_matrix, "To Sound (slice)", 1)
             # use total duration, not end time, to find out duration of intdur (intensity_duration)
             # in order to allow nonzero starting times.
             intensity_duration = call(sound_from_intensity_matrix, "Get total duration")
-            intensity_max = call(
-                sound_from_intensity_matrix, "Get maximum", 0, 0, "Parabolic"
-            )
             point_process = call(
                 sound_from_intensity_matrix,
                 "To PointProcess (extrema)",
@@ -190,72 +181,40 @@ class MeasureSpeechRateNode(VoicelabNode):
             )
             # estimate peak positions (all peaks)
             numpeaks = call(point_process, "Get number of points")
-            t = [
-                call(point_process, "Get time from index", i + 1)
-                for i in range(numpeaks)
-            ]
-
-            # fill array with intensity values
-            timepeaks = []
-            peakcount = 0
-            intensities = []
-            for i in range(numpeaks):
-                value = call(
-                    sound_from_intensity_matrix, "Get value at time", t[i], "Cubic"
-                )
-                if value > threshold:
-                    peakcount += 1
-                    intensities.append(value)
-                    timepeaks.append(t[i])
+            if numpeaks > 0:
+                t = call(point_process, "To Matrix").values[0]
+            else:
+                t = np.zeros(0)
+
+            # intensity at the peaks, from the intensity contour taken out once
+            intensity_values = intensity.values[0]
+            values = self.values_at_times_cubic(intensity_values, intensity.x1, intensity.dx, t)
+            above = values > threshold
+            timepeaks = t[above]
+            intensities = values[above]
+            peakcount = len(timepeaks)
+            if peakcount == 0:
+                raise ValueError("No intensity peaks above the silence threshold")
 
             # fill array with valid peaks: only intensity values if preceding
-            # dip in intensity is greater than self.args['mindip']
-            validpeakcount = 0
-            currenttime = timepeaks[0]
-            currentint = intensities[0]
-            validtime = []
-
-            for p in range(peakcount - 1):
-                following = p + 1
-                followingtime = timepeaks[p + 1]
-                dip = call(
-                    intensity, "Get minimum", currenttime, timepeaks[p + 1], "None"
-                )
-                diffint = abs(currentint - dip)
-                if diffint > self.args["mindip"]:
-                    validpeakcount += 1
-                    validtime.append(timepeaks[p])
-                currenttime = timepeaks[following]
-                currentint = call(
-                    intensity, "Get value at time", timepeaks[following], "Cubic"
-                )
+            # dip in intensity is greater than self.args['mindip']. The dip before each peak is the
+            # lowest frame from the peak to the next one, the last peak is never counted
+            dips = self.minima_between_times(intensity_values, intensity.x1, intensity.dx, timepeaks[:-1], timepeaks[1:])
+            diffint = np.abs(intensities[:-1] - dips)
+            validtime = timepeaks[:-1][diffint > self.args["mindip"]]
 
             # Look for only voiced parts
             pitch = sound.to_pitch_ac(
                 0.02, 30, 4, False, 0.03, 0.25, 0.01, 0.35, 0.25, 450
             )
-            voicedcount: int = 0
-            voicedpeak = []
-
-            for time in range(validpeakcount):
-                querytime = validtime[time]
-                whichinterval = call(textgrid, "Get interval at time", 1, querytime)
-                whichlabel = call(textgrid, "Get label of interval", 1, whichinterval)
-                value = pitch.get_value_at_time(querytime)
-                if not math.isnan(value):
-                    if whichlabel == "sounding":
-                        voicedcount += 1
-                        voicedpeak.append(validtime[time])
-
-            # calculate time correction due to shift in time for Sound object versus
-            # intensity object
-            timecorrection = originaldur / intensity_duration
-
-            # Insert voiced peaks in TextGrid
-            call(textgrid, "Insert point tier", 1, "syllables")
-            for i in range(len(voicedpeak)):
-                position = voicedpeak[i] * timecorrection
-                call(textgrid, "Insert point", 1, position, "")
+            frequencies = pitch.selected_array["frequency"]
+            frequencies = np.where((frequencies > 0) & (frequencies < pitch.ceiling), frequencies, np.nan)
+            voiced = ~np.isnan(self.values_at_times(frequencies, pitch.x1, pitch.dx, validtime))
+
+            # whether each peak is in a sounding interval of the TextGrid
+            interval = np.searchsorted(sounding[:, 0], validtime, side="right") - 1
+            in_sounding = (interval >= 0) & (validtime < sounding[np.maximum(interval, 0), 1])
+            voicedcount: int = int(np.count_nonzero(voiced & in_sounding))
 
             # return results
             speakingrate = voicedcount / originaldur
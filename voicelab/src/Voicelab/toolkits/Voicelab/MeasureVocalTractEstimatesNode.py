@@ -1,15 +1,11 @@
 from __future__ import annotations
 
-import sklearn.decomposition
-
 from ...pipeline.Node import Node
 from parselmouth.praat import call
 from .VoicelabNode import VoicelabNode
 from .MeasureFormantPositionsNode import MeasureFormantPositionsNode
 from typing import Union
-import pandas as pd
 import numpy as np
-from sklearn.decomposition import PCA
 
 
 
@@ -41,6 +37,11 @@ class MeasureVocalTractEstimatesNode(VoicelabNode):
     self.state: dict
         Dictionary of state variables passed to the node. This includes the mean formants measured by MeasureFormantsNode.
     """
+    # Collects measurements for end(), so it always processes
+    cache_results = False
+    # end() adds what it finds across all the files to each file's results
+    uses_results = True
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -342,6 +343,8 @@ class MeasureVocalTractEstimatesNode(VoicelabNode):
         :return: THe PCA object
         :
         """
+        import pandas as pd
+        from sklearn.decomposition import PCA
 
         pca_dataframe: pd.DataFrame = pd.DataFrame(
             {
@@ -26,6 +26,9 @@ class ResampleSoundsNode(VoicelabNode):
         - `<https://www.fon.hum.uva.nl/praat/manual/Sound__Resample___.html>`_
 
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
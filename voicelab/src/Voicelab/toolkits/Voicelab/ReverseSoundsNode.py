@@ -8,6 +8,8 @@ from typing import Union
 
 class ReverseSoundsNode(VoicelabNode):
     """A Class to reverse voice file temporally."""
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -28,6 +28,8 @@ class RotateSpectrumNode(VoicelabNode):
             self.process():
                 Rotates the spectrum of the voice file.
         """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
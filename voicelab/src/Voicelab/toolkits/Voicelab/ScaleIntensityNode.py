@@ -23,6 +23,9 @@ class ScaleIntensityNode(VoicelabNode):
         self.args['method']: str, default='RMS (dB)'
             Choose between RMS and peak.
     """
+    # Makes a new sound from the one it is given, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -4,11 +4,9 @@ from typing import Union
 
 from ...pipeline.Node import Node
 import numpy as np
-import seaborn as sns
 import os
 import parselmouth
 from parselmouth.praat import call
-import matplotlib.pyplot as plt
 
 from ...toolkits.Voicelab.VoicelabNode import VoicelabNode
 # from Voicelab.VoicelabGUI.SpectrumPlotWindow import SpectrumPlotWindow
@@ -26,6 +24,9 @@ class VisualizeSpectrumNode(VoicelabNode):
         :type self.args['Plot LPC Curve']: bool
 
     """
+    # Draws figures, so it always processes
+    cache_results = False
+
     def __init__(self, *args, **kwargs):
         """
         Args:
@@ -42,21 +43,24 @@ class VisualizeSpectrumNode(VoicelabNode):
 ###############################################################
 
     def process(self):
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+        from matplotlib.figure import Figure
+
+        sound: parselmouth.Sound = self.context.sound
         max_freq = self.args["Max Frequency"]
 
-        spectrum = sound.to_spectrum()
+        spectrum = self.context.spectrum
         spectrum_values = spectrum.values[0,:] + 1j * spectrum.values[1,:]
         power_spectral_density = 10 * np.log10(2 * abs(spectrum_values)**2 * spectrum.dx / 4e-10)
         frequencies = np.array([spectrum.get_frequency_from_bin_number(bin + 1) for bin in range(spectrum.get_number_of_bins())])
-        # Create subplots so we can overlay the plots
-        fig, ax = plt.subplots()
+        # Create subplots so we can overlay the plots. Figures are drawn without pyplot, so
+        # processing can run off the GUI thread
+        fig = Figure()
+        ax = fig.subplots()
 
         # First plot the spectrum as we do normally
         ax.plot(frequencies, power_spectral_density, color='black', linewidth=0.25)
-        plt.xlim(xmin=-4e-10, xmax=5500)
-        plt.ylim(ymin=0, ymax=np.nanmax(power_spectral_density))
+        ax.set_xlim(xmin=-4e-10, xmax=5500)
+        ax.set_ylim(ymin=0, ymax=np.nanmax(power_spectral_density))
         ax.set_xlabel("Frequency bin (Hz)")
         ax.set_ylabel("Amplitude (dB) / Frequency(Hz)")
 
@@ -96,5 +100,4 @@ class VisualizeSpectrumNode(VoicelabNode):
             except Exception as e:
                 str(e)
 
-            plt.close(fig)
             return {"spectrum": fig}
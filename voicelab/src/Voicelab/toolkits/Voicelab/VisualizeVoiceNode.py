@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
 
 import parselmouth
 from parselmouth.praat import call
@@ -38,6 +36,8 @@ class VisualizeVoiceNode(VoicelabNode):
     self.fontsize: int, default=16
         The font size for text in the plot
     """
+    # Draws figures, so it always processes
+    cache_results = False
 
     def __init__(self, *args, **kwargs):
         """
@@ -84,10 +84,13 @@ class VisualizeVoiceNode(VoicelabNode):
         :return: dict of the matplotlib figure object
         :rtype: dict of str | union[plt.figure, str]
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.figure import Figure
+
         file_path: str = self.args['file_path']
-        #voice: parselmouth.Sound = parselmouth.Sound(file_path)
-        signal, sampling_rate = self.args['voice']
-        voice: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
+        voice: parselmouth.Sound = self.context.sound
+        # the same Intensity as Measure Intensity's defaults, shared with the other nodes
+        intensity: parselmouth.Intensity = self.context.intensity()
         window_length: float = self.args["window_length"]
         colour_map: Union[str, tuple] = self.args["colour_map"]
         plot_intensity: bool = self.args["Plot Intensity"]
@@ -95,7 +98,8 @@ class VisualizeVoiceNode(VoicelabNode):
         plot_pitch: bool = self.args["Plot Pitch"]
 
         pad_distance: int = 10
-        fig: plt.Figure = plt.figure()
+        # Figures are drawn without pyplot, so processing can run off the GUI thread
+        fig: plt.Figure = Figure()
         ax: plt.Axes = fig.add_axes([0.2, 0.2, 0.6, 0.6])
 
         if isinstance(colour_map, tuple):
@@ -124,11 +128,9 @@ class VisualizeVoiceNode(VoicelabNode):
 
         # if we have selected to plot intensity and an intensity value has been provided
         if plot_intensity and "Intensity" in self.args:
-            #intensity = self.args["Intensity"]
-            intensity: parselmouth.Intensity = voice.to_intensity()
             intensity_axis: plt.Axes = ax.twinx()
             self.plot_intensity(intensity_axis, intensity, pad_distance)
-            plt.ylim(0, round(intensity.values.max()))
+            intensity_axis.set_ylim(0, round(intensity.values.max()))
             intensity_axis.set_xlabel("Intensity (dB)", fontsize=self.fontsize)
             plt.setp(intensity_axis.get_xticklabels(), fontsize=self.fontsize)
             plt.setp(intensity_axis.get_yticklabels(), fontsize=self.fontsize)
@@ -139,7 +141,7 @@ class VisualizeVoiceNode(VoicelabNode):
         if plot_formants and "Formants" in self.args:
             formants: parselmouth.Formant = self.args["Formants"]
             self.formants_axis: plt.Axes = ax.twinx()
-            self.plot_formants(self.formants_axis, formants)
+            self.plot_formants(self.formants_axis, formants, intensity)
             del self.args["Formants"]
 
         # if we have selected to plot pitch and a pitch value has been provided
@@ -149,7 +151,7 @@ class VisualizeVoiceNode(VoicelabNode):
             adjustment: Union[float, int] = 0
             if self.args['Plot Intensity']:
                 adjustment = 5 #30
-            self.plot_pitch(pitch_axis, pitch, pad_distance+adjustment)
+            self.plot_pitch(pitch_axis, pitch, pad_distance+adjustment, intensity)
             plt.setp(pitch_axis.get_xticklabels(), fontsize=self.fontsize)
             plt.setp(pitch_axis.get_yticklabels(), fontsize=self.fontsize)
             del self.args["Pitch"]
@@ -172,37 +174,34 @@ class VisualizeVoiceNode(VoicelabNode):
         axis.plot(intensity.xs(), intensity.values.T, linewidth=2, color="w")
         axis.plot(intensity.xs(), intensity.values.T, linewidth=1, color="g")
         axis.grid(False)
-        plt.ylim(50)
+        axis.set_ylim(50)
         axis.set_ylabel("Intensity [dB]", color="g", fontsize=self.fontsize)
         # axis.yaxis.label.set_color('g')
 
-    def plot_pitch(self, axis, pitch, pad_distance):
-        """Plot pitch on the spectrogram
+    def plot_pitch(self, axis, pitch, pad_distance, intensity):
+        """Plot pitch on the spectrogram, leaving out frames quieter than 50 dB
         :argument axis: a matplotlib axis object
         :type axis: plt.axis
 
-        :argument pitch: The parselmouth Intensity object
-        :type intensity: parselmouth.Intensity
-
-        :argument voice: The parselmouth Sound object
-        :type intensity: parselmouth.Sound
+        :argument pitch: The parselmouth Pitch object
+        :type pitch: parselmouth.Pitch
 
         :pad_distance: how many pixels to pad the pitch y-axis label, this is automatically adjusted if intensity is also displayed
         :type pad_distance: int
+
+        :argument intensity: The parselmouth Intensity object
+        :type intensity: parselmouth.Intensity
         """
         axis.tick_params(axis="y", pad=pad_distance, colors="b")
 
-        signal, sampling_rate = self.args['voice']
-        voice: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
         pitch_values: np.ndarray = pitch.selected_array["frequency"]
-        intensity: parselmouth.Intensity= voice.to_intensity()
         sample_times: np.ndarray = pitch.xs()
 
-        for i, time in enumerate(sample_times):
-            intensity.values.T[intensity.values.T < 50] = np.nan
-            intensity_value: float = call(intensity, "Get value at time", time, "cubic")
-            if intensity_value < 50:
-                pitch_values[i] = 0
+        # intensity at every pitch frame at once
+        intensity_values: np.ndarray = self.values_at_times_cubic(
+            intensity.values[0], intensity.x1, intensity.dx, sample_times
+        )
+        pitch_values[intensity_values < 50] = 0
 
         pitch_values[pitch_values == 0] = np.nan
         axis.plot(pitch.xs(), pitch_values, linestyle="-", color="k", linewidth=6)
@@ -214,39 +213,33 @@ class VisualizeVoiceNode(VoicelabNode):
         axis.set_ylabel("Fundamental frequency [Hz]", fontsize=self.fontsize)
         axis.yaxis.label.set_color("b")
 
-    def plot_formants(self, axis, formants):
-        """Plot formants on the spectrogram
+    def plot_formants(self, axis, formants, intensity):
+        """Plot formants on the spectrogram, leaving out frames quieter than 50 dB
 
         :argument axis: a matplotlib axis object
         :type axis: plt.axis
 
-        :argument formants: The parselmouth Intensity object
-        :type formants: parselmouth.Intensity
+        :argument formants: The parselmouth Formant object
+        :type formants: parselmouth.Formant
 
-        :argument voice: The parselmouth Sound object
-        :type intensity: parselmouth.Sound
+        :argument intensity: The parselmouth Intensity object
+        :type intensity: parselmouth.Intensity
         """
-        signal, sampling_rate = self.args['voice']
-        voice: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
         axis.tick_params(bottom=False, top=False, left=False, right=False)
         ylabels: list = axis.get_yticklabels()
         for label in ylabels:
             label.set_fontsize(0.0)
 
         sample_times: np.ndarray = formants.xs()
-        intensity: parselmouth.Intensity = voice.to_intensity()
+        # intensity at every formant frame at once, the same for each formant
+        quiet: np.ndarray = self.values_at_times_cubic(
+            intensity.values[0], intensity.x1, intensity.dx, sample_times
+        ) < 50
         for i in range(4):  # How many formants do you want?
             formant_values: np.ndarray = parselmouth.praat.call(
                 formants, "To Matrix", i + 1
             ).values[0, :]
-            j = 0
-            for time in sample_times:
-                j += 1
-                intensity_value: float = parselmouth.praat.call(
-                    intensity, "Get value at time", time, "cubic"
-                )
-                if intensity_value < 50:
-                    formant_values[j] = 0
+            formant_values[quiet] = 0
             formant_values[formant_values == 0] = np.nan
             axis.scatter(
                 sample_times, formant_values, c="w", linewidth=3, marker="o", s=1
@@ -1,15 +1,175 @@
 from __future__ import annotations
 
+import copyreg
+
 import numpy as np
 import parselmouth
 from parselmouth.praat import call
 
 from ...pipeline.Node import Node
+from ...pipeline.ResultCache import fingerprint
+from .AnalysisContext import AnalysisContext
+
+
+def _rebuild_sound(values, sampling_frequency, start_time, name):
+    """Rebuild a Sound sent between processes"""
+    sound = parselmouth.Sound(values, sampling_frequency=sampling_frequency, start_time=start_time)
+    sound.name = name
+    return sound
+
+
+def _reduce_sound(sound):
+    """Pickle a Sound by its samples, so it can be sent to and from worker processes"""
+    return _rebuild_sound, (sound.values, sound.sampling_frequency, sound.xmin, sound.name)
+
+
+copyreg.pickle(parselmouth.Sound, _reduce_sound)
+
+
+# Unit conversions with Praat's formulas (hertzToMel, hertzToBark, hertzToErb, ...). They take
+# numbers or arrays, so whole pitch and formant tracks are converted at once. Like Praat, negative
+# inputs and results too large to represent are undefined, NaN here.
+
+def _praat_conversion(values, convert):
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(all="ignore"):
+        converted = np.where(values < 0, np.nan, convert(values))
+    converted = np.where(np.isfinite(converted), converted, np.nan)
+    return converted[()]
+
+
+def hz_to_mel(hz):
+    """Hertz to mel, as Praat's hertzToMel"""
+    return _praat_conversion(hz, lambda hz: 550 * np.log(1 + hz / 550))
+
+
+def mel_to_hz(mel):
+    """Mel to Hertz, as Praat's melToHertz"""
+    return _praat_conversion(mel, lambda mel: 550 * (np.exp(mel / 550) - 1))
+
+
+def hz_to_bark(hz):
+    """Hertz to Bark, as Praat's hertzToBark"""
+    return _praat_conversion(hz, lambda hz: 7 * np.log(hz / 650 + np.sqrt(1 + (hz / 650) ** 2)))
+
+
+def bark_to_hz(bark):
+    """Bark to Hertz, as Praat's barkToHertz"""
+    return _praat_conversion(bark, lambda bark: 650 * np.sinh(bark / 7))
+
+
+def hz_to_erbs(hz):
+    """Hertz to ERB-rate, as Praat's hertzToErb"""
+    return _praat_conversion(hz, lambda hz: 11.17 * np.log((hz + 312) / (hz + 14680)) + 43)
+
+
+def erbs_to_hz(erbs):
+    """ERB-rate to Hertz, as Praat's erbToHertz"""
+
+    def convert(erbs):
+        dum = np.exp((erbs - 43) / 11.17)
+        return (14680 * dum - 312) / (1 - dum)
+
+    return _praat_conversion(erbs, convert)
+
+
+def hz_to_semitones_re_0(hz):
+    """Hertz to semitones re 1 Hz, as Praat's pitch unit of that name"""
+    return _praat_conversion(hz, lambda hz: np.where(hz > 0, 12 * np.log2(hz), np.nan))
+
+
+def semitones_re_0_to_hz(semitones):
+    """Semitones re 1 Hz to Hertz. Semitones below 1 Hz are negative, so they are not undefined"""
+    semitones = np.asarray(semitones, dtype=np.float64)
+    with np.errstate(all="ignore"):
+        hz = 2 ** (semitones / 12)
+    return np.where(np.isfinite(hz), hz, np.nan)[()]
+
 
 
 class VoicelabNode(Node):
     """Extends the basic node with some shared voicelab functionalities
     """
+    # Bump when a change to a node changes its results, so results cached by older versions are not reused
+    version = 1
+    # Whether the results of this node can be reused from the result cache. Nodes that collect state
+    # for their end() hook, or that make files and figures, always process.
+    cache_results = True
+    # Outputs that are tracks of values over the frames of the sound, as float32 arrays, mapped to
+    # the output holding the time of each frame. Tracks are saved apart from the results tables
+    frame_times = {}
+
+    def cache_key(self):
+        """Key the results of this node by the audio, the node and its settings. The file path is
+        left out, so the same audio is only measured once however many places it is found.
+
+        :returns: the cache key, or None if this node's results are not cached or its settings can
+            not be hashed
+        :rtype: str | None
+        """
+        if not self.cache_results or self.args.get('voice') is None:
+            return None
+        settings = {
+            key: value for key, value in self.args.items() if key not in ('voice', 'file_path', 'context')
+        }
+        try:
+            settings = fingerprint(settings)
+        except TypeError:
+            return None
+        node_class = type(self)
+        return fingerprint(
+            (node_class.__module__, node_class.__qualname__, self.version, self.context.content_hash, settings)
+        )
+
+    def pack(self, results):
+        """Drop Praat analysis objects (Pitch, Formant, ...) from the results before they leave a
+        worker process. They cannot be pickled and are not saved with the results. Sounds are kept.
+
+        :param results: the results of this node's process
+        :type results: dict
+
+        :returns: the results that can be sent back from the worker
+        :rtype: dict
+        """
+        return {
+            key: value
+            for key, value in results.items()
+            if isinstance(value, parselmouth.Sound)
+            or not isinstance(value, parselmouth.Data)
+        }
+
+    def failed(self, results):
+        """Nodes catch what goes wrong while measuring and return the error message in place of
+        their results, so any result that is a string, other than the file path, means it failed.
+
+        :param results: the results of this node's process
+        :type results: dict
+
+        :returns: whether processing failed
+        :rtype: bool
+        """
+        if not isinstance(results, dict):
+            return True
+        return any(isinstance(value, str) for key, value in results.items() if key != 'file_path')
+
+    @property
+    def context(self) -> AnalysisContext:
+        """The shared analyses of the voice this node is processing.
+
+        LoadVoicesNode sends one context per file down the pipeline. A node that was not connected
+        to it gets its own context for the current voice instead.
+
+        :returns: the analysis context for args['voice']
+        :rtype: AnalysisContext
+        """
+        context = self.args.get('context')
+        if context is not None and context.voice is self.args['voice']:
+            return context
+        context = getattr(self, '_context', None)
+        if context is None or context.voice is not self.args['voice']:
+            context = self._context = AnalysisContext(self.args['voice'], self.args.get('file_path'))
+        return context
+
     def pitch_bounds(self, file_path):
         """Finds pitch ceiling and floor
 
@@ -19,30 +179,7 @@ class VoicelabNode(Node):
         :returns: tuple of pitch ceiling and pitch floor
         :rtype: tuple[float, float]
         """
-
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
-        # sound: parselmouth.Sound = parselmouth.Sound(file_path)
-        # measure pitch ceiling and floor
-        
-        try:
-            broad_pitch: float = sound.to_pitch_ac(
-            None, 50, 15, True, 0.03, 0.45, 0.01, 0.35, 0.14, 500
-            )
-            broad_mean_f0: float = call(broad_pitch, "Get mean", 0, 0, "hertz")  # get mean pitch
-        except:
-            broad_mean_f0 = 0
-
-        if broad_mean_f0 > 170:
-            pitch_floor = 100
-            pitch_ceiling = 500
-        elif broad_mean_f0 < 170:
-            pitch_floor = 50
-            pitch_ceiling = 300
-        else:
-            pitch_floor = 50
-            pitch_ceiling = 500
-        return pitch_floor, pitch_ceiling
+        return self.context.pitch_bounds
 
     def pitch_floor(self, file_path):
         """ Returns the pitch floor
@@ -52,9 +189,6 @@ class VoicelabNode(Node):
         :returns: pitch floor
         :rtype: float
         """
-        #sound: parselmouth.Sound = parselmouth.Sound(file_path)
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
         return self.pitch_bounds(file_path)[0]
 
     def pitch_ceiling(self, file_path):
@@ -65,9 +199,6 @@ class VoicelabNode(Node):
         :returns: pitch floor
         :rtype: float
         """
-        #sound: parselmouth.Sound = parselmouth.Sound(file_path)
-        signal, sampling_rate = self.args['voice']
-        sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
         return self.pitch_bounds(file_path)[1]
 
     def max_formant(self, file_path, method="praat_manual"):
@@ -81,50 +212,152 @@ class VoicelabNode(Node):
         :returns: maximum formant frequency
         :rtype: float
         """
-        try:
-            #sound: parselmouth.Sound = parselmouth.Sound(file_path)
-            signal, sampling_rate = self.args['voice']
-            sound: parselmouth.Sound = parselmouth.Sound(signal, sampling_rate)
-            if method == "praat_manual":
-                pitch: parselmouth.Pitch = sound.to_pitch(None, 50, 600)  # check pitch to set formant settings
-                mean_f0: float = call(pitch, "Get mean", 0, 0, "Hertz")
-                max_formant: float
-                if 170 <= mean_f0 <= 300:
-                    max_formant = 5500
-                elif mean_f0 < 170:
-                    max_formant = 5000
-                else:
-                    max_formant = 5500
-                return max_formant
-            else:
-                max_formant = 5500
-        except:
-            max_formant = 5500
-        return max_formant
+        return self.context.max_formant(method)
+
+    def values_at_times(self, values, x1, dx, times):
+        """Sample a track of frame values at many times at once, with linear interpolation the same
+        way Praat's "Get value at time..." does it: NaN where the nearest frame is outside the track
+        or undefined, and the nearest frame's value where the other one is.
+
+        :param values: value of each frame, NaN where undefined
+        :type values: numpy.ndarray
+        :param x1: time of the first frame
+        :type x1: float
+        :param dx: time step between frames
+        :type dx: float
+        :param times: times to sample the track at
+        :type times: numpy.ndarray
+
+        :returns: the value at each time
+        :rtype: numpy.ndarray
+        """
+        values = np.asarray(values, dtype=np.float64)
+        times = np.asarray(times, dtype=np.float64)
+        index = (times - x1) / dx
+        left = np.floor(index).astype(np.int64)
+        phase = index - left
+        nearer_left = phase < 0.5
+        near = np.where(nearer_left, left, left + 1)
+        far = np.where(nearer_left, left + 1, left)
+        phase = np.where(nearer_left, phase, 1 - phase)
+
+        def at(frames):
+            inside = (frames >= 0) & (frames < len(values))
+            sampled = np.full(len(frames), np.nan)
+            sampled[inside] = values[frames[inside]]
+            return sampled
+
+        near_values = at(near)
+        far_values = at(far)
+        return np.where(np.isnan(far_values), near_values, near_values + phase * (far_values - near_values))
+
+    def values_at_times_cubic(self, values, x1, dx, times):
+        """Sample the samples of a Sound, Intensity or Matrix at many times at once, with cubic
+        interpolation the same way Praat's "Get value at time... Cubic" does it: linear next to the
+        first and last samples, the edge sample past them, and NaN more than half a sample past them.
+
+        :param values: value of each sample
+        :type values: numpy.ndarray
+        :param x1: time of the first sample
+        :type x1: float
+        :param dx: time step between samples
+        :type dx: float
+        :param times: times to sample at
+        :type times: numpy.ndarray
+
+        :returns: the value at each time
+        :rtype: numpy.ndarray
+        """
+        y = np.asarray(values, dtype=np.float64)
+        times = np.asarray(times, dtype=np.float64)
+        n = len(y)
+        index = (times - x1) / dx
+        left = np.clip(np.floor(index).astype(np.int64), 0, n - 1)
+        right = np.minimum(left + 1, n - 1)
+        fil = index - left
+        fir = 1 - fil
+        y_left = y[left]
+        y_right = y[right]
+        linear = y_left + fil * (y_right - y_left)
+        # the cubic needs a sample on either side of the two around each time
+        dyl = 0.5 * (y_right - y[np.maximum(left - 1, 0)])
+        dyr = 0.5 * (y[np.minimum(right + 1, n - 1)] - y_left)
+        cubic = y_left * fir + y_right * fil - fil * fir * (
+            0.5 * (dyr - dyl) + (fil - 0.5) * (dyl + dyr - 2 * (y_right - y_left))
+        )
+        result = np.where((left >= 1) & (left <= n - 3), cubic, linear)
+        result = np.where(index == left, y_left, result)
+        result = np.where(index < 0, y[0], result)
+        result = np.where(index > n - 1, y[-1], result)
+        result[(index < -0.5) | (index > n - 0.5)] = np.nan
+        return result
+
+    def minima_between_times(self, values, x1, dx, starts, ends):
+        """The lowest sample between each pair of times, the same as Praat's "Get minimum..." with
+        no interpolation, for many windows at once. A window with no samples in it gets the lower of
+        the samples nearest to its start and end.
+
+        :param values: value of each sample
+        :type values: numpy.ndarray
+        :param x1: time of the first sample
+        :type x1: float
+        :param dx: time step between samples
+        :type dx: float
+        :param starts: start time of each window
+        :type starts: numpy.ndarray
+        :param ends: end time of each window
+        :type ends: numpy.ndarray
+
+        :returns: the minimum in each window
+        :rtype: numpy.ndarray
+        """
+        y = np.asarray(values, dtype=np.float64)
+        n = len(y)
+        first = np.clip(np.ceil((np.asarray(starts) - x1) / dx).astype(np.int64), 0, n)
+        last = np.clip(np.floor((np.asarray(ends) - x1) / dx).astype(np.int64), -1, n - 1)
+        if len(first) == 0:
+            return np.zeros(0)
+        # each window is reduced on its own, the reductions between windows are thrown away. The
+        # extra sample lets a window end at the last sample
+        bounds = np.stack([first, last + 1], axis=1).ravel()
+        minima = np.minimum.reduceat(np.append(y, np.inf), bounds)[::2]
+
+        empty = first > last
+        if np.any(empty):
+
+            def nearest(times):
+                index = (np.asarray(times)[empty] - x1) / dx
+                sampled = y[np.clip(np.floor(index + 0.5).astype(np.int64), 0, n - 1)]
+                # undefined more than half a sample past the first and last samples
+                sampled[(index < -0.5) | (index > n - 0.5)] = np.nan
+                return sampled
+
+            minima[empty] = np.minimum(nearest(starts), nearest(ends))
+        return minima
 
     def hz_to_mel(self, hz):
-        return float(parselmouth.praat.call("Calculator", "hertzToMel({})".format(hz)))
+        return hz_to_mel(hz)
 
     def mel_to_hz(self, mel):
-        return float(parselmouth.praat.call("Calculator", "melToHertz({})".format(mel)))
+        return mel_to_hz(mel)
 
     def hz_to_bark(self, hz):
-        return float(parselmouth.praat.call("Calculator", "hertzToBark({})".format(hz)))
+        return hz_to_bark(hz)
 
     def bark_to_hz(self, bark):
-        return float(parselmouth.praat.call("Calculator", "barkToHertz({})".format(bark)))
+        return bark_to_hz(bark)
 
     def hz_to_erbs(self, hz):
-        return float(parselmouth.praat.call("Calculator", "hertzToERBs({})".format(hz)))
+        return hz_to_erbs(hz)
 
     def erbs_to_hz(self, erbs):
-        return float(parselmouth.praat.call("Calculator", "ERBsToHertz({})".format(erbs)))
+        return erbs_to_hz(erbs)
 
     def hz_to_semitones_re_0(self, hz):
-        return float(parselmouth.praat.call("Calculator", "hertzToSemitonesRe1Hz({})".format(hz)))
+        return hz_to_semitones_re_0(hz)
 
     def semitones_re_0_to_hz(self, semitones):
-        return float(parselmouth.praat.call("Calculator", "semitonesRe1HzToHertz({})".format(semitones)))
+        return semitones_re_0_to_hz(semitones)
 
     def dB_to_pa(self, dB):
         return 10 ** (np.abs(dB) / 20)
@@ -1,50 +1,68 @@
-# Input Nodes
-from .LoadVoicesNode import LoadVoicesNode
-
-# TODO: Output Nodes
-
-# Measure Nodes
-from .VisualizeSpectrumNode import VisualizeSpectrumNode
-from .MeasureSHRPNode import MeasureSHRPNode
-from .MeasurePitchYinNode import MeasurePitchYinNode
-from .MeasureDurationNode import MeasureDurationNode
-from .MeasureIntensityNode import MeasureIntensityNode
-from .MeasureFormantNode import MeasureFormantNode
-from .MeasureHarmonicityNode import MeasureHarmonicityNode
-from .MeasureAlphaRatioNode import MeasureAlphaRatioNode
-#from .MeasureHarmonicsNode import MeasureHarmonicsNode
-from .MeasureJitterNode import MeasureJitterNode
-from .MeasurePitchNode import MeasurePitchNode
-from .MeasureShimmerNode import MeasureShimmerNode
-from .MeasureMFCCNode import MeasureMFCCNode
-from .MeasureVocalTractEstimatesNode import MeasureVocalTractEstimatesNode
-from .MeasureSpeechRateNode import MeasureSpeechRateNode
-from .MeasureCPPNode import MeasureCPPNode
-from .MeasureSpectralTiltNode import MeasureSpectralTiltNode
-from .MeasureEnergyNode import MeasureEnergyNode
-from .MeasureFormantPositionsNode import MeasureFormantPositionsNode
-from .MeasureLTASNode import MeasureLTASNode
-from .MeasureSpectralShapeNode import MeasureSpectralShapeNode
-from .ManipulateTruncateSoundsNode import ManipulateTruncateSoundsNode
-#from .TEVANode import TEVANode
-#from .MeasurePitchYinNode import MeasurePitchYinNode
-#from .MeasurePitchCrepeNode import MeasurePitchCrepeNode
-
-# Manipulate Nodes
-from .ManipulateLowerPitchAndFormantsNode import ManipulateLowerPitchAndFormantsNode
-from .ManipulateRaisePitchAndFormantsNode import ManipulateRaisePitchAndFormantsNode
-from .ManipulateLowerFormantsNode import ManipulateLowerFormantsNode
-from .ManipulateRaiseFormantsNode import ManipulateRaiseFormantsNode
-from .ManipulatePitchLowerNode import ManipulatePitchLowerNode
-from .ManipulatePitchHigherNode import ManipulatePitchHigherNode
-from .ScaleIntensityNode import ScaleIntensityNode
-from .ResampleSoundsNode import ResampleSoundsNode
-from .ReverseSoundsNode import ReverseSoundsNode
-from .RotateSpectrumNode import RotateSpectrumNode
-
-# Visualization Nodes
-from .VisualizeVoiceNode import VisualizeVoiceNode
-from .VisualizeSpectrumNode import VisualizeSpectrumNode
-
-# Experimental Nodes
-from .F1F2PlotNode import F1F2PlotNode
+from ...pipeline.NodeFactory import NodeFactory
+
+# Node classes are imported the first time they are used, e.g. Voicelab.MeasurePitchNode, so
+# importing the toolkit, or one node from it, doesn't import every node and its dependencies.
+# Importing a node's module directly, before its class was looked up here, leaves the module under
+# that name instead, so import the class from its module then
+node_classes = [
+    # Input Nodes
+    "LoadVoicesNode",
+
+    # TODO: Output Nodes
+
+    # Measure Nodes
+    "MeasureSHRPNode",
+    "MeasurePitchYinNode",
+    "MeasureDurationNode",
+    "MeasureIntensityNode",
+    "MeasureFormantNode",
+    "MeasureHarmonicityNode",
+    "MeasureAlphaRatioNode",
+    # "MeasureHarmonicsNode",
+    "MeasureJitterNode",
+    "MeasurePitchNode",
+    "MeasureShimmerNode",
+    "MeasureMFCCNode",
+    "MeasureVocalTractEstimatesNode",
+    "MeasureSpeechRateNode",
+    "MeasureCPPNode",
+    "MeasureSpectralTiltNode",
+    "MeasureEnergyNode",
+    "MeasureFormantPositionsNode",
+    "MeasureLTASNode",
+    "MeasureSpectralShapeNode",
+    "ManipulateTruncateSoundsNode",
+    # "TEVANode",
+    # "MeasurePitchCrepeNode",
+
+    # Manipulate Nodes
+    "ManipulateLowerPitchAndFormantsNode",
+    "ManipulateRaisePitchAndFormantsNode",
+    "ManipulateLowerFormantsNode",
+    "ManipulateRaiseFormantsNode",
+    "ManipulatePitchLowerNode",
+    "ManipulatePitchHigherNode",
+    "ScaleIntensityNode",
+    "ResampleSoundsNode",
+    "ReverseSoundsNode",
+    "RotateSpectrumNode",
+
+    # Visualization Nodes
+    "VisualizeVoiceNode",
+    "VisualizeSpectrumNode",
+
+    # Experimental Nodes
+    "F1F2PlotNode",
+]
+
+
+def __getattr__(name):
+    if name in node_classes:
+        # cached here, so this is only called the first time
+        globals()[name] = NodeFactory.import_node(name, "Voicelab", name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(node_classes))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+# voicelab-batch: run VoiceLab over a set of files from the command line, without the GUI.
+#
+#   voicelab-batch INPUT SETTINGS OUTPUT
+#
+# INPUT is a directory of sound files, or a manifest: a text file listing one sound file per line.
+# SETTINGS is a JSON file choosing the functions to run and any settings to change from their
+# defaults, for example:
+#
+#   {
+#       "functions": ["Measure Pitch", "Measure Formants"],
+#       "settings": {"Measure Pitch": {"Unit": "Hertz"}}
+#   }
+#
+# Leaving out "functions" runs the same default functions as the GUI. Results and settings are
+# saved to the OUTPUT directory the same way the GUI saves them: as CSV tables, and as Excel
+# workbooks or Parquet files with --format excel or --format parquet. Tracks of values over frames,
+# such as pitch contours and MFCCs, are saved as arrays in voicelab_tracks/<sound>.npz. The
+# seconds each function took on each file are saved to voicelab_timings.csv.
+#
+# With --profile, each function's wall time, CPU time and number of Praat calls on each file are
+# saved to voicelab_profile.csv, summed up per function in voicelab_profile_summary.csv, and as a
+# trace to open in ui.perfetto.dev in voicelab_trace.json. --profile-memory adds the most memory
+# each function allocated at once, which slows some functions down a lot.
+#
+# With --stream csv, parquet or sqlite, each file's measurements are instead written to
+# voicelab_results.csv/.parquet/.sqlite as soon as the file is processed, one row per measurement,
+# and its tracks to voicelab_tracks/<sound>.npz. Nothing is held in memory between files then, so
+# long runs stay small, but sounds and figures made by the functions are not saved, and tracks are
+# not saved as a Parquet table.
+#
+# The same node graph is run as in the GUI, but Qt is never imported, so it runs on machines with
+# no display.
+"""
+import argparse
+import json
+import os
+import sys
+
+import matplotlib
+
+# Figures are only saved to files, never shown
+matplotlib.use("Agg")
+
+from .VoicelabGUI.VoicelabController import VoicelabController
+from .pipeline.ResultSink import open_sink
+from .VoicelabGUI.ResultExport import save_settings_table, save_timings_table
+from .default_settings import available_functions, default_functions
+
+# The sound files the GUI lets you load
+SOUND_FILE_EXTENSIONS = (".wav", ".mp3", ".aiff", ".ogg", ".aifc", ".au", ".nist", ".flac")
+
+# Formats results can be saved in besides CSV, once everything is processed
+EXPORT_FORMATS = ["excel", "parquet"]
+
+# Formats results can be written in as each file is processed
+STREAM_FORMATS = ["csv", "parquet", "sqlite"]
+
+
+def find_files(input_path):
+    """List the sound files to process: every sound file in a directory and its subdirectories, or
+    each line of a manifest. Relative paths in a manifest are relative to the manifest
+
+    Args:
+        input_path: a directory or a manifest file
+    """
+    if os.path.isdir(input_path):
+        file_paths = []
+        for directory, subdirectories, file_names in os.walk(input_path):
+            subdirectories.sort()
+            for file_name in sorted(file_names):
+                if file_name.lower().endswith(SOUND_FILE_EXTENSIONS):
+                    file_paths.append(os.path.join(directory, file_name))
+        return file_paths
+
+    manifest_directory = os.path.dirname(os.path.abspath(input_path))
+    file_paths = []
+    with open(input_path) as manifest:
+        for line in manifest:
+            line = line.strip()
+            # skip blank lines and comments
+            if line == "" or line.startswith("#"):
+                continue
+            file_paths.append(os.path.join(manifest_directory, line))
+    return file_paths
+
+
+def load_settings(settings_path):
+    """Read the functions to run and their settings from a JSON file
+
+    Args:
+        settings_path:
+    """
+    with open(settings_path) as settings_file:
+        settings = json.load(settings_file)
+
+    functions = settings.get("functions", default_functions)
+    function_settings = settings.get("settings", {})
+    for fn_name in list(functions) + list(function_settings):
+        if fn_name not in available_functions:
+            raise ValueError(f"Unknown function '{fn_name}', choose from: {', '.join(available_functions)}")
+    for fn_name in function_settings:
+        for setting in function_settings[fn_name]:
+            if setting not in available_functions[fn_name].args:
+                raise ValueError(f"'{fn_name}' has no setting '{setting}'")
+    return functions, function_settings
+
+
+def run_batch(file_paths, functions, function_settings, output_path, processes=1, cache_directory=None,
+              cache_size=2 ** 30, export_formats=(), stream_format=None, profile=False, profile_memory=False):
+    """Process the files the same way the GUI does, and save the results to output_path
+
+    Args:
+        file_paths: the sound files to process
+        functions: names of the functions to run
+        function_settings: settings to change from their defaults, by function name
+        output_path: directory to save the results and settings in
+        processes: number of worker processes, 0 for one per cpu
+        cache_directory: directory to keep a result cache in, None to not use one
+        cache_size: size in bytes the result cache is trimmed back to
+        export_formats: formats from EXPORT_FORMATS to save the results in besides CSV
+        stream_format: one of STREAM_FORMATS to write each file's results as soon as it is
+            processed, instead of saving them all at the end
+        profile: save a profile of each function on each file
+        profile_memory: profile each function's peak memory too
+    """
+    controller = VoicelabController()
+    controller.processes = processes
+    controller.cache_directory = cache_directory
+    controller.cache_size = cache_size
+    controller.export_formats = list(export_formats)
+    controller.profile = profile or profile_memory
+    controller.profile_memory = profile_memory
+    os.makedirs(output_path, exist_ok=True)
+    if stream_format is not None:
+        controller.result_sink = open_sink(
+            os.path.join(output_path, "voicelab_results." + stream_format),
+            tracks_directory=os.path.join(output_path, "voicelab_tracks"),
+        )
+
+    # only the functions that run are loaded, so nodes that aren't used are never imported
+    for fn_name in functions:
+        controller.load_function(fn_name, available_functions[fn_name], default=True)
+        controller.activate_function(fn_name)
+    for fn_name, settings in function_settings.items():
+        controller.set_settings(fn_name, list(settings), list(settings.values()))
+
+    # a file that can not be read is reported by LoadVoicesNode when it reaches it, and only its
+    # error is saved, rather than stopping the whole batch
+    controller.load_voices(file_paths)
+    controller.activate_voices(file_paths)
+
+    controller.start_processing(
+        controller.active_voices, controller.active_functions, controller.active_settings
+    )
+
+    if stream_format is None:
+        controller.save_results(
+            controller.active_results, controller.active_functions, controller.last_used_settings, output_path
+        )
+    else:
+        save_settings_table(controller.last_used_settings, os.path.join(output_path, "voicelab_settings.csv"))
+        save_timings_table(controller.timings, os.path.join(output_path, "voicelab_timings.csv"))
+        if controller.profile:
+            controller.save_profile(output_path)
+    return controller.active_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="voicelab-batch",
+        description="Run VoiceLab on a set of sound files without the GUI",
+    )
+    parser.add_argument("input", help="directory of sound files, or a text file listing one sound file per line")
+    parser.add_argument("settings", help="JSON file with the functions to run and their settings")
+    parser.add_argument("output", help="directory to save the results in")
+    parser.add_argument("-p", "--processes", type=int, default=1,
+                        help="number of worker processes, 0 for one per cpu (default: 1)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="keep results in this directory and reuse them on later runs")
+    parser.add_argument("--cache-size", type=int, default=2 ** 30,
+                        help="size in bytes the result cache is trimmed back to (default: 1 GiB)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, action="append", default=[],
+                        help="also save the results in this format besides CSV, can be given more than once")
+    parser.add_argument("--stream", choices=STREAM_FORMATS, default=None,
+                        help="write each file's results in this format, and its tracks as .npz, as soon as it is "
+                             "processed, instead of saving them all at the end")
+    parser.add_argument("--profile", action="store_true",
+                        help="save the time and Praat calls of each function on each file")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="profile the peak memory of each function on each file too, which is slower")
+    args = parser.parse_args(argv)
+
+    file_paths = find_files(args.input)
+    if len(file_paths) == 0:
+        parser.error(f"no sound files found in {args.input}")
+    try:
+        functions, function_settings = load_settings(args.settings)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    run_batch(
+        file_paths,
+        functions,
+        function_settings,
+        args.output,
+        processes=args.processes,
+        cache_directory=args.cache_dir,
+        cache_size=args.cache_size,
+        export_formats=args.format,
+        stream_format=args.stream,
+        profile=args.profile,
+        profile_memory=args.profile_memory,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import sys
+import os
+import parselmouth
+import pytest
+from glob import glob
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab.AnalysisContext import AnalysisContext
+from Voicelab.toolkits.Voicelab.VoicelabNode import VoicelabNode
+
+
+# Arrange
+def get_test_file():
+    return sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[0]
+
+
+def load_voice(file_path):
+    sound = parselmouth.Sound(file_path)
+    return sound.values, sound.sampling_frequency
+
+
+def test_context_computes_each_analysis_once():
+    file_path = get_test_file()
+    context = AnalysisContext(load_voice(file_path), file_path)
+
+    # Act
+    sound = context.sound
+    bounds = context.pitch_bounds
+
+    # Assert
+    assert context.sound is sound
+    assert context.broad_pitch is context.broad_pitch
+    assert context.point_process(*bounds) is context.point_process(*bounds)
+    assert context.intensity(50) is context.intensity(50)
+    assert context.intensity(50) is not context.intensity(100)
+
+
+def test_nodes_share_the_context_they_are_sent():
+    file_path = get_test_file()
+    voice = load_voice(file_path)
+    context = AnalysisContext(voice, file_path)
+    first, second = VoicelabNode(), VoicelabNode()
+    for node in (first, second):
+        node.args = {"voice": voice, "file_path": file_path, "context": context}
+
+    # Act
+    bounds = first.pitch_bounds(file_path)
+
+    # Assert
+    assert second.context is first.context
+    assert second.pitch_bounds(file_path) == bounds
+    assert len(context.cache) == 3  # sound, broad pitch, pitch bounds
+
+
+def test_unconnected_node_gets_its_own_context():
+    file_path = get_test_file()
+    node = VoicelabNode()
+    node.args = {"voice": load_voice(file_path), "file_path": file_path}
+
+    # Act
+    context = node.context
+
+    # Assert
+    assert node.context is context
+    assert context.voice is node.args["voice"]
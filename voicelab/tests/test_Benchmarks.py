@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+import parselmouth
+from parselmouth.praat import call
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.benchmarks.synthetic_voices import synthesize_vowel, synthesize_corpus
+from Voicelab.benchmarks.run_benchmarks import run_benchmarks, with_requirements
+
+
+def test_synthetic_vowel_has_the_voice_it_was_made_with(tmp_path):
+    # Arrange
+    path = str(tmp_path / "vowel.wav")
+
+    # Act
+    voice = synthesize_vowel(path, 2, 16000, f0=150)
+    sound = parselmouth.Sound(path)
+    pitch = sound.to_pitch()
+    formant = sound.to_formant_burg()
+
+    # Assert
+    assert sound.sampling_frequency == 16000
+    assert abs(sound.duration - 2) < 1e-3
+    assert abs(call(pitch, "Get mean", 0, 0, "Hertz") - voice["f0"]) < 1
+    assert abs(call(formant, "Get mean", 1, 0, 0, "hertz") - voice["formants"][0]) < 50
+    assert abs(call(formant, "Get mean", 2, 0, 0, "hertz") - voice["formants"][1]) < 50
+
+
+def test_corpus_is_reused_while_the_voice_is_the_same(tmp_path):
+    # Arrange
+    synthesize_corpus(str(tmp_path), [1], [16000])
+    path = tmp_path / "vowel_1s_16000Hz.wav"
+    made = path.stat().st_mtime_ns
+
+    # Act
+    synthesize_corpus(str(tmp_path), [1], [16000])
+    kept = path.stat().st_mtime_ns
+    synthesize_corpus(str(tmp_path), [1], [16000], f0=200)
+
+    # Assert
+    assert kept == made
+    assert path.stat().st_mtime_ns != made
+
+
+def test_functions_are_run_with_those_they_need():
+    # Act
+    functions = with_requirements(["Measure Vocal Tract Estimates"])
+
+    # Assert
+    assert functions == ["Measure Pitch", "Measure Formants", "Measure Vocal Tract Estimates"]
+
+
+def test_benchmark_reports_throughput_and_memory(tmp_path):
+    # Act
+    run_benchmarks(str(tmp_path), durations=[1], sampling_rates=[16000], functions=["Measure Duration"])
+    with open(tmp_path / "voicelab_benchmark.json") as f:
+        results = json.load(f)
+
+    # Assert
+    row, = results["results"]
+    assert row["function"] == "Measure Duration"
+    assert "error" not in row
+    assert row["audio seconds per cpu second"] > 0
+    assert row["peak rss bytes"] > 0
+    assert row["peak memory bytes"] >= 0
+    assert results["voices"][0]["f0"] == 120
+    assert (tmp_path / "voicelab_benchmark.csv").exists()
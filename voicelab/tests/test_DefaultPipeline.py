@@ -0,0 +1,112 @@
+import sys
+import os
+import copy
+import parselmouth
+import pytest
+import soundfile
+from collections import Counter
+from glob import glob
+from scipy.io import wavfile
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.pipeline.Pipeline import Pipeline
+from Voicelab.toolkits.Voicelab.LoadVoicesNode import LoadVoicesNode
+from Voicelab.default_settings import available_functions, default_functions, function_requirements
+from Voicelab.voicelab_batch import run_batch
+
+
+# Arrange
+@pytest.fixture
+def test_files(tmp_path):
+    """Two of the wav files, and an mp3 made from the first, which libsndfile and Praat decode differently"""
+    wav_files = sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[:2]
+    signal, sampling_rate = soundfile.read(wav_files[0])
+    mp3_file = str(tmp_path / "voice.mp3")
+    soundfile.write(mp3_file, signal, sampling_rate, format="MP3")
+    return wav_files + [mp3_file]
+
+
+def build_default_pipeline(file_locations):
+    """Connect the default functions the same way VoicelabController.start_processing does"""
+    pipeline = Pipeline()
+    load_voices = LoadVoicesNode("Load Voice")
+    load_voices.args["file_locations"] = file_locations
+    pipeline.add(load_voices)
+
+    active_functions = {fn: copy.deepcopy(available_functions[fn]) for fn in default_functions}
+    for fn in active_functions:
+        pipeline.add(active_functions[fn])
+        for terminal in ("voice", "file_path", "context"):
+            pipeline.connect((load_voices, terminal), (active_functions[fn], terminal))
+    for fn_name in function_requirements:
+        if fn_name in active_functions:
+            for parent_name, argument in function_requirements[fn_name]:
+                pipeline.connect((active_functions[parent_name], argument), (active_functions[fn_name], argument))
+    return pipeline
+
+
+@pytest.fixture
+def file_reads(monkeypatch, test_files):
+    """Count every time a file's audio is decoded by the libraries the nodes use. Reading just a
+    header, with soundfile.info, is not a decode. The test files are made before counting starts"""
+    reads = Counter()
+
+    def count(path):
+        if isinstance(path, str):
+            reads[os.path.realpath(path)] += 1
+
+    sound_init = parselmouth.Sound.__init__
+    def counting_sound_init(self, *args, **kwargs):
+        if len(args) > 0:
+            count(args[0])
+        sound_init(self, *args, **kwargs)
+    monkeypatch.setattr(parselmouth.Sound, "__init__", counting_sound_init)
+
+    # soundfile.read and librosa.load both decode through SoundFile.read
+    soundfile_read = soundfile.SoundFile.read
+    def counting_soundfile_read(self, *args, **kwargs):
+        count(self.name)
+        return soundfile_read(self, *args, **kwargs)
+    monkeypatch.setattr(soundfile.SoundFile, "read", counting_soundfile_read)
+
+    wavfile_read = wavfile.read
+    def counting_wavfile_read(filename, *args, **kwargs):
+        count(filename)
+        return wavfile_read(filename, *args, **kwargs)
+    monkeypatch.setattr(wavfile, "read", counting_wavfile_read)
+
+    # librosa falls back to audioread for files libsndfile can not decode
+    audioread = pytest.importorskip("audioread")
+    audio_open = audioread.audio_open
+    def counting_audio_open(path, *args, **kwargs):
+        count(path)
+        return audio_open(path, *args, **kwargs)
+    monkeypatch.setattr(audioread, "audio_open", counting_audio_open)
+
+    return reads
+
+
+def test_default_run_reads_each_file_once(file_reads, test_files):
+    pipeline = build_default_pipeline(test_files)
+
+    # Act
+    results = pipeline.start()
+
+    # Assert
+    assert len(results) == len(test_files)
+    assert file_reads == Counter({os.path.realpath(file_path): 1 for file_path in test_files})
+
+
+def test_batch_run_reads_each_file_once(file_reads, test_files, tmp_path):
+    # Act
+    # the batch runner also reads each file's header when loading it, that must not decode it
+    run_batch(test_files, list(default_functions), {}, str(tmp_path / "results"))
+
+    # Assert
+    assert file_reads == Counter({os.path.realpath(file_path): 1 for file_path in test_files})
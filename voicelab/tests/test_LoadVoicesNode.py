@@ -0,0 +1,39 @@
+import sys
+import os
+import pytest
+from glob import glob
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab.LoadVoicesNode import LoadVoicesNode
+
+
+# Arrange
+def get_test_files():
+    return sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[:5]
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_files_are_loaded_in_order_and_only_prefetch_ahead(prefetch):
+    test_files = get_test_files()
+    node = LoadVoicesNode("Load Voice")
+    node.args["file_locations"] = test_files
+    node.args["prefetch"] = prefetch
+
+    # Act
+    batch_size = node.start()
+    loaded = []
+    while not node.done:
+        loaded.append(node.process()["file_path"])
+        # the file just handed out plus at most 'prefetch' decoded ahead of it
+        assert len(node.state["loading"]) <= prefetch
+    node.end([])
+
+    # Assert
+    assert batch_size == len(test_files)
+    assert loaded == test_files
@@ -0,0 +1,73 @@
+import sys
+import os
+import numpy as np
+import parselmouth
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab.MeasureEnergyNode import MeasureEnergyNode
+
+
+# Arrange
+def refine_pitch_frame_by_frame(node, times, frequencies):
+    """The VoiceSauce alignment, one frame at a time"""
+    times_ms = node.round_half_away_from_zero(np.asarray(times) * 1000)
+    f0 = np.zeros(len(times))
+    for i, frame_time in enumerate(range(0, times_ms[-1] + 1)):
+        closest = np.argmin(np.abs(times_ms - frame_time))
+        if np.abs(times_ms[closest] - frame_time) <= 1 and i < len(times):
+            f0[i] = frequencies[closest]
+    return f0
+
+
+def energy_frame_by_frame(y, fs, f0, n_periods=5):
+    """The VoiceSauce pitch synchronous RMS, one frame at a time"""
+    rms = np.full(len(f0), np.nan)
+    for k, f0_curr in enumerate(f0):
+        ks = np.sign(k * fs / 1000) * np.floor(np.abs(k * fs / 1000) + 0.5)
+        if ks <= 0 or ks >= len(y) or np.isnan(f0_curr) or f0_curr == 0:
+            continue
+        half = n_periods / 2 * fs / f0_curr
+        ystart = int(np.sign(ks - half) * np.floor(np.abs(ks - half) + 0.5))
+        yend = int(np.sign(ks + half) * np.floor(np.abs(ks + half) + 0.5) - 1)
+        if ystart <= 0 or yend > len(y):
+            continue
+        rms[k] = np.sqrt(np.mean(y[ystart:yend] ** 2))
+    return rms
+
+
+def test_refine_pitch_matches_frame_by_frame_alignment():
+    rng = np.random.default_rng(0)
+    # uneven steps, with repeated and missing milliseconds
+    times = np.cumsum(rng.choice([0.0004, 0.001, 0.0015, 0.003], size=2000))
+    frequencies = rng.uniform(80, 300, size=len(times))
+    frequencies[rng.random(len(times)) < 0.2] = np.nan
+    node = MeasureEnergyNode("Energy")
+
+    # Act
+    f0 = node.refine_pitch_voice_sauce(times, frequencies)
+
+    # Assert
+    np.testing.assert_array_equal(f0, refine_pitch_frame_by_frame(node, times, frequencies))
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_energy_matches_frame_by_frame_rms(channels):
+    rng = np.random.default_rng(1)
+    fs = 16000
+    signal = rng.normal(size=(channels, fs * 2))
+    f0 = rng.uniform(60, 400, size=2000)
+    f0[rng.random(len(f0)) < 0.2] = np.nan
+    f0[rng.random(len(f0)) < 0.1] = 0
+    node = MeasureEnergyNode("Energy")
+
+    # Act
+    rms = node.get_energy_voice_sauce(parselmouth.Sound(signal, fs), f0)
+
+    # Assert
+    np.testing.assert_allclose(rms, energy_frame_by_frame(signal.T, fs, f0), rtol=1e-10)
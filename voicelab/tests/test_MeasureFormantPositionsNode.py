@@ -0,0 +1,58 @@
+import sys
+import os
+from glob import glob
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab.MeasureFormantPositionsNode import MeasureFormantPositionsNode
+from Voicelab.toolkits.Voicelab.MeasurePitchNode import measure_pitch_praat
+
+
+# Arrange
+def formant_means_pulse_by_pulse(sound, formant_object, pitch_floor, pitch_ceiling):
+    """The mean of each formant at the glottal pulses, a Praat call per pulse"""
+    pitch = measure_pitch_praat(sound=sound, method="To Pitch (cc)", floor=pitch_floor, ceiling=pitch_ceiling)[0]
+    point_process = call([sound, pitch], "To PointProcess (cc)")
+    means = []
+    for formant_number in range(1, 5):
+        values = []
+        for point in range(call(point_process, "Get number of points")):
+            t = call(point_process, "Get time from index", point + 1)
+            values.append(call(formant_object, "Get value at time", formant_number, t, "Hertz", "Linear"))
+        values = [value for value in values if not np.isnan(value)]
+        means.append(sum(values) / len(values) if len(values) > 0 else "N/A")
+    return means
+
+
+@pytest.mark.parametrize("maximum_formant", [5500, 3000])
+def test_formants_at_pulses_match_pulse_by_pulse(maximum_formant):
+    # Arrange
+    file_path = sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[0]
+    sound = parselmouth.Sound(file_path)
+    # a low maximum leaves some frames with fewer than four formants
+    formant_object = call(sound, "To Formant (burg)", 0, 5, maximum_formant, 0.025, 50)
+    node = MeasureFormantPositionsNode("Formant Positions")
+    node.args.update({
+        "file_path": file_path,
+        "voice": (sound.values[0], sound.sampling_frequency),
+        "Formants": formant_object,
+        "Pitch Floor": 75,
+        "Pitch Ceiling": 500,
+    })
+
+    # Act
+    node.process()
+
+    # Assert
+    expected = formant_means_pulse_by_pulse(node.context.sound, formant_object, 75, 500)
+    means = [node.state[f"f{formant_number}_mean_pf_list"][0] for formant_number in range(1, 5)]
+    assert means == pytest.approx(expected)
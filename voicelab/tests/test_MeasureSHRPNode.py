@@ -0,0 +1,66 @@
+import sys
+import os
+import importlib
+import numpy as np
+import parselmouth
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+# The toolkit package exports the node class under the module's name, so import the module itself
+shrp_module = importlib.import_module("Voicelab.toolkits.Voicelab.MeasureSHRPNode")
+
+
+# Arrange
+def make_vowel(f0, sampling_rate, duration=1.0):
+    """A harmonic complex with falling amplitudes, a rough stand-in for a sustained vowel"""
+    t = np.arange(int(duration * sampling_rate)) / sampling_rate
+    harmonics = np.arange(1, int(4000 / f0))
+    return np.sum(np.sin(2 * np.pi * f0 * np.outer(harmonics, t)) / harmonics[:, np.newaxis], axis=0)
+
+
+@pytest.mark.parametrize("f0, sampling_rate", [(120, 16000), (220, 44100)])
+def test_shrp_finds_f0_of_a_synthetic_vowel(f0, sampling_rate):
+    signal = make_vowel(f0, sampling_rate)
+
+    # Act
+    f0_time, f0_value, shr, f0_candidates = shrp_module.shrp(signal, sampling_rate)
+
+    # Assert
+    assert len(f0_time) == len(f0_value) == len(shr) == len(f0_candidates)
+    assert np.median(f0_value) == pytest.approx(f0, rel=0.03)
+
+
+def test_shrp_results_do_not_depend_on_block_size(monkeypatch):
+    signal = make_vowel(150, 22050, duration=2.0)
+    expected = shrp_module.shr_pitch(signal, 22050, datalen=200)
+
+    # Act
+    monkeypatch.setattr(shrp_module, "FRAMES_PER_BLOCK", 7)
+    actual = shrp_module.shr_pitch(signal, 22050, datalen=200)
+
+    # Assert
+    for expected_values, actual_values in zip(expected, actual):
+        np.testing.assert_array_equal(expected_values, actual_values)
+
+
+def test_shr_pitch_matches_the_frame_by_frame_analysis():
+    # Arrange
+    # f0 and SHR of every millisecond of the sentence, from the analysis of one frame at a time that
+    # shrp did before it analysed frames in blocks. shr_pitch returns one more value than datalen
+    frame, expected_f0, expected_shr = np.genfromtxt(
+        os.path.join(AUDIO_DIR, 'male_mono_sentence_shr_pitch.csv'), delimiter=',', names=True, unpack=True
+    )
+    sound = parselmouth.Sound(os.path.join(AUDIO_DIR, 'male_mono_sentence.wav'))
+
+    # Act
+    shr, f0 = shrp_module.shr_pitch(sound.values.mean(axis=0), sound.sampling_frequency, datalen=len(frame) - 1)
+
+    # Assert
+    np.testing.assert_allclose(f0, expected_f0, rtol=1e-12)
+    np.testing.assert_allclose(shr, expected_shr, rtol=1e-12, atol=1e-14)
@@ -0,0 +1,80 @@
+import sys
+import os
+import math
+import numpy as np
+import parselmouth
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab.MeasureSpectralTiltNode import MeasureSpectralTiltNode
+
+
+# Arrange
+def spectral_tilt_bin_by_bin(spectrum):
+    """Owren's spectral tilt, one bin at a time"""
+    total_bins = spectrum.get_number_of_bins()
+    db_values = []
+    for bin_number in range(1, total_bins + 1):
+        real = spectrum.get_real_value_in_bin(bin_number)
+        imaginary = spectrum.get_imaginary_value_in_bin(bin_number)
+        db_values.append(20 * math.log10(math.sqrt(real ** 2 + imaginary ** 2) / 0.0002))
+    min_db = min(db_values)
+    scaling = (total_bins - 1) / (max(db_values) - min_db)
+    scaled = [(value + abs(min_db)) * scaling for value in db_values]
+    bins = list(range(total_bins))
+    s_xx = sum(x * x for x in bins) - sum(bins) ** 2 / total_bins
+    s_xy = sum(x * y for x, y in zip(bins, scaled)) - sum(bins) * sum(scaled) / total_bins
+    return s_xy / s_xx
+
+
+@pytest.fixture
+def sound():
+    return parselmouth.Sound(os.path.join(AUDIO_DIR, "female_mono_sentence.wav"))
+
+
+def make_node(sound, **args):
+    node = MeasureSpectralTiltNode("Spectral Tilt")
+    node.args.update({"file_path": "female_mono_sentence.wav", "voice": (sound.values, sound.sampling_frequency)})
+    node.args.update(args)
+    return node
+
+
+@pytest.mark.parametrize("window_length", ["32", "256"])
+def test_midpoint_tilt_matches_bin_by_bin(sound, window_length):
+    # Arrange
+    node = make_node(sound, window_length_in_millisecs=window_length)
+    window = int(window_length) / 1000
+    part = sound.extract_part(sound.duration / 2 - window / 2, sound.duration / 2 + window / 2)
+
+    # Act
+    results = node.process()
+
+    # Assert
+    assert results["Spectral Tilt"] == pytest.approx(spectral_tilt_bin_by_bin(part.to_spectrum()))
+
+
+def test_whole_file_tilt_of_each_window_matches_its_spectrum(sound):
+    # Arrange
+    node = make_node(sound, method="Whole file")
+    frame_length = int(round(0.032 * sound.sampling_frequency))
+
+    # Act
+    results = node.process()
+
+    # Assert
+    tilts = results["Spectral Tilt (frames)"]
+    times = results["Spectral Tilt Times"]
+    assert tilts.dtype == np.float32 and len(tilts) == len(times)
+    assert results["Spectral Tilt"] == pytest.approx(np.nanmean(tilts), rel=1e-5)
+    assert results["Spectral Tilt Median"] == pytest.approx(np.nanmedian(tilts), rel=1e-5)
+    for frame in [50, 200]:
+        start = frame * (frame_length // 2)
+        window = parselmouth.Sound(sound.values[:, start:start + frame_length], sound.sampling_frequency)
+        assert times[frame] == pytest.approx(sound.xmin + (start + frame_length / 2) / sound.sampling_frequency)
+        assert tilts[frame] == pytest.approx(spectral_tilt_bin_by_bin(window.to_spectrum()), rel=1e-5)
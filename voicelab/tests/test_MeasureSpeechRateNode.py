@@ -0,0 +1,70 @@
+import sys
+import os
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab.MeasureSpeechRateNode import MeasureSpeechRateNode
+
+
+@pytest.fixture
+def intensity():
+    sound = parselmouth.Sound(os.path.join(AUDIO_DIR, "female_mono_sentence.wav"))
+    return sound.to_intensity(50)
+
+
+def test_cubic_values_match_praat(intensity):
+    # Arrange
+    node = MeasureSpeechRateNode("Speech Rate")
+    rng = np.random.default_rng(0)
+    # inside, on frames, next to the first and last frames, and past them
+    times = np.concatenate([
+        rng.uniform(intensity.xmin, intensity.xmax, 500),
+        intensity.xs()[:3],
+        [intensity.xmin, intensity.xmax, intensity.x1 + 0.3 * intensity.dx, intensity.xs()[-1] - 0.4 * intensity.dx],
+    ])
+
+    # Act
+    values = node.values_at_times_cubic(intensity.values[0], intensity.x1, intensity.dx, times)
+
+    # Assert
+    expected = [call(intensity, "Get value at time", t, "Cubic") for t in times]
+    np.testing.assert_allclose(values, expected, rtol=0, atol=1e-9)
+
+
+def test_minima_between_times_match_praat(intensity):
+    # Arrange
+    node = MeasureSpeechRateNode("Speech Rate")
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(intensity.xmin, intensity.xmax - 0.1, 200)
+    # some windows too short to hold a frame
+    ends = starts + np.concatenate([rng.uniform(0.0001, 0.002, 50), rng.uniform(0.01, 0.1, 150)])
+
+    # Act
+    minima = node.minima_between_times(intensity.values[0], intensity.x1, intensity.dx, starts, ends)
+
+    # Assert
+    expected = [call(intensity, "Get minimum", start, end, "None") for start, end in zip(starts, ends)]
+    np.testing.assert_array_equal(minima, expected)
+
+
+def test_counts_the_syllables_of_a_sentence():
+    # Arrange
+    sound = parselmouth.Sound(os.path.join(AUDIO_DIR, "female_mono_sentence.wav"))
+    node = MeasureSpeechRateNode("Speech Rate")
+    node.args.update({"file_path": "female_mono_sentence.wav", "voice": (sound.values, sound.sampling_frequency)})
+
+    # Act
+    results = node.process()
+
+    # Assert
+    assert results["Number of Syllables"] == 9
+    assert results["speechrate(Number of Syllables / Duration)"] == pytest.approx(9 / sound.duration)
@@ -0,0 +1,213 @@
+import sys
+import os
+import time
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.pipeline.Node import Node
+from Voicelab.pipeline.Pipeline import Pipeline
+
+
+class CountNode(Node):
+    """Root node handing out one number per pass"""
+    def __init__(self, node_id=None):
+        super().__init__(node_id)
+        self.done = False
+
+    def start(self):
+        self.state["numbers"] = list(self.args["numbers"])
+        self.done = False
+        return len(self.state["numbers"])
+
+    def process(self):
+        number = self.state["numbers"].pop(0)
+        if len(self.state["numbers"]) <= 0:
+            self.done = True
+        return {"number": number}
+
+
+class SquareNode(Node):
+    """Squares its input and keeps a running list of what it has seen for end()"""
+    def start(self):
+        self.state["seen"] = []
+
+    def process(self):
+        self.state["seen"].append(self.args["number"])
+        return {"square": self.args["number"] ** 2}
+
+    def end(self, results):
+        for i, result in enumerate(results):
+            results[i][self]["seen"] = list(self.state["seen"])
+        return results
+
+
+# Arrange
+def build_pipeline(numbers, processes):
+    pipeline = Pipeline(processes=processes)
+    count = CountNode("Count")
+    count.args["numbers"] = numbers
+    square = SquareNode("Square")
+    pipeline.add(count)
+    pipeline.add(square)
+    pipeline.connect((count, "number"), (square, "number"))
+    return pipeline, count, square
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_pipeline_results_in_input_order(processes):
+    numbers = [3, 1, 4, 1, 5, 9, 2, 6]
+    pipeline, count, square = build_pipeline(numbers, processes)
+
+    # Act
+    results = pipeline.start()
+
+    # Assert
+    assert [result[count]["number"] for result in results] == numbers
+    assert [result[square]["square"] for result in results] == [n ** 2 for n in numbers]
+    # end() hooks see the state of the whole batch, merged back from the workers
+    assert results[-1][square]["seen"] == numbers
+
+
+def test_pipeline_runs_more_passes_than_the_recursion_limit():
+    numbers = list(range(sys.getrecursionlimit() * 2))
+    pipeline, count, square = build_pipeline(numbers, 1)
+
+    # Act
+    results = pipeline.start()
+
+    # Assert
+    assert len(results) == len(numbers)
+    assert results[-1][square]["square"] == numbers[-1] ** 2
+
+
+class TransientCountNode(CountNode):
+    """Hands out its number only to be passed on"""
+    transient_outputs = ("number",)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_transient_outputs_are_sent_on_but_not_kept(processes):
+    numbers = [2, 7, 1, 8]
+    pipeline = Pipeline(processes=processes)
+    count = TransientCountNode("Count")
+    count.args["numbers"] = numbers
+    square = SquareNode("Square")
+    pipeline.add(count)
+    pipeline.add(square)
+    pipeline.connect((count, "number"), (square, "number"))
+
+    # Act
+    results = pipeline.start()
+
+    # Assert
+    assert [result[square]["square"] for result in results] == [n ** 2 for n in numbers]
+    assert all(result[count] == {} for result in results)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_cancel_stops_at_the_next_pass(processes):
+    numbers = list(range(100))
+    pipeline, count, square = build_pipeline(numbers, processes)
+
+    def cancel_after_five(node, start, current, end):
+        if node is count and current >= 5:
+            pipeline.cancel()
+    pipeline.listen(cancel_after_five)
+
+    # Act
+    results = pipeline.start()
+
+    # Assert
+    # passes already handed out finish, and end() still runs on the passes that were run
+    assert 3 <= len(results) < len(numbers)
+    assert [result[count]["number"] for result in results] == numbers[:len(results)]
+    assert results[-1][square]["seen"] == numbers[:len(results)]
+
+
+class CollectNode(Node):
+    """Fills its state in __init__ and never clears it, like the nodes reused from the catalog"""
+    def __init__(self, node_id=None):
+        super().__init__(node_id)
+        self.state = {"seen": []}
+
+    def process(self):
+        self.state["seen"].append(self.args["number"])
+        return {}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_reused_nodes_keep_one_copy_of_their_state(processes):
+    numbers = [1, 2, 3]
+    count = CountNode("Count")
+    count.args["numbers"] = numbers
+    collect = CollectNode("Collect")
+
+    # Act
+    for run in range(2):
+        pipeline = Pipeline(processes=processes)
+        pipeline.add(count)
+        pipeline.add(collect)
+        pipeline.connect((count, "number"), (collect, "number"))
+        pipeline.start()
+
+    # Assert
+    # the second run adds to what the first left, the same as it does without workers
+    assert collect.state["seen"] == numbers + numbers
+
+
+def test_pipeline_runs_every_pass_again_after_a_cancel():
+    numbers = list(range(10))
+    pipeline, count, square = build_pipeline(numbers, 1)
+    listener = lambda node, start, current, end: pipeline.cancel()
+    pipeline.listen(listener)
+    cancelled = pipeline.start()
+    pipeline.listeners.remove(listener)
+
+    # Act
+    results = pipeline.start()
+
+    # Assert
+    assert len(cancelled) == 1
+    assert [result[count]["number"] for result in results] == numbers
+
+
+class SlowSquareNode(SquareNode):
+    """Takes much longer than counting, so progress should be weighted towards it"""
+    def process(self):
+        time.sleep(0.02)
+        return super().process()
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_progress_is_weighted_by_node_times(processes):
+    numbers = list(range(6))
+    pipeline = Pipeline(processes=processes)
+    count = CountNode("Count")
+    count.args["numbers"] = numbers
+    square = SlowSquareNode("Square")
+    pipeline.add(count)
+    pipeline.add(square)
+    pipeline.connect((count, "number"), (square, "number"))
+    updates = []
+    pipeline.listen(lambda node, start, current, end, timing: updates.append((node, timing)), timed=True)
+
+    # Act
+    pipeline.start()
+
+    # Assert
+    fractions = [timing["fraction"] for node, timing in updates]
+    assert all(0 <= fraction <= 1 for fraction in fractions)
+    assert fractions[-1] == pytest.approx(1)
+    # once the slow node has run, a count alone barely moves the progress
+    first_square = next(i for i, (node, timing) in enumerate(updates) if node is square)
+    assert fractions[first_square] > 0.1
+    assert all(timing["remaining"] is not None for node, timing in updates[first_square:])
+    # every node's time on every pass is kept
+    assert len(pipeline.timings) == len(numbers)
+    assert all(pass_times[square] >= 0.02 for pass_times in pipeline.timings)
+    assert all(count in pass_times for pass_times in pipeline.timings)
@@ -0,0 +1,117 @@
+import sys
+import os
+import json
+import tracemalloc
+import pytest
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.pipeline.Node import Node
+from Voicelab.pipeline.Pipeline import Pipeline
+from Voicelab.pipeline.Profiler import Profiler, resource
+
+
+class FileNode(Node):
+    """Root node handing out one file name per pass"""
+    def __init__(self, node_id=None):
+        super().__init__(node_id)
+        self.done = False
+
+    def start(self):
+        self.state["files"] = list(self.args["files"])
+        return len(self.state["files"])
+
+    def process(self):
+        file_path = self.state["files"].pop(0)
+        if len(self.state["files"]) <= 0:
+            self.done = True
+        return {"file_path": file_path, "n": int(file_path.split(".")[0])}
+
+
+class PraatCallNode(Node):
+    """Makes n small Praat calls"""
+    def process(self):
+        for i in range(self.args["n"]):
+            call("Calculator", "1 + 1")
+        return {"calls": self.args["n"]}
+
+
+class OtherCallsNode(Node):
+    """Makes n Praat calls through the module and through call imported when it runs, and holds
+    n MB of samples at once"""
+    def process(self):
+        from parselmouth.praat import call as late_call
+        for i in range(self.args["n"]):
+            parselmouth.praat.call("Calculator", "1 + 1")
+            late_call("Calculator", "1 + 1")
+        samples = np.ones(self.args["n"] * 2 ** 20 // 8)
+        return {"sum": float(samples.sum())}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_profile_counts_praat_calls_per_file(tmp_path, processes):
+    profiler = Profiler()
+    pipeline = Pipeline(processes=processes, profiler=profiler)
+    files = FileNode("Files")
+    files.args["files"] = ["3.wav", "10.wav", "0.wav"]
+    calls = PraatCallNode("Praat Calls")
+    pipeline.add(files)
+    pipeline.add(calls)
+    pipeline.connect((files, "file_path"), (calls, "file_path"))
+    pipeline.connect((files, "n"), (calls, "n"))
+
+    # Act
+    pipeline.start()
+    profiler.save_trace(str(tmp_path / "trace.json"))
+
+    # Assert
+    samples = {(sample["function"], sample["file"]): sample for sample in profiler.samples}
+    assert {file: samples[("Praat Calls", file)]["praat calls"] for file in files.args["files"]} == {
+        "3.wav": 3, "10.wav": 10, "0.wav": 0
+    }
+    assert all(sample["wall seconds"] >= 0 and sample["cpu seconds"] >= 0 for sample in profiler.samples)
+    summary = {row["function"]: row for row in profiler.summary()}
+    assert summary["Praat Calls"]["runs"] == 3
+    assert summary["Praat Calls"]["praat calls"] == 13
+    assert summary["Files"]["praat calls"] == 0
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len(events) == 6
+    assert {event["ph"] for event in events} == {"X"}
+    # counting stops with the pipeline
+    assert call is parselmouth.praat.call
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_profile_counts_every_praat_call_and_the_memory_of_each_run(processes):
+    profiler = Profiler(trace_memory=True)
+    pipeline = Pipeline(processes=processes, profiler=profiler)
+    files = FileNode("Files")
+    files.args["files"] = ["8.wav", "1.wav", "16.wav"]
+    other = OtherCallsNode("Other Calls")
+    pipeline.add(files)
+    pipeline.add(other)
+    pipeline.connect((files, "file_path"), (other, "file_path"))
+    pipeline.connect((files, "n"), (other, "n"))
+
+    # Act
+    pipeline.start()
+
+    # Assert
+    samples = {sample["file"]: sample for sample in profiler.samples if sample["function"] == "Other Calls"}
+    assert {file: sample["praat calls"] for file, sample in samples.items()} == {"8.wav": 16, "1.wav": 2, "16.wav": 32}
+    # each run's peak is its own, not the peak of the whole process so far
+    for file, sample in samples.items():
+        megabytes = int(file.split(".")[0])
+        assert megabytes * 2 ** 20 <= sample["peak memory bytes"] < (megabytes + 1) * 2 ** 20
+        # the process's peak can only go up, by how much depends on what ran before
+        if resource is not None:
+            assert sample["peak rss increase bytes"] >= 0
+    assert parselmouth.praat.call is call
+    assert not tracemalloc.is_tracing()
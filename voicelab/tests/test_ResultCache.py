@@ -0,0 +1,143 @@
+import sys
+import os
+import copy
+import pytest
+from glob import glob
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.pipeline.Pipeline import Pipeline
+from Voicelab.pipeline.ResultCache import ResultCache
+from Voicelab.toolkits.Voicelab.LoadVoicesNode import LoadVoicesNode
+from Voicelab.default_settings import available_functions
+from Voicelab.toolkits.Voicelab.VoicelabNode import VoicelabNode
+
+
+# Arrange
+def get_test_files():
+    return sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[:3]
+
+
+def run_measures(file_locations, functions, cache, processes=1, settings=None):
+    pipeline = Pipeline(processes=processes, cache=cache)
+    load_voices = LoadVoicesNode("Load Voice")
+    load_voices.args["file_locations"] = file_locations
+    pipeline.add(load_voices)
+    nodes = {}
+    for fn in functions:
+        nodes[fn] = copy.deepcopy(available_functions[fn])
+        nodes[fn].args.update((settings or {}).get(fn, {}))
+        pipeline.add(nodes[fn])
+        for terminal in ("voice", "file_path", "context"):
+            pipeline.connect((load_voices, terminal), (nodes[fn], terminal))
+    results = pipeline.start()
+    # Praat objects are not kept in the cache, compare the values that are saved
+    return [{fn: nodes[fn].pack(result[nodes[fn]]) for fn in functions} for result in results]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_rerun_is_served_from_cache(tmp_path, processes):
+    test_files = get_test_files()
+    functions = ["Measure Duration", "Measure Intensity"]
+    first = run_measures(test_files, functions, ResultCache(str(tmp_path)), processes)
+
+    # Act
+    cache = ResultCache(str(tmp_path))
+    second = run_measures(test_files, functions, cache, processes)
+
+    # Assert
+    assert cache.stats() == {"hits": len(test_files) * len(functions), "misses": 0}
+    assert second == first
+
+
+def test_only_new_measures_and_settings_are_computed(tmp_path):
+    test_files = get_test_files()
+    run_measures(test_files, ["Measure Duration", "Measure Intensity"], ResultCache(str(tmp_path)))
+
+    # Act
+    cache = ResultCache(str(tmp_path))
+    run_measures(
+        test_files,
+        ["Measure Duration", "Measure Intensity", "Measure Spectral Shape"],
+        cache,
+        settings={"Measure Intensity": {"minimum_pitch": 75}},
+    )
+
+    # Assert
+    # Duration is reused, Intensity has new settings and Spectral Shape is new
+    assert cache.stats() == {"hits": len(test_files), "misses": 2 * len(test_files)}
+
+
+def test_failures_are_not_cached(tmp_path):
+    test_files = get_test_files()
+    # Praat can not take a word for the pitch floor, so the node returns the error instead
+    settings = {"Measure Intensity": {"minimum_pitch": "high"}}
+    first = run_measures(test_files, ["Measure Intensity"], ResultCache(str(tmp_path)), settings=settings)
+
+    # Act
+    cache = ResultCache(str(tmp_path))
+    run_measures(test_files, ["Measure Intensity"], cache, settings=settings)
+
+    # Assert
+    assert all(isinstance(result["Measure Intensity"]["Mean Intensity (dB)"], str) for result in first)
+    assert cache.stats() == {"hits": 0, "misses": len(test_files)}
+
+
+class WarningNode(VoicelabNode):
+    """A measure that warns about every voice it measures"""
+
+    def process(self):
+        self.events_fired["warning"] = "Check " + self.args["file_path"]
+        return {"Checked": True}
+
+
+def test_nodes_that_fire_events_are_not_cached(tmp_path, monkeypatch):
+    test_files = get_test_files()
+    warnings = []
+    monkeypatch.setattr(Pipeline, "resolve_event", lambda self, event_id, event_data: warnings.append(event_data))
+
+    def run_warnings(cache):
+        pipeline = Pipeline(cache=cache)
+        load_voices = LoadVoicesNode("Load Voice")
+        load_voices.args["file_locations"] = test_files
+        warning_node = WarningNode("Warn")
+        pipeline.add(load_voices)
+        pipeline.add(warning_node)
+        for terminal in ("voice", "file_path", "context"):
+            pipeline.connect((load_voices, terminal), (warning_node, terminal))
+        pipeline.start()
+
+    run_warnings(ResultCache(str(tmp_path)))
+
+    # Act
+    cache = ResultCache(str(tmp_path))
+    run_warnings(cache)
+
+    # Assert
+    # the warnings are fired again on the second run
+    assert warnings == 2 * ["Check " + file_path for file_path in test_files]
+    assert cache.stats() == {"hits": 0, "misses": len(test_files)}
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_size=None)
+    cache.put("aa", {"value": b"x" * 1000})
+    cache.put("bb", {"value": b"x" * 1000})
+    os.utime(cache.path("aa"), (1, 1))
+    os.utime(cache.path("bb"), (2, 2))
+
+    # Act
+    assert cache.get("aa") is not None  # aa is now the most recently used
+    cache.max_size = 2500
+    cache.put("cc", {"value": b"x" * 1000})
+
+    # Assert
+    assert cache.get("bb") is None
+    assert cache.get("aa") == {"value": b"x" * 1000}
+    assert cache.get("cc") == {"value": b"x" * 1000}
+    assert cache.stats() == {"hits": 3, "misses": 1}
@@ -0,0 +1,105 @@
+import sys
+import os
+import csv
+import json
+import numpy as np
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.VoicelabGUI import ResultExport
+
+
+# Arrange
+def make_results():
+    return {
+        "a.wav": {
+            "Measure Jitter": {"local Jitter": np.float64(0.01), "PCA Result": 1.5},
+            "Measure Shimmer": {"local Shimmer": 0.05, "PCA Result": -1.5},
+            "Measure Pitch": {"Pitch Values": [100.0, np.float32(101.5)], "Pitch": object()},
+        },
+        "b.wav": {
+            "Measure Jitter": {"local Jitter": "Jitter Measurement Failed", "PCA Result": 0.5},
+            "Measure Shimmer": {"local Shimmer": 0.07, "PCA Result": 0.5},
+        },
+    }
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_long_and_wide_tables(tmp_path, chunk_size):
+    settings = {"Measure Jitter": {"Measure PCA": True, "voice": (np.zeros(10), 44100)}}
+
+    # Act
+    ResultExport.save_tables(make_results(), settings, str(tmp_path), formats=(), chunk_size=chunk_size)
+
+    # Assert
+    wide = read_csv(tmp_path / "voicelab_results.csv")
+    assert [row["Input File"] for row in wide] == ["a.wav", "b.wav"]
+    # measures two functions report are told apart by the function's name
+    assert wide[0]["Measure Jitter: PCA Result"] == "1.5"
+    assert wide[0]["Measure Shimmer: PCA Result"] == "-1.5"
+    assert json.loads(wide[0]["Pitch Values"]) == [100.0, 101.5]
+    assert wide[1]["Pitch Values"] == ""
+    assert wide[1]["local Jitter"] == "Jitter Measurement Failed"
+    assert "Pitch" not in wide[0]
+
+    long = read_csv(tmp_path / "voicelab_results_long.csv")
+    assert len(long) == 9
+    assert {"file": "b.wav", "function": "Measure Shimmer", "measure": "local Shimmer", "value": "0.07"} in long
+
+    assert read_csv(tmp_path / "voicelab_settings.csv") == [
+        {"function": "Measure Jitter", "setting": "Measure PCA", "value": "1"}
+    ]
+
+
+def test_excel_keeps_numbers_as_numbers(tmp_path):
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("openpyxl")
+
+    # Act
+    ResultExport.save_tables(make_results(), {}, str(tmp_path), formats=("excel",))
+
+    # Assert
+    sheet = pd.read_excel(tmp_path / "voicelab_results.xlsx")
+    assert sheet["local Shimmer"].dtype == np.float64
+    assert sheet["local Shimmer"].tolist() == [0.05, 0.07]
+
+
+def test_frame_tracks_are_saved_as_arrays(tmp_path):
+    results = {
+        "a.wav": {
+            "Measure Pitch": {
+                "Pitch Values (Yin)": np.array([100, np.nan, 102], dtype=np.float32),
+                "Pitch Times (Yin)": np.array([0.0, 0.01, 0.02], dtype=np.float32),
+                "Mean Pitch (Yin)": 101.0,
+            },
+            "Measure MFCCs": {"mfcc": np.ones((2, 4), dtype=np.float32)},
+        },
+    }
+    frame_times = {"Measure Pitch": {"Pitch Values (Yin)": "Pitch Times (Yin)"}}
+
+    # Act
+    paths = ResultExport.save_tables(results, {}, str(tmp_path), formats=(), frame_times=frame_times)
+
+    # Assert
+    # tracks are kept out of the tables
+    assert read_csv(tmp_path / "voicelab_results.csv") == [{"Input File": "a.wav", "Mean Pitch (Yin)": "101.0"}]
+    assert str(tmp_path / "voicelab_tracks" / "a.npz") in paths
+    tracks = np.load(tmp_path / "voicelab_tracks" / "a.npz")
+    assert sorted(tracks) == [
+        "Measure MFCCs: mfcc 1", "Measure MFCCs: mfcc 1 (time)", "Measure MFCCs: mfcc 2", "Measure MFCCs: mfcc 2 (time)",
+        "Measure Pitch: Pitch Values (Yin)", "Measure Pitch: Pitch Values (Yin) (time)",
+    ]
+    assert tracks["Measure Pitch: Pitch Values (Yin)"].dtype == np.float32
+    np.testing.assert_array_equal(tracks["Measure Pitch: Pitch Values (Yin)"], [100, np.nan, 102])
+    np.testing.assert_array_equal(tracks["Measure Pitch: Pitch Values (Yin) (time)"], np.float32([0.0, 0.01, 0.02]))
+    np.testing.assert_array_equal(tracks["Measure MFCCs: mfcc 2 (time)"], [0, 1, 2, 3])
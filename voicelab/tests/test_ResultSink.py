@@ -0,0 +1,129 @@
+import sys
+import os
+import copy
+import csv
+import json
+import sqlite3
+import pytest
+from glob import glob
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.pipeline.Pipeline import Pipeline
+from Voicelab.pipeline.ResultSink import CallbackSink, CSVSink, SQLiteSink, reportable_value
+from Voicelab.toolkits.Voicelab.LoadVoicesNode import LoadVoicesNode
+from Voicelab.default_settings import available_functions
+
+
+# Arrange
+def get_test_files():
+    return sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[:3]
+
+
+def run_measures(file_locations, functions, processes=1, sink=None):
+    pipeline = Pipeline(processes=processes, sink=sink)
+    load_voices = LoadVoicesNode("Load Voice")
+    load_voices.args["file_locations"] = file_locations
+    pipeline.add(load_voices)
+    for fn in functions:
+        node = copy.deepcopy(available_functions[fn])
+        pipeline.add(node)
+        for terminal in ("voice", "file_path", "context"):
+            pipeline.connect((load_voices, terminal), (node, terminal))
+    return pipeline.start()
+
+
+def expected_rows(file_locations, functions):
+    """The reportable values of a run that keeps all of its results"""
+    rows = set()
+    for file_path, pass_results in zip(file_locations, run_measures(file_locations, functions)):
+        for node, results in pass_results.items():
+            for measure, value in results.items():
+                value = reportable_value(value)
+                if measure != "file_path" and value is not None:
+                    rows.add((file_path, node.node_id, measure, str(value)))
+    return rows
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_streamed_rows_match_kept_results(tmp_path, processes):
+    test_files = get_test_files()
+    functions = ["Measure Duration", "Measure Intensity", "Measure Jitter"]
+    path = str(tmp_path / "results.csv")
+
+    # Act
+    results = run_measures(test_files, functions, processes, CSVSink(path))
+
+    # Assert
+    with open(path, newline="") as f:
+        rows = {(row["file"], row["function"], row["measure"], row["value"]) for row in csv.DictReader(f)}
+    assert rows == expected_rows(test_files, functions)
+    # only Jitter, which adds its PCA in end(), is kept until the end
+    assert [{node.node_id for node in pass_results} for pass_results in results] == [{"Measure Jitter"}] * 3
+
+
+def test_each_file_is_written_before_the_next_is_processed(tmp_path):
+    test_files = get_test_files()
+    written = []
+    sink = CallbackSink(lambda rows: written.append({row["file"] for row in rows}))
+
+    # Act
+    results = run_measures(test_files, ["Measure Duration"], sink=sink)
+
+    # Assert
+    assert written == [{file_path} for file_path in test_files]
+    assert results == [{}, {}, {}]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_streamed_tracks_match_saved_tracks(tmp_path, processes):
+    import numpy as np
+    from Voicelab.VoicelabGUI.ResultExport import frame_tracks, save_tracks_npz
+    test_files = get_test_files()
+    functions = ["Measure Pitch", "Measure Jitter"]
+    sink = CSVSink(str(tmp_path / "results.csv"))
+    sink.tracks_directory = str(tmp_path / "streamed")
+
+    # Act
+    run_measures(test_files, functions, processes, sink)
+
+    # Assert
+    kept = {}
+    for file_path, pass_results in zip(test_files, run_measures(test_files, functions)):
+        kept[file_path] = {node.node_id: results for node, results in pass_results.items()}
+    frame_times = {fn: available_functions[fn].frame_times for fn in functions if hasattr(available_functions[fn], "frame_times")}
+    saved = save_tracks_npz(frame_tracks(kept, frame_times), str(tmp_path / "saved"))
+    assert len(saved) == len(test_files)
+    for saved_path in saved:
+        with np.load(saved_path) as expected, np.load(str(tmp_path / "streamed" / os.path.basename(saved_path))) as streamed:
+            assert sorted(streamed.files) == sorted(expected.files)
+            for name in expected.files:
+                np.testing.assert_array_equal(streamed[name], expected[name])
+
+
+def test_sqlite_sink(tmp_path):
+    test_files = get_test_files()
+    path = str(tmp_path / "results.sqlite")
+
+    # Act
+    run_measures(test_files, ["Measure Duration"], sink=SQLiteSink(path))
+
+    # Assert
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute("SELECT file, measure, value FROM results").fetchall()
+    assert sorted(file_path for file_path, measure, value in rows) == test_files
+    assert all(measure == "Voice Duration" and value > 0 for file_path, measure, value in rows)
+
+
+def test_reportable_values():
+    import numpy as np
+    assert reportable_value(np.float64(1.5)) == 1.5
+    assert reportable_value(True) == 1
+    assert json.loads(reportable_value([1, np.int32(2)])) == [1, 2]
+    assert reportable_value((np.zeros(3), 44100)) is None
+    assert reportable_value(object()) is None
@@ -0,0 +1,62 @@
+import sys
+import os
+import json
+import subprocess
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+# Libraries that take a second or more to import, and are only needed by some nodes when they run
+HEAVY_MODULES = ["librosa", "numba", "sklearn", "seaborn", "matplotlib.pyplot", "pandas"]
+
+
+def time_import(statement):
+    """Run statement in a fresh interpreter, and return how long it took and which heavy modules
+    it imported"""
+    code = "\n".join([
+        "import json, sys, time",
+        "start = time.perf_counter()",
+        statement,
+        "seconds = time.perf_counter() - start",
+        f"loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]",
+        "print(json.dumps({'seconds': seconds, 'loaded': loaded}))",
+    ])
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=os.path.join(VOICELAB_DIR, "src"), capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("statement, budget", [
+    ("import Voicelab.default_settings", 1.0),
+    ("from Voicelab.toolkits.Voicelab import MeasureDurationNode", 2.0),
+    ("import Voicelab.voicelab_batch", 3.0),
+])
+def test_startup_does_not_import_heavy_dependencies(statement, budget):
+    # Act
+    startup = time_import(statement)
+    print(f"{statement}: {startup['seconds']:.3f} s")
+
+    # Assert
+    assert startup["loaded"] == []
+    assert startup["seconds"] < budget
+
+
+def test_nodes_are_imported_when_looked_up():
+    # Act
+    startup = time_import("\n".join([
+        "from Voicelab.default_settings import available_functions",
+        "from Voicelab.toolkits import Voicelab",
+        "assert isinstance(available_functions['Measure Jitter'], Voicelab.MeasureJitterNode)",
+        "assert Voicelab.LoadVoicesNode.__name__ == 'LoadVoicesNode'",
+        # the class that was looked up stays, importing its module again doesn't replace it
+        "import importlib; importlib.import_module('Voicelab.toolkits.Voicelab.LoadVoicesNode')",
+        "assert Voicelab.LoadVoicesNode.__name__ == 'LoadVoicesNode'",
+    ]))
+
+    # Assert
+    # Jitter only needs sklearn once it runs its PCA
+    assert startup["loaded"] == []
@@ -0,0 +1,82 @@
+import sys
+import os
+import math
+import numpy as np
+import parselmouth
+from parselmouth.praat import call
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab.toolkits.Voicelab import VoicelabNode as units
+
+
+# Arrange
+def praat(formula, value):
+    """A Praat Calculator formula applied to one value, NaN where Praat gives --undefined--"""
+    result = call("Calculator", f"{formula}({value!r})")
+    return math.nan if result == "--undefined--" else float(result)
+
+
+VALUES = [-100.0, 0.0, 0.5, 50.0, 120.0, 440.0, 1000.0, 5500.0, 22050.0, 1e300]
+
+
+@pytest.mark.parametrize("conversion, formula", [
+    (units.hz_to_mel, "hertzToMel"),
+    (units.mel_to_hz, "melToHertz"),
+    (units.hz_to_bark, "hertzToBark"),
+    (units.bark_to_hz, "barkToHertz"),
+    (units.hz_to_erbs, "hertzToErb"),
+    (units.erbs_to_hz, "erbToHertz"),
+])
+def test_conversions_match_praat(conversion, formula):
+    # Act
+    converted = conversion(np.array(VALUES + [15.6, 42.99, 43.0, 50.0]))
+
+    # Assert
+    expected = [praat(formula, value) for value in VALUES + [15.6, 42.99, 43.0, 50.0]]
+    np.testing.assert_allclose(converted, expected, rtol=1e-12)
+
+
+def test_semitones_re_1_hz_match_praat():
+    # Arrange
+    # Praat's hertzToSemitones is re 100 Hz
+    re_100 = 12 * math.log2(100)
+    frequencies = [-1.0, 0.0, 1.0, 50.0, 100.0, 440.0]
+    semitones = [-24.0, 0.0, 12.0, 79.7]
+
+    # Act
+    converted = units.hz_to_semitones_re_0(np.array(frequencies))
+    back = units.semitones_re_0_to_hz(np.array(semitones))
+
+    # Assert
+    np.testing.assert_allclose(converted, [praat("hertzToSemitones", f) + re_100 for f in frequencies], rtol=1e-12)
+    np.testing.assert_allclose(back, [praat("semitonesToHertz", s - re_100) for s in semitones], rtol=1e-12)
+
+
+def test_semitones_match_a_praat_pitch_track():
+    # Arrange
+    sound = parselmouth.Sound(os.path.join(VOICELAB_DIR, "tests/assets/audio/female_mono_a.wav"))
+    pitch = sound.to_pitch()
+    frequencies = pitch.selected_array["frequency"]
+    voiced = frequencies > 0
+
+    # Act
+    semitones = units.VoicelabNode().hz_to_semitones_re_0(frequencies[voiced])
+
+    # Assert
+    expected = [call(pitch, "Get value in frame", int(i) + 1, "semitones re 1 Hz") for i in np.flatnonzero(voiced)]
+    np.testing.assert_allclose(semitones, expected, rtol=1e-12)
+
+
+def test_conversions_keep_scalars_scalar():
+    # Act
+    bark = units.VoicelabNode().hz_to_bark(1000)
+
+    # Assert
+    assert np.ndim(bark) == 0
+    assert float(bark) == pytest.approx(praat("hertzToBark", 1000.0))
@@ -0,0 +1,70 @@
+import sys
+import os
+import subprocess
+import json
+from glob import glob
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+AUDIO_DIR = os.path.join(VOICELAB_DIR, 'tests/assets/audio')
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+from Voicelab import voicelab_batch
+
+
+def test_batch_runner_does_not_import_qt():
+    # Act
+    code = "import sys; import Voicelab.voicelab_batch; print(any(m.startswith('PyQt5') for m in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=os.path.join(VOICELAB_DIR, "src"), capture_output=True, text=True, check=True
+    )
+
+    # Assert
+    assert output.stdout.strip() == "False"
+
+
+def test_batch_runner_processes_a_manifest(tmp_path):
+    # Arrange
+    test_files = sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[:2]
+    manifest = tmp_path / "files.txt"
+    manifest.write_text("# files to process\n" + "\n".join(test_files) + "\n\n")
+    settings = tmp_path / "settings.json"
+    settings.write_text(json.dumps({
+        "functions": ["Measure Duration", "Measure Intensity"],
+        "settings": {"Measure Intensity": {"minimum_pitch": 75}},
+    }))
+    output = tmp_path / "results"
+
+    # Act
+    voicelab_batch.main([str(manifest), str(settings), str(output), "--format", "excel"])
+
+    # Assert
+    assert voicelab_batch.find_files(str(manifest)) == test_files
+    for name in ["voicelab_results.csv", "voicelab_results_long.csv", "voicelab_settings.csv",
+                 "voicelab_results.xlsx", "voicelab_settings.xlsx"]:
+        assert os.path.isfile(output / name)
+
+
+def test_cancel_before_the_pipeline_runs_is_not_lost():
+    # Arrange
+    from Voicelab.VoicelabGUI.VoicelabController import VoicelabController
+    from Voicelab.default_settings import available_functions
+    test_files = sorted(glob(os.path.join(AUDIO_DIR, '*.wav')))[:3]
+    controller = VoicelabController()
+    controller.load_function("Measure Duration", available_functions["Measure Duration"], default=True)
+    controller.activate_function("Measure Duration")
+    controller.load_voices(test_files)
+    controller.activate_voices(test_files)
+
+    # Act
+    # cancelled from the GUI before the processing thread has built its pipeline
+    controller.cancel_processing()
+    results = controller.start_processing(
+        controller.active_voices, controller.active_functions, controller.active_settings
+    )
+
+    # Assert
+    assert list(results) == test_files[:1]
+    assert not controller.cancel_requested
@@ -0,0 +1,54 @@
+import sys
+import os
+import importlib.util
+import pytest
+
+
+# Set up paths
+TEST_DIR = os.path.dirname(os.path.realpath(__file__))
+VOICELAB_DIR = os.path.dirname(TEST_DIR)
+
+sys.path.insert(0, ''.join([VOICELAB_DIR, "/src"]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# The tabs play sounds, Qt's multimedia module needs the system's audio libraries
+pytest.importorskip("PyQt5.QtMultimedia", exc_type=ImportError)
+from PyQt5.QtWidgets import QApplication
+
+# Signals the tabs connect to or emit
+TAB_SIGNALS = [
+    "on_files_changed", "on_settings_changed", "on_functions_changed", "on_processing_started",
+    "on_processing_completed", "on_progress_update", "on_progress_estimate",
+]
+
+
+# Arrange
+@pytest.fixture(scope="module")
+def wizard():
+    """The window of voicelab.py, loaded as a script the way the PyInstaller specs build it"""
+    app = QApplication.instance() or QApplication([])
+    spec = importlib.util.spec_from_file_location("voicelab_entry", os.path.join(VOICELAB_DIR, "src", "voicelab.py"))
+    entry = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(entry)
+    # the application has to outlive the window
+    yield entry.VoicelabWizard()
+    app.processEvents()
+
+
+def test_wizard_has_every_signal_the_tabs_use(wizard):
+    # Assert
+    assert all(name in wizard.voicelab_signals for name in TAB_SIGNALS)
+    assert wizard.data_controller.message_callback is not None
+
+
+def test_wizard_takes_timed_progress(wizard):
+    # Arrange
+    from Voicelab.pipeline.Node import Node
+    estimates = []
+    wizard.voicelab_signals["on_progress_estimate"].connect(lambda fraction, left: estimates.append((fraction, left)))
+
+    # Act
+    # the controller listens to the pipeline with timed=True, so the timing is passed too
+    wizard.data_controller.progress_callback(Node("Measure Pitch"), 0, 1, 2, {"fraction": 0.5, "remaining": None})
+
+    # Assert
+    assert estimates == [(0.5, -1)]